@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Synthetic (reproducible) inputs of benchmarks: nothing is downloaded"""
+
+import csv
+import os
+import shutil
+import string
+import tempfile
+
+import numpy as np
+
+SEED = 42
+WORDS = string.ascii_letters + string.digits
+ANSI_COLORS = ['\x1b[0m', '\x1b[1;31m', '\x1b[32m', '\x1b[38;5;208m']
+
+
+def get_state(seed=SEED):
+    return np.random.RandomState(seed)
+
+
+def make_temp_dir():
+    return tempfile.mkdtemp(prefix='pyhal-benchmark-')
+
+
+def remove_temp_dir(inputs):
+    """Removes temp dir of inputs (teardown of benchmarks)
+
+    :param inputs: dict with 'root' (temp dir)
+    """
+
+    shutil.rmtree(inputs['root'], ignore_errors=True)
+
+
+def make_words(amount, length, seed=SEED):
+    """Makes random words
+
+    :param amount: number of words
+    :param length: letters of each word
+    :param seed: seed of random generator
+    :return: list of strings
+    """
+
+    letters = np.array(list(WORDS))
+    indices = get_state(seed).randint(0, len(letters), size=(amount, length))
+    return [''.join(row) for row in letters[indices]]
+
+
+def make_tree(root, depth, breadth, files, file_size=64, seed=SEED):
+    """Makes tree of folders (and some hidden files)
+
+    :param root: folder to make tree in
+    :param depth: levels of folders
+    :param breadth: sub-folders of each folder
+    :param files: files in each folder
+    :param file_size: bytes of each file
+    :param seed: seed of random generator
+    :return: number of files and folders made
+    """
+
+    state = get_state(seed)
+    made = 0
+    for i in range(files):
+        name = '.hidden{}'.format(i) if i == 0 else 'file{}.txt'.format(i)
+        with open(os.path.join(root, name), 'wb') as writer:
+            writer.write(state.bytes(file_size))
+        made += 1
+
+    if depth > 0:
+        for i in range(breadth):
+            folder = os.path.join(root, 'folder{}'.format(i))
+            os.mkdir(folder)
+            made += 1 + make_tree(folder, depth - 1, breadth, files, file_size,
+                                  seed + i + 1)
+
+    return made
+
+
+def make_file(path, size, seed=SEED):
+    """Makes file of random bytes
+
+    :param path: path of file
+    :param size: bytes of file
+    :param seed: seed of random generator
+    :return: path of file
+    """
+
+    state = get_state(seed)
+    chunk = 2 ** 20
+    with open(path, 'wb') as writer:
+        for start in range(0, size, chunk):
+            writer.write(state.bytes(min(chunk, size - start)))
+
+    return path
+
+
+def make_table(rows, columns, seed=SEED):
+    """Makes table of mixed values (words, integers, floats) as strings
+
+    :param rows: rows of data
+    :param columns: columns
+    :param seed: seed of random generator
+    :return: labels and rows
+    """
+
+    state = get_state(seed)
+    labels = ['column{}'.format(j) for j in range(columns)]
+    words = make_words(rows * columns, 8, seed)
+    data = []
+    for i in range(rows):
+        row = []
+        for j in range(columns):
+            kind = j % 3
+            if kind == 0:
+                row.append(words[i * columns + j])
+            elif kind == 1:
+                row.append(str(state.randint(1, 10 ** 6)))
+            else:
+                row.append('{:.4f}'.format(state.uniform(-1e3, 1e3)))
+
+        data.append(row)
+
+    return labels, data
+
+
+def make_csv(path, rows, columns, seed=SEED):
+    """Makes CSV file (with header)
+
+    :param path: path of file
+    :param rows: rows of data
+    :param columns: columns
+    :param seed: seed of random generator
+    :return: path of file
+    """
+
+    labels, data = make_table(rows, columns, seed)
+    with open(path, 'w', newline='') as writer:
+        csv_writer = csv.writer(writer, delimiter=',', quotechar='"')
+        csv_writer.writerow(labels)
+        csv_writer.writerows(data)
+
+    return path
+
+
+def make_html_table(rows, columns, seed=SEED):
+    """Makes HTML source of table (header with th, data with td)
+
+    :param rows: rows of data
+    :param columns: columns
+    :param seed: seed of random generator
+    :return: HTML source
+    """
+
+    labels, data = make_table(rows, columns, seed)
+    lines = ['<html><body><table>']
+    lines.append('<tr>' + ''.join('<th>{}</th>'.format(x) for x in labels) + '</tr>')
+    for row in data:
+        lines.append('<tr>' + ''.join('<td>{}</td>'.format(x) for x in row) + '</tr>')
+
+    lines.append('</table></body></html>')
+    return '\n'.join(lines)
+
+
+def make_colored_text(length, seed=SEED):
+    """Makes text with ANSI escape sequences (as colored terminal output)
+
+    :param length: number of words
+    :param seed: seed of random generator
+    :return: string
+    """
+
+    state = get_state(seed)
+    colors = state.randint(0, len(ANSI_COLORS), size=length)
+    words = make_words(length, 6, seed)
+    return ' '.join(
+        ANSI_COLORS[color] + word for color, word in zip(colors, words)
+    )
+
+
+def make_system(n, density=1.0, seed=SEED):
+    """Makes random linear system with diagonally dominant, symmetric
+    matrix (so every solver converges)
+
+    :param n: number of unknowns
+    :param density: fraction of non-zero entries off diagonal
+    :param seed: seed of random generator
+    :return: A (n x n np.ndarray), b
+    """
+
+    state = get_state(seed)
+    A = state.rand(n, n) * (state.rand(n, n) < density)
+    A = (A + A.T) / 2
+    np.fill_diagonal(A, 0)
+    A += np.diag(A.sum(axis=1) + 1)
+    return A, state.rand(n)
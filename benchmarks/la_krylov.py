@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks Krylov (GMRES, BiCGSTAB) and stationary hal.maths.la
+solvers on non-symmetric systems (2D advection-diffusion problem, CSR
+storage). Registered in hal.profile.benchmark, runs with the whole suite
+or alone:
+
+    python -m benchmarks.suite 'la.advection.*'
+
+Benchmarks are named la.advection.solver[matrix-n]"""
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la.iterations import JacobiSolver, GaussSiedelSolver, \
+    SORSolver, GMRESSolver, BiCGSTABSolver
+from hal.profile.benchmark import register_sizes, main
+
+GRID_SIZES = [8, 16, 24]
+ADVECTIONS = {
+    'dominant': 0.5,
+    'not_dominant': 2.0
+}
+PROBLEMS = {  # size label -> params
+    '{}-{}'.format(kind, grid_size ** 2): {
+        'grid_size': grid_size, 'advection': advection
+    }
+    for kind, advection in ADVECTIONS.items() for grid_size in GRID_SIZES
+}
+ABS_TOLL = 1e-8
+REL_TOLL = 0
+MAX_ITERATIONS = 2000  # stationary methods may diverge
+
+SOLVERS = {
+    'jacobi': JacobiSolver,
+    'gauss_seidel': GaussSiedelSolver,
+    'sor_auto': SORSolver,
+    'gmres30': GMRESSolver,
+    'gmres10': lambda A, b: GMRESSolver(A, b, 10),
+    'bicgstab': BiCGSTABSolver,
+}
+
+
+def get_advection_diffusion_matrix(grid_size, advection):
+    """Gets matrix of discrete -laplacian + advection along both axes on
+    square grid (central differences)
+
+    :param grid_size: points per side
+    :param advection: cell Peclet number; diagonally dominant iff <= 1
+    :return: (grid_size ^ 2) x (grid_size ^ 2) non-symmetric matrix
+    """
+
+    one_dimensional = 2 * np.eye(grid_size) \
+        - (1 + advection) * np.eye(grid_size, k=-1) \
+        - (1 - advection) * np.eye(grid_size, k=1)
+    identity = np.eye(grid_size)
+    return np.kron(identity, one_dimensional) + np.kron(one_dimensional, identity)
+
+
+def setup_problem(grid_size, advection):
+    A = scipy.sparse.csr_matrix(
+        get_advection_diffusion_matrix(grid_size, advection)
+    )
+    b = np.random.RandomState(0).rand(A.shape[0])
+    return {'A': A, 'b': b}
+
+
+def register_solver(name, solver_class):
+    def solve(A, b):  # solver is built in timed run: its setup counts
+        with np.errstate(over='ignore', invalid='ignore'):
+            solver_class(A, b).solve(
+                np.zeros(len(b)), ABS_TOLL, REL_TOLL, MAX_ITERATIONS
+            )
+
+    register_sizes('la.advection.' + name, PROBLEMS, setup_problem)(solve)
+
+
+for solver_name, solver in SOLVERS.items():
+    register_solver(solver_name, solver)
+
+
+if __name__ == '__main__':
+    main()
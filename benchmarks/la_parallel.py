@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks scaling of block-parallel Jacobi and red-black Gauss-Seidel
+/ SOR with number of threads (2D Poisson problem, CSR storage): speedup is
+the ratio of medians with 1 thread and with more. Registered in
+hal.profile.benchmark, runs with the whole suite or alone:
+
+    python -m benchmarks.suite 'la.parallel.*'
+
+Benchmarks are named la.parallel.solver[n-threads] (serial Jacobi is
+la.parallel.jacobi_serial[n])"""
+
+import os
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la.iterations import JacobiSolver, ParallelJacobiSolver, \
+    RedBlackGaussSiedelSolver, RedBlackSORSolver
+from hal.profile.benchmark import register_sizes, main
+
+GRID_SIZES = [64, 128]
+ITERATIONS = 100  # fixed amount of work: tolerances are never met
+RELAXATION = 1.9
+
+SOLVERS = {
+    'jacobi': ParallelJacobiSolver,
+    'gauss_seidel_red_black': RedBlackGaussSiedelSolver,
+    'sor_red_black': lambda A, b, workers: RedBlackSORSolver(
+        A, b, RELAXATION, workers),
+}
+
+
+def get_poisson_matrix(grid_size):
+    """Gets matrix of discrete laplacian on square grid, never dense
+
+    :param grid_size: points per side
+    :return: (grid_size ^ 2) x (grid_size ^ 2) SPD matrix (CSR)
+    """
+
+    tridiagonal = scipy.sparse.diags(
+        [-1, 2, -1], [-1, 0, 1], shape=(grid_size, grid_size), dtype=float
+    )
+    identity = scipy.sparse.identity(grid_size)
+    return (scipy.sparse.kron(identity, tridiagonal) +
+            scipy.sparse.kron(tridiagonal, identity)).tocsr()
+
+
+def get_workers_counts():
+    """Gets number of threads to try: 1, 2, 4 ... up to number of cores
+
+    :return: list of number of threads
+    """
+
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    return counts
+
+
+def setup_problem(grid_size, workers=1):
+    A = get_poisson_matrix(grid_size)
+    b = np.random.RandomState(0).rand(A.shape[0])
+    return {'A': A, 'b': b, 'workers': workers}
+
+
+@register_sizes('la.parallel.jacobi_serial', {
+    str(grid_size ** 2): {'grid_size': grid_size} for grid_size in GRID_SIZES
+}, setup_problem)
+def solve_serial(A, b, workers):
+    JacobiSolver(A, b).solve(np.zeros(len(b)), 0, 0, ITERATIONS)
+
+
+def register_solver(name, solver_class):
+    def solve(A, b, workers):  # solver is built in timed run: setup counts
+        solver_class(A, b, workers).solve(np.zeros(len(b)), 0, 0, ITERATIONS)
+
+    problems = {
+        '{}-{}'.format(grid_size ** 2, workers): {
+            'grid_size': grid_size, 'workers': workers
+        }
+        for grid_size in GRID_SIZES for workers in get_workers_counts()
+    }
+    register_sizes('la.parallel.' + name, problems, setup_problem)(solve)
+
+
+for solver_name, solver in SOLVERS.items():
+    register_solver(solver_name, solver)
+
+
+if __name__ == '__main__':
+    main()
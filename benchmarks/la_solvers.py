@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks hal.maths.la solvers on SPD systems (2D Poisson problem,
+5-point stencil), with dense and CSR storage. Registered in
+hal.profile.benchmark, runs with the whole suite or alone:
+
+    python -m benchmarks.suite 'la.poisson.*'
+
+Benchmarks are named la.poisson.solver[storage-n]"""
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la.iterations import JacobiSolver, GaussSiedelSolver, \
+    SORSolver, ConjugateGradientMethodSolver, PreconditionedConjugateGradientMethodSolver
+from hal.maths.la.preconditioners import JacobiPreconditioner, \
+    SSORPreconditioner, IncompleteCholeskyPreconditioner
+from hal.profile.benchmark import register_sizes, main
+
+GRID_SIZES = [8, 16, 24]
+STORAGES = {
+    'dense': np.asarray,
+    'csr': scipy.sparse.csr_matrix,
+}
+PROBLEMS = {  # size label -> params
+    '{}-{}'.format(storage, grid_size ** 2): {
+        'grid_size': grid_size, 'storage': storage
+    }
+    for storage in STORAGES for grid_size in GRID_SIZES
+}
+ABS_TOLL = 1e-8
+REL_TOLL = 0
+
+SOLVERS = {
+    'jacobi': JacobiSolver,
+    'gauss_seidel': GaussSiedelSolver,
+    'sor_auto': SORSolver,
+    'cg': ConjugateGradientMethodSolver,
+    'pcg_jacobi': lambda A, b: PreconditionedConjugateGradientMethodSolver(
+        A, b, JacobiPreconditioner),
+    'pcg_ssor': lambda A, b: PreconditionedConjugateGradientMethodSolver(
+        A, b, SSORPreconditioner),
+    'pcg_ic0': lambda A, b: PreconditionedConjugateGradientMethodSolver(
+        A, b, IncompleteCholeskyPreconditioner),
+}
+
+
+def get_poisson_matrix(grid_size):
+    """Gets matrix of discrete laplacian on square grid
+
+    :param grid_size: points per side
+    :return: (grid_size ^ 2) x (grid_size ^ 2) SPD matrix
+    """
+
+    tridiagonal = 2 * np.eye(grid_size) - np.eye(grid_size, k=1) - \
+        np.eye(grid_size, k=-1)
+    identity = np.eye(grid_size)
+    return np.kron(identity, tridiagonal) + np.kron(tridiagonal, identity)
+
+
+def setup_problem(grid_size, storage):
+    A = get_poisson_matrix(grid_size)
+    b = np.random.RandomState(0).rand(A.shape[0])
+    return {'A': STORAGES[storage](A), 'b': b}
+
+
+def register_solver(name, solver_class):
+    def solve(A, b):  # solver is built in timed run: its setup counts
+        solver_class(A, b).solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL)
+
+    register_sizes('la.poisson.' + name, PROBLEMS, setup_problem)(solve)
+
+
+for solver_name, solver in SOLVERS.items():
+    register_solver(solver_name, solver)
+
+
+if __name__ == '__main__':
+    main()
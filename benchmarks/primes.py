@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks primality tests and prime generation of hal.maths.nt.primes
+against the previous implementation (trial division by modulo,
+random-base Miller-Rabin). Registered in hal.profile.benchmark, runs with
+the whole suite or alone:
+
+    python -m benchmarks.suite 'nt.*'
+
+Benchmarks are named nt.is_probably_prime.test[bits] and
+nt.get_prime.generator[bits]"""
+
+import random
+
+import numpy as np
+
+from hal.maths.nt.primes import LOW_PRIMES, is_probably_prime, \
+    is_probably_prime_many, get_prime
+from hal.profile.benchmark import register_sizes, main
+
+BITS = [16, 32, 48, 64]
+AMOUNT = 5000  # candidates tested by each run
+PRIME_BITS = [512, 1024]  # 2048 bits take ~10 s per run (legacy): -p bits=2048
+PRIME_AMOUNT = 3  # primes generated by each run
+
+
+def legacy_is_probably_prime(n, precision=5):
+    """Previous Integer.is_probably_prime (minus its bugs on 2 and on
+    big exponents), kept as reference
+
+    :param n: number
+    :param precision: rounds of Miller-Rabin
+    :return: True iff probably prime
+    """
+
+    if n in LOW_PRIMES:
+        return True
+
+    for prime in LOW_PRIMES:
+        if n % prime == 0:
+            return False
+
+    s = n - 1
+    t = 0
+    while s % 2 == 0:
+        s //= 2
+        t += 1
+
+    for _ in range(precision):
+        a = random.randrange(2, n - 1)
+        v = pow(a, s, n)
+        if v != 1:
+            i = 0
+            while v != (n - 1):
+                if i == t - 1:
+                    return False
+
+                i += 1
+                v = (v ** 2) % n
+
+    return True
+
+
+def legacy_get_prime(bits):
+    while True:
+        num = random.randrange(2 ** (bits - 1), 2 ** bits)
+        if legacy_is_probably_prime(num):
+            return num
+
+
+def get_candidates(bits, amount):
+    state = np.random.RandomState(bits)
+    return [
+        int(state.randint(2 ** 15, 2 ** 16)) << (bits - 16) |
+        int(state.randint(0, 2 ** 15)) << 1 | 1  # odd
+        for _ in range(amount)
+    ]
+
+
+def setup_candidates(bits, amount):
+    return {'candidates': get_candidates(bits, amount)}
+
+
+TESTS = {
+    'legacy': lambda candidates: [
+        legacy_is_probably_prime(n) for n in candidates
+    ],
+    'single': lambda candidates: [is_probably_prime(n) for n in candidates],
+    'many': is_probably_prime_many,
+}
+
+GENERATORS = {
+    'legacy': legacy_get_prime,
+    'single_core': get_prime,
+    'all_cores': lambda bits: get_prime(bits, workers=None),
+}
+
+
+def register_test(name, test):
+    def run_test(candidates):
+        test(candidates)
+
+    register_sizes('nt.is_probably_prime.' + name, {
+        str(bits): {'bits': bits, 'amount': AMOUNT} for bits in BITS
+    }, setup_candidates)(run_test)
+
+
+def register_generator(name, generator):
+    def generate(bits, amount):
+        random.seed(bits)  # same candidates in each run
+        for _ in range(amount):
+            generator(bits)
+
+    register_sizes('nt.get_prime.' + name, {
+        str(bits): {'bits': bits, 'amount': PRIME_AMOUNT} for bits in PRIME_BITS
+    })(generate)
+
+
+for test_name, primality_test in TESTS.items():
+    register_test(test_name, primality_test)
+
+for generator_name, prime_generator in GENERATORS.items():
+    register_generator(generator_name, prime_generator)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks of hot paths of hal, on synthetic data of different sizes.
+Runs offline, prints (or saves) JSON report of hal.profile.benchmark:
+
+    python -m benchmarks.suite [names or patterns] [-r repeats] [-o report.json]
+    python -m benchmarks.suite --list
+
+Benchmarks are named area.function[size]. Solvers, primes and convergence
+checks are benchmarked in their own modules, imported here"""
+
+import importlib
+import os
+
+import numpy as np
+
+from benchmarks import data
+from hal.data.linked_list import LinkedList
+from hal.files.models.system import ls_recurse
+from hal.files.parsers import CSVParser
+from hal.hashes.md5 import file_to_md5
+from hal.internet.parse import HtmlTable
+from hal.maths.la.iterations import JacobiSolver, GaussSiedelSolver, \
+    ConjugateGradientMethodSolver, GMRESSolver
+from hal.maths.probability.monte_carlo.uniform import MonteCarlo1D, \
+    MonteCarlo2D
+from hal.profile.benchmark import register_sizes, main
+from hal.streams.pretty_table import SqlTable
+from hal.strings.models import String
+from hal.strings.utils import get_max_similar
+
+MODULES = [  # register their benchmarks too
+    'benchmarks.la_solvers', 'benchmarks.la_krylov', 'benchmarks.la_parallel',
+    'benchmarks.toll_checks', 'benchmarks.primes'
+]
+
+# size label -> params of benchmarks
+TREES = {
+    'small': {'depth': 2, 'breadth': 4, 'files': 4},
+    'large': {'depth': 3, 'breadth': 8, 'files': 8},
+}
+FILES = {'1MB': {'size': 2 ** 20}, '16MB': {'size': 2 ** 24}}
+TABLES = {
+    '100x6': {'rows': 100, 'columns': 6},
+    '5000x6': {'rows': 5000, 'columns': 6},
+}
+PRETTY_TABLES = {  # SqlTable parses every value
+    '50x6': {'rows': 50, 'columns': 6},
+    '200x6': {'rows': 200, 'columns': 6},
+}
+TEXTS = {'1k': {'length': 1000}, '10k': {'length': 10000}}
+WORD_LISTS = {'100': {'amount': 100}, '2000': {'amount': 2000}}
+SAMPLES = {'1k': {'n': 1000}, '100k': {'n': 100000}}
+SYSTEMS = {'100': {'n': 100}, '500': {'n': 500}}
+LISTS = {  # LinkedList.from_list recurses once per item
+    '100': {'length': 100}, '500': {'length': 500}
+}
+
+LA_SOLVERS = {
+    'jacobi': JacobiSolver,
+    'gauss_seidel': GaussSiedelSolver,
+    'cg': ConjugateGradientMethodSolver,
+    'gmres': GMRESSolver,
+}
+ABS_TOLL = 1e-8
+REL_TOLL = 0
+
+
+# files
+
+def setup_tree(depth, breadth, files):
+    root = data.make_temp_dir()
+    data.make_tree(root, depth, breadth, files)
+    return {'root': root}
+
+
+@register_sizes('files.ls_recurse', TREES, setup_tree, data.remove_temp_dir)
+def list_tree(root):
+    ls_recurse(root, include_hidden=True)
+
+
+def setup_file(size):
+    root = data.make_temp_dir()
+    return {'root': root, 'path': data.make_file(os.path.join(root, 'data'), size)}
+
+
+@register_sizes('hashes.file_to_md5', FILES, setup_file, data.remove_temp_dir)
+def hash_file(root, path):
+    file_to_md5(path)
+
+
+def setup_csv(rows, columns):
+    root = data.make_temp_dir()
+    path = data.make_csv(os.path.join(root, 'data.csv'), rows, columns)
+    return {'root': root, 'path': path}
+
+
+@register_sizes('files.csv_get_matrix', TABLES, setup_csv, data.remove_temp_dir)
+def parse_csv(root, path):
+    CSVParser(path).get_matrix()
+
+
+# streams and strings
+
+def setup_table(rows, columns):
+    labels, table = data.make_table(rows, columns)
+    return {'labels': labels, 'table': table}
+
+
+@register_sizes('streams.sql_table_build', PRETTY_TABLES, setup_table)
+def build_table(labels, table):
+    SqlTable(labels, table, '{:.3f}', '\n').build()
+
+
+def setup_html_table(rows, columns):
+    return {'source': data.make_html_table(rows, columns)}
+
+
+@register_sizes('internet.html_table_parse', TABLES, setup_html_table)
+def parse_html_table(source):
+    HtmlTable(source).parse()
+
+
+def setup_text(length):
+    return {'text': data.make_colored_text(length)}
+
+
+@register_sizes('strings.remove_control_chars', TEXTS, setup_text)
+def remove_control_chars(text):
+    String(text).remove_control_chars()
+
+
+def setup_words(amount):
+    words = data.make_words(amount, 12)
+    return {'word': data.make_words(1, 12, seed=0)[0], 'words': words}
+
+
+@register_sizes('strings.get_max_similar', WORD_LISTS, setup_words)
+def find_max_similar(word, words):
+    get_max_similar(word, words)
+
+
+# maths
+
+def gaussian(x):
+    return np.exp(-x * x)
+
+
+def gaussian_2d(y, x):
+    return np.exp(-x * x - y * y)
+
+
+def setup_monte_carlo(n):
+    np.random.seed(data.SEED)
+    return {'n': n}
+
+
+@register_sizes('maths.monte_carlo_1d', SAMPLES, setup_monte_carlo)
+def integrate_1d(n):
+    MonteCarlo1D(gaussian).integrate((-1, 1), n)
+
+
+@register_sizes('maths.monte_carlo_2d', SAMPLES, setup_monte_carlo)
+def integrate_2d(n):
+    MonteCarlo2D(gaussian_2d).integrate(((-1, 1), (-1, 1)), n)
+
+
+def setup_system(n):
+    A, b = data.make_system(n)
+    return {'A': A, 'b': b}
+
+
+def register_solver(name, solver_class):
+    def solve(A, b):
+        solver_class(A, b).solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL)
+
+    register_sizes('la.' + name, SYSTEMS, setup_system)(solve)
+
+
+for solver_name, solver in LA_SOLVERS.items():
+    register_solver(solver_name, solver)
+
+
+# data structures
+
+def setup_list(length):
+    return {'values': list(range(length))}
+
+
+@register_sizes('data.linked_list', LISTS, setup_list)
+def use_linked_list(values):
+    linked_list = LinkedList(values)
+    for value in values[:100]:  # insertions walk the list
+        linked_list.insert_last(value)
+        linked_list.insert_first(value)
+
+    for position in range(0, len(values), max(1, len(values) // 100)):
+        linked_list.get(position)
+
+    for _ in range(100):  # remove_last prints: it would time stdout
+        linked_list.remove(len(values) // 2)
+        linked_list.remove_first()
+
+    linked_list.to_lst()
+
+
+for module in MODULES:
+    importlib.import_module(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""Micro-benchmarks convergence checks, run once per iteration by every
+solver: legacy one-vector check (in a loop over columns), plain NumPy
+block check and TollChecker (reused buffers). Each run makes CALLS calls.
+Registered in hal.profile.benchmark, runs with the whole suite or alone:
+
+    python -m benchmarks.suite 'la.toll_check.*'
+
+Benchmarks are named la.toll_check.check[n-k]"""
+
+import numpy as np
+
+from hal.algorithms.iterative.utils import is_toll_enough, TollChecker
+from hal.maths.la.matrix import Matrix
+from hal.maths.la.utils import NORMS
+from hal.profile.benchmark import register_sizes, main
+
+SHAPES = {
+    '{}-{}'.format(n, k): {'n': n, 'k': k}
+    for n, k in [(100, 1), (100, 16), (10000, 1), (10000, 16)]
+}
+CALLS = 200  # calls in each run: single ones are too short to time
+REL_TOLL = 1e-6
+ABS_TOLL = 1e-8
+
+
+def check_loop(X_new, X):
+    return [
+        is_toll_enough(Matrix(x_new), Matrix(x), REL_TOLL, ABS_TOLL)
+        for x_new, x in zip(X_new.T, X.T)
+    ]
+
+
+def check_numpy(X_new, X):
+    errors = np.linalg.norm(X_new - X, axis=0)
+    return errors < np.linalg.norm(X, axis=0) * REL_TOLL + ABS_TOLL
+
+
+def setup_blocks(n, k):
+    state = np.random.RandomState(0)
+    X = state.uniform(-1, 1, size=(n, k))
+    X_new = X + 1e-7 * state.uniform(-1, 1, size=(n, k))
+    return {'X_new': X_new, 'X': X}
+
+
+def register_check(name, get_check):
+    """Registers check as benchmark for each shape
+
+    :param name: name of check
+    :param get_check: function() -> function(X_new, X), built untimed
+    """
+
+    def setup(n, k):
+        inputs = setup_blocks(n, k)
+        inputs['check'] = get_check()  # buffers are allocated here
+        return inputs
+
+    @register_sizes('la.toll_check.' + name, SHAPES, setup)
+    def call_check(check, X_new, X):
+        for _ in range(CALLS):
+            check(X_new, X)
+
+
+register_check('loop_l2', lambda: check_loop)  # legacy
+register_check('numpy_block_l2', lambda: check_numpy)
+for norm in NORMS:
+    register_check(
+        'toll_checker_{}'.format(norm),
+        lambda norm=norm: TollChecker(REL_TOLL, ABS_TOLL, norm).check
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,10 @@
 # coding: utf-8
 
 
-from hal.maths.la.utils import get_error, apply_toll
+import numpy as np
+
+from hal.maths.la.utils import get_error, apply_toll, as_columns, \
+    get_column_norms, L2_NORM, LINFINITE_NORM, NORMS
 
 
 def is_toll_enough(x, x_real, rel_toll, abs_toll):
@@ -12,5 +15,89 @@ def is_toll_enough(x, x_real, rel_toll, abs_toll):
     if x_real is None:
         return False
 
-    diff = get_error(x, x_real)  # todo test fix
+    diff = get_error(x, x_real)
     return diff < apply_toll(x_real, rel_toll, abs_toll)
+
+
+class TollChecker:
+    """Checks convergence of a batch of iterates (columns) at once. Work
+    buffers are kept between calls, so checks at each iteration allocate only
+    O(k) memory for k columns"""
+
+    def __init__(self, rel_toll, abs_toll, norm=L2_NORM):
+        """
+        :param rel_toll: relative tolerance
+        :param abs_toll: absolute tolerance
+        :param norm: L2_NORM (||x - x_real|| < rel_toll * ||x_real|| +
+            abs_toll), LINFINITE_NORM (same, with max norm), or
+            COMPONENT_NORM (|x_i - x_real_i| < rel_toll * |x_real_i| +
+            abs_toll for each i)
+        """
+
+        if norm not in NORMS:
+            raise ValueError('Unknown norm: {}'.format(norm))
+
+        self.rel_toll = rel_toll
+        self.abs_toll = abs_toll
+        self.norm = norm
+        self._diff = np.empty((0, 0))
+        self._tolls = np.empty((0, 0))
+
+    def get_buffer(self, buffer, shape):
+        if buffer.shape[0] != shape[0] or buffer.shape[1] < shape[1]:
+            buffer = np.empty(shape)  # grows once, then is reused
+
+        return buffer
+
+    def check(self, X, X_real):
+        """Checks each column
+
+        :param X: vector, or n x k block of vectors
+        :param X_real: vector, or n x k block of reference vectors
+        :return: True iff tolerance is met (one for each column if block)
+        """
+
+        is_vector = np.ndim(X_real) == 1
+        X = as_columns(X)
+        X_real = as_columns(X_real)
+
+        self._diff = self.get_buffer(self._diff, X.shape)
+        diff = self._diff[:, :X.shape[1]]
+        np.subtract(X, X_real, out=diff)
+
+        if self.norm == L2_NORM:
+            errors = get_column_norms(diff, L2_NORM)
+            sizes = get_column_norms(X_real, L2_NORM)
+            checks = errors < sizes * self.rel_toll + self.abs_toll
+        elif X.shape[0] == 0:
+            checks = np.full(X.shape[1], self.abs_toll > 0)
+        else:
+            self._tolls = self.get_buffer(self._tolls, X.shape)
+            tolls = self._tolls[:, :X.shape[1]]
+            np.abs(X_real, out=tolls)
+            np.abs(diff, out=diff)
+
+            if self.norm == LINFINITE_NORM:
+                errors = diff.max(axis=0)
+                checks = errors < tolls.max(axis=0) * self.rel_toll + self.abs_toll
+            else:
+                tolls *= self.rel_toll
+                tolls += self.abs_toll
+                diff -= tolls  # < 0 iff within tolerance
+                checks = diff.max(axis=0) < 0
+
+        return bool(checks[0]) if is_vector else checks
+
+
+def are_toll_enough(X, X_real, rel_toll, abs_toll, norm=L2_NORM):
+    """Checks convergence of each column of block
+
+    :param X: n x k block of iterates
+    :param X_real: n x k block of references
+    :param rel_toll: relative tolerance
+    :param abs_toll: absolute tolerance
+    :param norm: L2_NORM, LINFINITE_NORM or COMPONENT_NORM
+    :return: k booleans
+    """
+
+    return TollChecker(rel_toll, abs_toll, norm).check(X, X_real)
@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import itertools
+
+import numpy as np
+
+BLOCK_SIZE = 2 ** 16  # rows of blocks of get_superset_blocks
+
 
 def recursive_set(lst, length):
     """Returns the set of all possible sets with such items
@@ -21,13 +27,156 @@ def recursive_set(lst, length):
     ]
 
 
-def get_superset(iterable, length):
-    """Returns the set of all possible sets with such items
+def get_items(iterable):
+    """Gets distinct items, in the order used by all superset functions:
+    order of first appearance in input, so ranks of sets do not depend on
+    hashing (e.g PYTHONHASHSEED)
+
+    :param iterable: iterable
+    :return: list
+    """
+
+    return list(dict.fromkeys(iterable))
+
+
+def get_superset(iterable, length, start=0, stop=None):
+    """Lazily generates all possible sets with such items. i-th set is i
+    written in base (number of items), with items as digits
 
     :param iterable: iterable
     :param length: length of inner sets
-    :return: set of all sets
+    :param start: rank of first set to generate (to split among workers)
+    :param stop: rank of set to stop at (None for last one)
+    :return: generator of lists
+    """
+
+    lst = get_items(iterable)
+    count = count_superset(lst, length)
+    stop = count if stop is None else min(stop, count)
+    if start >= stop:
+        return
+
+    if start == 0:
+        sets = itertools.product(lst, repeat=length)
+    else:  # jump to start, then count from there
+        sets = (
+            [lst[digit] for digit in digits]
+            for digits in iterate_from(get_digits(start, len(lst), length), len(lst))
+        )
+
+    if stop < count:
+        sets = itertools.islice(sets, stop - start)
+
+    for subset in sets:
+        yield list(subset)
+
+
+def get_digits(rank, base, length):
+    """Writes number in base
+
+    :param rank: number
+    :param base: base
+    :param length: number of digits
+    :return: list of digits, most significant first
+    """
+
+    digits = []
+    for _ in range(length):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+
+    return digits[::-1]
+
+
+def iterate_from(digits, base):
+    """Counts in base, from digits (most significant first) to overflow
+
+    :param digits: list of digits
+    :param base: base
+    :return: generator of tuples of digits
+    """
+
+    digits = list(digits)
+    while True:
+        yield tuple(digits)
+
+        position = len(digits) - 1
+        while position >= 0 and digits[position] == base - 1:
+            digits[position] = 0
+            position -= 1
+
+        if position < 0:
+            return
+
+        digits[position] += 1
+
+
+def count_superset(iterable, length):
+    """Counts sets generated by get_superset, without generating them
+
+    :param iterable: iterable
+    :param length: length of inner sets
+    :return: number of sets
     """
 
-    lst = list(set(iterable))
-    return recursive_set(lst, length)
+    return len(get_items(iterable)) ** length
+
+
+def rank_superset(iterable, subset):
+    """Gets position of set in get_superset
+
+    :param iterable: iterable
+    :param subset: one of the sets
+    :return: rank
+    """
+
+    positions = {item: i for i, item in enumerate(get_items(iterable))}
+    rank = 0
+    for item in subset:
+        rank = rank * len(positions) + positions[item]
+
+    return rank
+
+
+def unrank_superset(iterable, length, rank):
+    """Gets set in given position of get_superset
+
+    :param iterable: iterable
+    :param length: length of inner sets
+    :param rank: position
+    :return: set (list)
+    """
+
+    lst = get_items(iterable)
+    if not 0 <= rank < count_superset(lst, length):
+        raise ValueError('Rank out of range: {}'.format(rank))
+
+    return [lst[digit] for digit in get_digits(rank, len(lst), length)]
+
+
+def get_superset_blocks(iterable, length, block_size=BLOCK_SIZE, start=0,
+                        stop=None):
+    """Generates sets of get_superset in blocks, as rows of arrays
+
+    :param iterable: iterable of numbers
+    :param length: length of inner sets
+    :param block_size: max rows of each block
+    :param start: rank of first set to generate
+    :param stop: rank of set to stop at (None for last one)
+    :return: generator of np.ndarray (rows x length)
+    """
+
+    items = np.asarray(get_items(iterable))
+    n_items = len(items)
+    count = count_superset(items, length)
+    if count > np.iinfo(np.int64).max:
+        raise ValueError('Too many sets to rank with 64-bit integers')
+
+    stop = count if stop is None else min(stop, count)
+    place_values = n_items ** np.arange(length - 1, -1, -1, dtype=np.int64)
+
+    for block_start in range(start, stop, block_size):
+        ranks = np.arange(block_start, min(block_start + block_size, stop),
+                          dtype=np.int64)
+        digits = (ranks[:, np.newaxis] // place_values) % n_items
+        yield items[digits]
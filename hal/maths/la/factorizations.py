@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import abc
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+
+
+def get_permutation_sign(permutation):
+    """Gets sign of permutation
+
+    :param permutation: permutation of 0, 1, ..., n - 1
+    :return: +1 if even, -1 if odd
+    """
+
+    visited = np.zeros(len(permutation), dtype=bool)
+    sign = 1
+
+    for start in range(len(permutation)):
+        if not visited[start]:
+            cycle_length = 0
+            i = start
+            while not visited[i]:
+                visited[i] = True
+                i = permutation[i]
+                cycle_length += 1
+
+            if cycle_length % 2 == 0:
+                sign = -sign
+
+    return sign
+
+
+class Factorization:
+    """A = product of factors easy to invert"""
+
+    def __init__(self, A):
+        """
+        :param A: np.ndarray, or scipy.sparse matrix
+        """
+
+        self.shape = A.shape
+
+    @abc.abstractmethod
+    def solve(self, b, transposed=False):
+        """Solves A * x = b
+
+        :param b: right-hand side(s), n x k
+        :param transposed: solve A^T * x = b instead
+        :return: x
+        """
+
+        return b
+
+    @abc.abstractmethod
+    def determinant(self):
+        return 0
+
+
+class LUFactorization(Factorization):
+    """P * A = L * U (partial pivoting); SuperLU if sparse"""
+
+    def __init__(self, A):
+        super().__init__(A)
+
+        if scipy.sparse.issparse(A):
+            self.lu = scipy.sparse.linalg.splu(A.tocsc())
+            self.piv = None
+        else:
+            self.lu, self.piv = scipy.linalg.lu_factor(A, check_finite=False)
+
+    def solve(self, b, transposed=False):
+        if self.piv is None:
+            return self.lu.solve(b, trans='T' if transposed else 'N')
+
+        return scipy.linalg.lu_solve(
+            (self.lu, self.piv), b, trans=int(transposed), check_finite=False
+        )
+
+    def determinant(self):
+        if self.piv is None:
+            sign = get_permutation_sign(self.lu.perm_r) * \
+                get_permutation_sign(self.lu.perm_c)
+            return sign * np.prod(self.lu.U.diagonal())  # L has unit diagonal
+
+        sign = (-1) ** np.count_nonzero(self.piv != np.arange(len(self.piv)))
+        return sign * np.prod(np.diagonal(self.lu))
+
+
+class CholeskyFactorization(Factorization):
+    """A = L * L^T; A must be symmetric definite positive (and dense)"""
+
+    def __init__(self, A):
+        super().__init__(A)
+
+        self.c, self.lower = scipy.linalg.cho_factor(A, lower=True, check_finite=False)
+
+    def solve(self, b, transposed=False):
+        return scipy.linalg.cho_solve((self.c, self.lower), b, check_finite=False)
+
+    def determinant(self):
+        return np.prod(np.diagonal(self.c)) ** 2
+
+
+def factorize(A, symmetric=False):
+    """Factorizes with Cholesky when possible, LU otherwise
+
+    :param A: np.ndarray, or scipy.sparse matrix
+    :param symmetric: True iff A is symmetric
+    :return: Factorization
+    """
+
+    if symmetric and not scipy.sparse.issparse(A):
+        try:
+            return CholeskyFactorization(A)
+        except np.linalg.LinAlgError:  # not definite positive
+            pass
+
+    return LUFactorization(A)
@@ -4,44 +4,172 @@
 
 import abc
 
+import numpy as np
 
-from algorithms.iterative.utils import is_toll_enough
-from hal.maths.la.utils import get_error
-from hal.maths.la.matrix import LinearSystemMatrix
+from hal.algorithms.iterative.utils import is_toll_enough, TollChecker
+from hal.maths.la.utils import get_error, L2_NORM
+from hal.maths.la.matrix import Matrix, LinearSystemMatrix, solve_triangular
+from hal.maths.la.monitor import SolveMonitor, get_residual_norms
+from hal.maths.la.operators import LinearOperator, as_operator
+from hal.maths.la.parallel import BlockPool, get_blocks, get_coloring
+from hal.maths.la.preconditioners import Preconditioner
 
 DEFAULT_TOLL = 1e-16
+RELAXATION_CANDIDATES = np.arange(1, 20) / 10  # 0.1, 0.2 ... 1.9
+RELAXATION_SWEEPS = 20  # sweeps to estimate contraction of each candidate
+GMRES_RESTART = 30  # Arnoldi steps between restarts
+MIN_COLOR_SIZE = 2  # average unknowns of a color to sweep colors in parallel
 
 
 class LinearSystemSolver:
     def __init__(self, A, b):
-        self.A = LinearSystemMatrix(A) if not isinstance(A, LinearSystemMatrix) else A
+        """
+        :param A: matrix, or LinearOperator (only for solvers needing just
+            matvecs)
+        :param b: right-hand side
+        """
+
+        self.A = LinearSystemMatrix(A) \
+            if not isinstance(A, (LinearSystemMatrix, LinearOperator)) else A
         self.b = LinearSystemMatrix(b) if not isinstance(b, LinearSystemMatrix) else b
-        self.b = self.b.transpose()  # column vector
+        self.b = self.b.to_dense().transpose()  # column vector
 
         self.x = None
+        self.report = None
 
     def get_solution(self):
         return self.x
 
+    def get_report(self):
+        """Gets summary of last solve
+
+        :return: SolveReport
+        """
+
+        return self.report
+
+    def get_operator(self):
+        """Gets matvec-only view of A
+
+        :return: scipy.sparse.linalg.LinearOperator
+        """
+
+        return as_operator(self.A)
+
+    def get_residual_norm(self, x):
+        return (self.b - self.A * x).linear_norm()
+
     def check_solution(self, abs_toll=DEFAULT_TOLL, rel_toll=0):
-        return is_toll_enough(self.A * self.x, self.b, abs_toll, rel_toll)
+        return is_toll_enough(self.A * self.x, self.b, rel_toll, abs_toll)
 
     def get_solution_error(self):
         return get_error(self.A * self.x, self.b)
 
 
+class DirectSolver(LinearSystemSolver):
+    """Solves with factorization of A, which is cached in A: pass the same
+    LinearSystemMatrix to solve many systems in O(n^2) each"""
+
+    def solve(self):
+        monitor = SolveMonitor()
+        monitor.start(self.b.linear_norm())
+
+        monitor.start_iteration()
+        x = self.A.get_factorization().solve(self.b.to_numpy())
+        monitor.end_iteration()
+
+        self.x = LinearSystemMatrix(x)
+        monitor.record(0, self.x, self.get_residual_norm(self.x))
+        self.report = monitor.get_report(0, True)
+        return self.report
+
+    def solve_many(self, B):
+        """Solves A * X = B, i.e a system for each column of B
+
+        :param B: n x k block of right-hand sides
+        :return: SolveReport
+        """
+
+        B = Matrix(B).to_dense().to_numpy()
+        monitor = SolveMonitor()
+        monitor.start(np.linalg.norm(B, axis=0))
+
+        monitor.start_iteration()
+        X = self.A.get_factorization().solve(B)
+        monitor.end_iteration()
+
+        self.x = Matrix(X)
+        monitor.record(0, X, get_residual_norms(self.A.to_numpy(), X, B))
+        n_columns = B.shape[1]
+        self.report = monitor.get_report(
+            np.zeros(n_columns, dtype=int), np.ones(n_columns, dtype=bool)
+        )
+        return self.report
+
+
 class IterativeLinearSystemSolver(LinearSystemSolver):
+    convergence_norm = L2_NORM  # of updates, in stationary methods
+
     def set_tolls(self, abs_toll, rel_toll):
         self.abs_toll = abs_toll
         self.rel_toll = rel_toll
+        self.toll_checker = TollChecker(rel_toll, abs_toll, self.convergence_norm)
 
     @abc.abstractmethod
-    def solve(self, x, abs_toll, rel_toll):
+    def solve(self, x, abs_toll, rel_toll, max_iterations=None, callback=None,
+              record_residuals=False):
+        """Solves A * x = b
+
+        :param x: initial guess
+        :param abs_toll: absolute tolerance
+        :param rel_toll: relative tolerance
+        :param max_iterations: stop after this many iterations (None for no
+            limit)
+        :param callback: called as callback(iteration, x, residual) after
+            each iteration; solve stops if it returns True
+        :param record_residuals: keep history of residual norms in report
+            (stationary methods need an extra product by A per iteration
+            to get them, Krylov ones record them by default)
+        :return: SolveReport
+        """
+
         self.x = LinearSystemMatrix(x).transpose() if not isinstance(x, LinearSystemMatrix) else x
         self.set_tolls(abs_toll, rel_toll)
 
+    @abc.abstractmethod
+    def solve_many(self, B, X, abs_toll, rel_toll, max_iterations=None,
+                   callback=None, record_residuals=False):
+        """Solves A * X = B, i.e a system for each column of B, all at once
+
+        :param B: n x k block of right-hand sides
+        :param X: n x k block of initial guesses
+        :param abs_toll: absolute tolerance
+        :param rel_toll: relative tolerance
+        :param max_iterations: stop after this many iterations (None for no
+            limit)
+        :param callback: called as callback(iteration, X, residuals) after
+            each iteration; solve stops if it returns True
+        :param record_residuals: keep history of residual norms in report
+        :return: SolveReport (iterations and convergence of each column)
+        """
+
+        self.set_tolls(abs_toll, rel_toll)
+        B = Matrix(B).to_dense().to_numpy()
+        X = Matrix(X).to_dense().to_numpy().astype(float)  # copy
+        return B, X
+
     def is_toll_enough(self, x_new, x):
-        return is_toll_enough(x_new, x, self.abs_toll, self.rel_toll)
+        return bool(np.all(self.toll_checker.check(x_new.to_numpy(), x.to_numpy())))
+
+    def is_toll_enough_many(self, X_new, X):
+        """Checks convergence of each column
+
+        :param X_new: n x k block of new iterates
+        :param X: n x k block of old iterates
+        :return: k booleans
+        """
+
+        return self.toll_checker.check(X_new, X)
 
 
 class PureIterativeLinearSystemSolver(IterativeLinearSystemSolver):
@@ -49,87 +177,682 @@ class PureIterativeLinearSystemSolver(IterativeLinearSystemSolver):
     def iteration(self, x):
         pass
 
-    def solve(self, x, abs_toll, rel_toll):
+    def solve(self, x, abs_toll, rel_toll, max_iterations=None, callback=None,
+              record_residuals=False):
         super().solve(x, abs_toll, rel_toll)
         x = self.x
 
+        monitor = SolveMonitor(max_iterations, callback, record_residuals)
+        residuals = monitor.needs_residuals()  # else skip products by A
+        monitor.start(self.get_residual_norm(x) if residuals else None)
         enough_toll = False
         it_counter = 0
 
-        while not enough_toll:
+        while not enough_toll and not monitor.is_over(it_counter):
+            monitor.start_iteration()
             x_new = self.iteration(x)
             enough_toll = self.is_toll_enough(x_new, x)
+            monitor.end_iteration()
 
             it_counter += 1
             x = x_new
 
+            residual = self.get_residual_norm(x) if residuals else None
+            if monitor.record(it_counter, x, residual):
+                break
+
         self.x = x
-        return it_counter
+        self.report = monitor.get_report(it_counter, enough_toll)
+        return self.report
+
+    def solve_many(self, B, X, abs_toll, rel_toll, max_iterations=None,
+                   callback=None, record_residuals=False):
+        B, X = super().solve_many(B, X, abs_toll, rel_toll)
+        A = self.get_operator()
+        it_counters = np.zeros(B.shape[1], dtype=int)
+        converged = np.zeros(B.shape[1], dtype=bool)
+        active = np.arange(B.shape[1])
+        b = self.b
+
+        monitor = SolveMonitor(max_iterations, callback, record_residuals)
+        residuals = monitor.needs_residuals()  # else skip products by A
+        norms = get_residual_norms(A, X, B) if residuals else None
+        monitor.start(None if norms is None else norms.copy())
+        loop_counter = 0
+
+        try:
+            self.b = Matrix(B)
+            X_active = X
+            while active.size > 0 and not monitor.is_over(loop_counter):
+                monitor.start_iteration()
+                X_new = self.iteration(Matrix(X_active)).to_numpy()
+                enough_toll = self.is_toll_enough_many(X_new, X_active)
+                monitor.end_iteration()
+
+                loop_counter += 1
+                it_counters[active] += 1
+                X[:, active] = X_new
+                X_active = X_new
+
+                if residuals:
+                    norms[active] = get_residual_norms(A, X_new, self.b.to_numpy())
+                stop = monitor.record(
+                    loop_counter, X, None if norms is None else norms.copy()
+                )
+
+                if np.any(enough_toll):  # drop from active set
+                    converged[active[enough_toll]] = True
+                    active = active[~enough_toll]
+                    self.b = Matrix(B[:, active])
+                    X_active = X_new[:, ~enough_toll]
+
+                if stop:
+                    break
+        finally:
+            self.b = b
+
+        self.x = Matrix(X)
+        self.report = monitor.get_report(it_counters, converged)
+        return self.report
+
+
+class DLUIterativeLinearSystemSolver(PureIterativeLinearSystemSolver):
+    @abc.abstractmethod
+    def setup(self, D, L, U):
+        """Precomputes what iterations need: A = D + L + U never changes,
+        so this is done once per solve
 
+        :param D: diagonal part of A
+        :param L: strictly lower part of A
+        :param U: strictly upper part of A
+        """
 
-class DLUIterativeLinearSystemSolver(IterativeLinearSystemSolver):
-    @abc.abstractmethod
-    def iteration(self, x, D, L, U):
         pass
 
-    def solve(self, x, abs_toll, rel_toll):
-        super().solve(x, abs_toll, rel_toll)
-        x = self.x
-
+    def prepare(self):
         D, L, U = self.A.dlu_decompose()
-        enough_toll = False
-        it_counter = 0
+        self.setup(D, L, U)
 
-        while not enough_toll:
-            x_new = self.iteration(x, D, L, U)
-            enough_toll = self.is_toll_enough(x_new, x)
+    def solve(self, x, abs_toll, rel_toll, max_iterations=None, callback=None,
+              record_residuals=False):
+        self.prepare()
 
-            it_counter += 1
-            x = x_new
+        return super().solve(x, abs_toll, rel_toll, max_iterations, callback,
+                             record_residuals)
 
-        self.x = x
-        return it_counter
+    def solve_many(self, B, X, abs_toll, rel_toll, max_iterations=None,
+                   callback=None, record_residuals=False):
+        self.prepare()
+
+        return super().solve_many(B, X, abs_toll, rel_toll, max_iterations,
+                                  callback, record_residuals)
 
 
 class JacobiSolver(DLUIterativeLinearSystemSolver):
-    def iteration(self, x, D, L, U):
-        S = (L + U) * -1
-        x_new = D.inverse() * ((S * x) + self.b)
-        return x_new
+    """Needs only diagonal and matvecs: works with LinearOperator too"""
+
+    def prepare(self):  # no need to split A
+        self.setup(None, None, None)
+
+    def setup(self, D, L, U):
+        self.inv_diagonal = 1.0 / self.A.get_diagonal_values().reshape(-1, 1)
+
+    def iteration(self, x):
+        residual = self.b.to_numpy() - (self.A * x).to_numpy()
+        return x + Matrix(self.inv_diagonal * residual)
 
 
 class GaussSiedelSolver(DLUIterativeLinearSystemSolver):
-    def iteration(self, x, D, L, U):
-        a = (D + L).inverse()
-        x_new = (a * -1 * U * x) + (a * self.b)
-        return x_new
+    def setup(self, D, L, U):
+        self.lower = (D + L).to_numpy()
+        self.U = U
+
+    def iteration(self, x):
+        rhs = (self.b - self.U * x).to_numpy()
+        return Matrix(solve_triangular(self.lower, rhs, lower=True))
 
 
 class SORSolver(DLUIterativeLinearSystemSolver):
-    def __init__(self, A, b, w):
+    def __init__(self, A, b, w=None):
+        """
+        :param w: relaxation factor, None to choose it automatically
+        """
+
         super().__init__(A, b)
 
         self.w = w
+        self.relaxation = w
+
+    def get_relaxation(self):
+        """Gets relaxation factor (the chosen one, if automatic)
+
+        :return: relaxation factor
+        """
+
+        return self.relaxation
+
+    def setup(self, D, L, U):
+        w = self.w
+        if w is None:  # same matrix -> same choice
+            w = self.A.get_cached('sor relaxation', lambda: self.find_relaxation(D, L, U))
+
+        self.set_relaxation(D, L, U, w)
+
+    def set_relaxation(self, D, L, U, w):
+        self.relaxation = w
+        self.lower = (D + L * w).to_numpy()
+        self.T = U * (-w) + D * (1 - w)
+
+    def find_relaxation(self, D, L, U):
+        """Finds optimal relaxation factor 2 / (1 + sqrt(1 - rho^2)), where rho
+        is the spectral radius of Jacobi iteration matrix (optimal for
+        consistently ordered matrices). If Jacobi does not converge, searches
+        the factor which contracts most in the first few sweeps
+
+        :param D: diagonal part of A
+        :param L: strictly lower part of A
+        :param U: strictly upper part of A
+        :return: relaxation factor
+        """
+
+        rho = self.A.get_jacobi_spectral_radius()
+        if rho < 1:
+            return 2 / (1 + np.sqrt(1 - rho ** 2))
+
+        return self.search_relaxation(D, L, U)
 
-    def iteration(self, x, D, L, U):
-        a = (D + L * self.w).inverse()
-        T_sor = a * (U * (-self.w) + D * (1 - self.w))
-        C_sor = a * self.w
-        x_new = T_sor * x + C_sor * self.b
-        return x_new
+    def search_relaxation(self, D, L, U):
+        """Runs a few sweeps with each candidate relaxation factor on the
+        homogeneous system A * e = 0 (iterates are errors, whatever b is),
+        from the same random start
 
-    # todo good choice for w
+        :param D: diagonal part of A
+        :param L: strictly lower part of A
+        :param U: strictly upper part of A
+        :return: factor with the smallest asymptotic contraction rate of
+            errors (1, i.e Gauss-Seidel, unless another one is faster)
+        """
+
+        start = np.random.RandomState(0).uniform(-1, 1, size=(D.get_n_rows(), 1))
+        half = RELAXATION_SWEEPS // 2
+
+        rates = {}
+        for w in sorted(set(RELAXATION_CANDIDATES) | {1.0}):
+            self.set_relaxation(D, L, U, w)
+            error = start
+            log_norms = []
+
+            for _ in range(RELAXATION_SWEEPS):
+                error = solve_triangular(
+                    self.lower, (self.T * Matrix(error)).to_numpy(), lower=True
+                )
+                norm = np.linalg.norm(error)
+                if norm == 0:  # exact after a few sweeps
+                    return w
+
+                log_norms.append(np.log(norm))
+                error = error / norm  # no overflow nor underflow
+
+            rates[w] = np.mean(log_norms[half:])  # log of contraction rate
+
+        best_w = min(rates, key=rates.get)
+        return best_w if rates[best_w] < rates[1.0] else 1.0
+
+    def iteration(self, x):
+        rhs = (self.T * x + self.b * self.relaxation).to_numpy()
+        return Matrix(solve_triangular(self.lower, rhs, lower=True))
+
+
+class ParallelJacobiSolver(JacobiSolver):
+    """Jacobi with rows split in blocks, updated by a pool of threads"""
+
+    def __init__(self, A, b, workers=None):
+        """
+        :param workers: number of threads (None for number of cores)
+        """
+
+        super().__init__(A, b)
+
+        self.pool = BlockPool(workers)
+
+    def setup(self, D, L, U):
+        super().setup(D, L, U)
+
+        A = self.A.to_numpy()
+        self.blocks = [  # views if dense, a copy of rows once if sparse
+            (start, stop, A[start:stop])
+            for start, stop in get_blocks(A.shape[0], self.pool.workers)
+        ]
+
+    def iteration(self, x):
+        x = x.to_numpy()
+        b = self.b.to_numpy()
+        x_new = np.empty(x.shape)
+
+        def update(start, stop, rows):
+            residual = b[start:stop] - rows.dot(x)
+            x_new[start:stop] = x[start:stop] + \
+                self.inv_diagonal[start:stop] * residual
+
+        self.pool.run(update, self.blocks)
+        return Matrix(x_new)
+
+
+class RedBlackSORSolver(DLUIterativeLinearSystemSolver):
+    """SOR sweeping unknowns color by color (red-black ordering if the
+    coupling graph has 2 colors): unknowns of same color are not coupled, so
+    they are updated at once, in blocks by a pool of threads. Helps only with
+    sparse matrices: when colors have (on average) less than MIN_COLOR_SIZE
+    unknowns (e.g a dense matrix has one color for each unknown), unknowns
+    are swept serially in natural order, as SORSolver does"""
+
+    def __init__(self, A, b, w=1.0, workers=None):
+        """
+        :param w: relaxation factor
+        :param workers: number of threads (None for number of cores)
+        """
+
+        super().__init__(A, b)
+
+        self.w = w
+        self.pool = BlockPool(workers)
+
+    def prepare(self):  # A is split only for serial sweeps
+        self.setup(None, None, None)
+
+    def setup(self, D, L, U):
+        A = self.A.to_numpy()
+        self.coloring = self.A.get_cached('coloring', lambda: get_coloring(A))
+
+        if len(self.coloring) * MIN_COLOR_SIZE > A.shape[0]:  # serial sweep
+            D, L, U = self.A.dlu_decompose()
+            self.colors = None
+            self.lower = (D + L * self.w).to_numpy()
+            self.T = U * (-self.w) + D * (1 - self.w)
+            return
+
+        scaled_inv_diagonal = self.w / self.A.get_diagonal_values().reshape(-1, 1)
+        self.colors = []
+        for indices in self.coloring:
+            blocks = []
+            for start, stop in get_blocks(len(indices), self.pool.workers):
+                rows = indices[start:stop]
+                blocks.append((rows, A[rows], scaled_inv_diagonal[rows]))
+
+            self.colors.append(blocks)
+
+    def is_parallel(self):
+        """Checks if colors are swept in parallel (else unknowns are swept
+        serially, see class docs)
+
+        :return: True iff colors are swept by pool of threads
+        """
+
+        return self.colors is not None
+
+    def get_colors(self):
+        """Gets unknowns of each color
+
+        :return: list of row indices, one for each color
+        """
+
+        return self.coloring
+
+    def iteration(self, x):
+        if not self.is_parallel():
+            rhs = (self.T * x + self.b * self.w).to_numpy()
+            return Matrix(solve_triangular(self.lower, rhs, lower=True))
+
+        x = x.to_numpy().astype(float)  # copy, updated color by color
+        b = self.b.to_numpy()
+
+        def update(rows, A_rows, scaled_inv_diagonal):
+            x[rows] += scaled_inv_diagonal * (b[rows] - A_rows.dot(x))
+
+        for blocks in self.colors:
+            self.pool.run(update, blocks)
+
+        return Matrix(x)
+
+
+class RedBlackGaussSiedelSolver(RedBlackSORSolver):
+    def __init__(self, A, b, workers=None):
+        super().__init__(A, b, 1.0, workers)
 
 
 class GradientMethodSolver(PureIterativeLinearSystemSolver):
+    """Steepest descent on 1/2 x^T * A * x - b^T * x with fixed step: works
+    only if A is symmetric definite positive and step < 2 / ||A||_2"""
+
     def __init__(self, A, b, step_size):
         super().__init__(A, b)
 
         self.step_size = step_size
 
     def iteration(self, x):
-        return x - (self.A * x + self.b) * self.step_size
+        return x + (self.b - self.A * x) * self.step_size
+
+
+class KrylovLinearSystemSolver(IterativeLinearSystemSolver):
+    """Minimizes residual over growing Krylov subspaces: A is accessed only
+    through matrix-vector products. Tolerances apply to residual b - A * x"""
+
+    def get_residuals(self):
+        """Gets residual history
+
+        :return: norm of residual b - A * x, before each iteration and after
+            last (with solve_many, norms of all columns at each iteration)
+        """
+
+        return self.report.residuals if self.report is not None else []
+
+    def solve(self, x, abs_toll, rel_toll, max_iterations=None, callback=None,
+              record_residuals=True):
+        super().solve(x, abs_toll, rel_toll)
+
+        def vector_callback(iteration, X, norms):  # x as vector, scalar residual
+            return callback(iteration, LinearSystemMatrix(X), norms[0])
 
+        monitor = SolveMonitor(
+            max_iterations, vector_callback if callback is not None else None,
+            record_residuals
+        )
+        x, it_counters, converged = self.iterate(
+            self.b.to_numpy(), self.x.to_numpy().astype(float), monitor
+        )
+
+        self.x = LinearSystemMatrix(x)
+        self.report = monitor.get_report(int(it_counters[0]), bool(converged[0]))
+        self.report.residuals = [norms[0] for norms in self.report.residuals]
+        return self.report
+
+    def solve_many(self, B, X, abs_toll, rel_toll, max_iterations=None,
+                   callback=None, record_residuals=True):
+        B, X = super().solve_many(B, X, abs_toll, rel_toll)
+
+        monitor = SolveMonitor(max_iterations, callback, record_residuals)
+        X, it_counters, converged = self.iterate(B, X, monitor)
+
+        self.x = Matrix(X)
+        self.report = monitor.get_report(it_counters, converged)
+        return self.report
+
+    @abc.abstractmethod
+    def iterate(self, B, X, monitor):
+        """Runs method on each column of B independently (but all together)
+
+        :param B: n x k block of right-hand sides
+        :param X: n x k block of initial guesses (overwritten)
+        :param monitor: SolveMonitor to record residuals (k at each
+            iteration) and timings
+        :return: solutions, iterations and convergence of each column
+        """
+
+        return X, np.zeros(B.shape[1], dtype=int), np.zeros(B.shape[1], dtype=bool)
+
+    def get_tolls(self, B):
+        return np.linalg.norm(B, axis=0) * self.rel_toll + self.abs_toll
+
+
+class ConjugateGradientMethodSolver(KrylovLinearSystemSolver):
+    """Works only if A is symmetric definite positive"""
+
+    def precondition(self, r):
+        return r
+
+    def iterate(self, B, X, monitor):
+        A = self.get_operator()
+        tolls = self.get_tolls(B)
+
+        R = B - A.matmat(X)
+        Z = self.precondition(R)
+        P = np.array(Z)  # copy, Z may be R itself
+        rz = np.sum(R * Z, axis=0)
+
+        norms = np.linalg.norm(R, axis=0)
+        monitor.start(norms.copy())
+        it_counters = np.zeros(B.shape[1], dtype=int)
+        active = np.flatnonzero(norms > tolls)  # 0 residual: exact
+        loop_counter = 0
+
+        while active.size > 0 and not monitor.is_over(loop_counter):
+            monitor.start_iteration()
+            P_active = P[:, active]
+            AP = A.matmat(P_active)
+            pAp = np.sum(P_active * AP, axis=0)
+
+            breakdown = pAp == 0  # exact solution (or A not definite)
+            if np.any(breakdown):
+                monitor.end_iteration()  # time of breakdown check counts too
+                active = active[~breakdown]
+                continue
+
+            alpha = rz[active] / pAp
+
+            X[:, active] += alpha * P_active
+            R_active = R[:, active] - alpha * AP
+            R[:, active] = R_active
+
+            Z_active = self.precondition(R_active)
+            rz_new = np.sum(R_active * Z_active, axis=0)
+            P[:, active] = Z_active + (rz_new / rz[active]) * P_active
+            rz[active] = rz_new
+
+            norms[active] = np.linalg.norm(R_active, axis=0)
+            monitor.end_iteration()
+
+            loop_counter += 1
+            it_counters[active] += 1
+            active = active[norms[active] > tolls[active]]
+
+            if monitor.record(loop_counter, X, norms.copy()):
+                break
+
+        return X, it_counters, norms <= tolls
+
+
+class PreconditionedConjugateGradientMethodSolver(ConjugateGradientMethodSolver):
+    def __init__(self, A, b, preconditioner):
+        """
+        :param preconditioner: Preconditioner instance, or Preconditioner
+            class to build on A (e.g JacobiPreconditioner)
+        """
+
+        super().__init__(A, b)
+
+        if not isinstance(preconditioner, Preconditioner):
+            preconditioner = preconditioner(self.A)
+
+        self.preconditioner = preconditioner
+
+    def precondition(self, r):
+        return self.preconditioner.apply(r)
+
+
+class GMRESSolver(KrylovLinearSystemSolver):
+    """Restarted GMRES(m): works for any non-singular A. Within a cycle the
+    residual norm is the least-squares one, x is updated at restarts"""
+
+    def __init__(self, A, b, restart=GMRES_RESTART):
+        """
+        :param restart: Arnoldi steps before restarting (memory is
+            O(n * restart) for each system)
+        """
+
+        super().__init__(A, b)
 
-class ConjugateGradientMethodSolver(PureIterativeLinearSystemSolver):
-    pass  # todo
+        self.restart = restart
+
+    def iterate(self, B, X, monitor):
+        A = self.get_operator()
+        tolls = self.get_tolls(B)
+
+        R = B - A.matmat(X)
+        norms = np.linalg.norm(R, axis=0)
+        monitor.start(norms.copy())
+        it_counters = np.zeros(B.shape[1], dtype=int)
+        active = np.flatnonzero(norms > tolls)  # 0 residual: exact
+        loop_counter = 0
+        stop = False
+
+        while active.size > 0 and not stop and not monitor.is_over(loop_counter):
+            V, H, g, steps, loop_counter, stop = self.arnoldi(
+                A, R[:, active], norms, active, tolls, it_counters,
+                loop_counter, X, monitor
+            )
+
+            for column, (index, n_steps) in enumerate(zip(active, steps)):
+                if n_steps > 0:  # minimize ||g - H * y|| (H triangular)
+                    y = solve_triangular(
+                        H[:n_steps, :n_steps, column], g[:n_steps, column],
+                        lower=False
+                    )
+                    X[:, index] += V[:n_steps, :, column].T.dot(y)
+
+            R[:, active] = B[:, active] - A.matmat(X[:, active])
+            norms[active] = np.linalg.norm(R[:, active], axis=0)
+            active = active[norms[active] > tolls[active]]
+
+        return X, it_counters, norms <= tolls
+
+    def arnoldi(self, A, R, norms, active, tolls, it_counters, loop_counter,
+                X, monitor):
+        """Runs a restart cycle: builds orthonormal basis V of Krylov subspace
+        and Hessenberg H = V^T * A * V, reduced to triangular by Givens
+        rotations (applied to g = ||r|| * e_1 too)
+
+        :param A: LinearOperator
+        :param R: n x k residuals of active columns
+        :param norms: residual norms of all columns (updated)
+        :param active: indices of active columns
+        :param tolls: tolerance of all columns
+        :param it_counters: iterations of all columns (updated)
+        :param loop_counter: iterations done so far
+        :param X: current solutions (for callback)
+        :param monitor: SolveMonitor
+        :return: V, H, g, steps done by each column, iterations done so
+            far and True iff callback asked to stop
+        """
+
+        n, k = R.shape
+        m = self.restart
+        V = np.zeros((m + 1, n, k))
+        H = np.zeros((m + 1, m, k))
+        g = np.zeros((m + 1, k))
+        cs = np.zeros((m, k))
+        sn = np.zeros((m, k))
+        steps = np.zeros(k, dtype=int)
+
+        g[0] = norms[active]
+        V[0] = R / g[0]
+        working = np.arange(k)  # columns still iterating in this cycle
+
+        for j in range(m):
+            if working.size == 0 or monitor.is_over(loop_counter):
+                break
+
+            monitor.start_iteration()
+            W = A.matmat(V[j][:, working])
+            for i in range(j + 1):  # modified Gram-Schmidt
+                h = np.sum(W * V[i][:, working], axis=0)
+                W -= h * V[i][:, working]
+                H[i, j, working] = h
+
+            h_next = np.linalg.norm(W, axis=0)
+            lucky = h_next == 0  # solution is in subspace
+            H[j + 1, j, working] = h_next
+            V[j + 1][:, working] = W / np.where(lucky, 1, h_next)
+
+            for i in range(j):  # previous rotations
+                c, s = cs[i, working], sn[i, working]
+                h_i, h_i_next = H[i, j, working], H[i + 1, j, working]
+                H[i, j, working] = c * h_i + s * h_i_next
+                H[i + 1, j, working] = c * h_i_next - s * h_i
+
+            h_j, h_j_next = H[j, j, working], H[j + 1, j, working]
+            denominator = np.hypot(h_j, h_j_next)
+            denominator[denominator == 0] = 1
+            cs[j, working] = h_j / denominator
+            sn[j, working] = h_j_next / denominator
+            H[j, j, working] = cs[j, working] * h_j + sn[j, working] * h_j_next
+            H[j + 1, j, working] = 0
+            g[j + 1, working] = -sn[j, working] * g[j, working]
+            g[j, working] = cs[j, working] * g[j, working]
+
+            columns = active[working]
+            norms[columns] = np.abs(g[j + 1, working])
+            monitor.end_iteration()
+
+            loop_counter += 1
+            steps[working] += 1
+            it_counters[columns] += 1
+            working = working[(norms[columns] > tolls[columns]) & ~lucky]
+
+            if monitor.record(loop_counter, X, norms.copy()):
+                return V, H, g, steps, loop_counter, True
+
+        return V, H, g, steps, loop_counter, False
+
+
+class BiCGSTABSolver(KrylovLinearSystemSolver):
+    """Bi-conjugate gradient stabilized: works for any non-singular A, with
+    2 matvecs and short recurrences for each iteration"""
+
+    def iterate(self, B, X, monitor):
+        A = self.get_operator()
+        tolls = self.get_tolls(B)
+        k = B.shape[1]
+
+        R = B - A.matmat(X)
+        R_hat = R.copy()  # shadow residual
+        P = np.zeros(R.shape)
+        V = np.zeros(R.shape)
+        rho = np.ones(k)
+        alpha = np.ones(k)
+        omega = np.ones(k)
+
+        norms = np.linalg.norm(R, axis=0)
+        monitor.start(norms.copy())
+        it_counters = np.zeros(k, dtype=int)
+        active = np.flatnonzero(norms > tolls)  # 0 residual: exact
+        loop_counter = 0
+
+        while active.size > 0 and not monitor.is_over(loop_counter):
+            monitor.start_iteration()
+            R_active = R[:, active]
+            rho_new = np.sum(R_hat[:, active] * R_active, axis=0)
+
+            breakdown = (rho_new == 0) | (omega[active] == 0)
+            if np.any(breakdown):
+                monitor.end_iteration()  # time of breakdown check counts too
+                active = active[~breakdown]
+                continue
+
+            beta = (rho_new / rho[active]) * (alpha[active] / omega[active])
+            P_active = R_active + beta * (P[:, active] - omega[active] * V[:, active])
+            V_active = A.matmat(P_active)
+            alpha[active] = rho_new / np.sum(R_hat[:, active] * V_active, axis=0)
+
+            S = R_active - alpha[active] * V_active
+            T = A.matmat(S)
+            tt = np.sum(T * T, axis=0)
+            omega[active] = np.sum(T * S, axis=0) / np.where(tt == 0, 1, tt)
+
+            X[:, active] += alpha[active] * P_active + omega[active] * S
+            R_active = S - omega[active] * T
+            R[:, active] = R_active
+            P[:, active] = P_active
+            V[:, active] = V_active
+            rho[active] = rho_new
+
+            norms[active] = np.linalg.norm(R_active, axis=0)
+            monitor.end_iteration()
+
+            loop_counter += 1
+            it_counters[active] += 1
+            active = active[norms[active] > tolls[active]]
+
+            if monitor.record(loop_counter, X, norms.copy()):
+                break
+
+        return X, it_counters, norms <= tolls
@@ -2,19 +2,199 @@
 # coding: utf-8
 
 import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
 from hal.lists.utils import lst2str
+from hal.maths.la.factorizations import factorize
+from hal.maths.la.spectral import DEFAULT_TOLL, get_spectral_radius, \
+    get_l2_norm, get_condition_number
+
+TILE_BYTES = 64 * 2 ** 20  # working set of products of out-of-core matrices
+
+
+def is_sparse(matrix):
+    return scipy.sparse.issparse(matrix)
+
+
+def is_memmap(matrix):
+    return isinstance(matrix, np.memmap)
+
+
+def load_memmap(path, shape=None, dtype=np.float64, mode='r'):
+    """Maps matrix on disk, without reading it
+
+    :param path: .npy file, or raw file (then shape is needed)
+    :param shape: (rows, columns) of raw file
+    :param dtype: type of elements of raw file
+    :param mode: 'r' (read-only), 'r+' (read-write) or 'c' (copy-on-write)
+    :return: np.memmap, to build Matrix (or LinearSystemMatrix) with
+    """
+
+    if str(path).endswith('.npy'):
+        return np.load(path, mmap_mode=mode)
+
+    return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+
+def get_row_tiles(matrix, tile_bytes=None):
+    """Splits rows in tiles, read one at a time from disk
+
+    :param matrix: 2D np.ndarray (or np.memmap)
+    :param tile_bytes: max size of a tile (None for TILE_BYTES)
+    :return: generator of (start, stop) of rows
+    """
+
+    tile_bytes = tile_bytes if tile_bytes is not None else TILE_BYTES
+    n_rows, n_cols = matrix.shape
+    tile_rows = max(1, tile_bytes // max(1, n_cols * matrix.itemsize))
+    for start in range(0, n_rows, tile_rows):
+        yield start, min(start + tile_rows, n_rows)
+
+
+def get_square_tiles(size, itemsize, tile_bytes=None):
+    """Splits rows (and columns) of square matrix in tiles, so that 2
+    square tiles fit in tile_bytes
+
+    :param size: number of rows (and columns)
+    :param itemsize: bytes of an element
+    :param tile_bytes: max size of 2 tiles (None for TILE_BYTES)
+    :return: list of (start, stop) of rows (and columns)
+    """
+
+    tile_bytes = tile_bytes if tile_bytes is not None else TILE_BYTES
+    side = max(1, int(np.sqrt(tile_bytes // (2 * itemsize))))
+    return [
+        (start, min(start + side, size))
+        for start in range(0, size, side)
+    ]
+
+
+def tiled_is_symmetric(matrix):
+    """Checks symmetry streaming over square tiles: tile (i, j) is compared
+    with tile (j, i) for j >= i only, so each element is read once
+
+    :param matrix: 2D np.ndarray (or np.memmap)
+    :return: True iff matrix is symmetric
+    """
+
+    n_rows, n_cols = matrix.shape
+    if n_rows != n_cols:
+        return False
+
+    tiles = get_square_tiles(n_rows, matrix.itemsize)
+    for i, (row_start, row_stop) in enumerate(tiles):
+        for col_start, col_stop in tiles[i:]:
+            tile = matrix[row_start:row_stop, col_start:col_stop]
+            mirror = tile if col_start == row_start else \
+                matrix[col_start:col_stop, row_start:row_stop]
+            if not np.array_equal(tile, np.transpose(mirror)):
+                return False
+
+    return True
+
+
+def tiled_dot(matrix, x):
+    """Computes matrix * x streaming over tiles of rows
+
+    :param matrix: 2D np.ndarray (or np.memmap)
+    :param x: vector or block of vectors
+    :return: matrix * x
+    """
+
+    x = np.asarray(x)
+    y = np.empty((matrix.shape[0], ) + x.shape[1:], dtype=np.result_type(matrix, x))
+    for start, stop in get_row_tiles(matrix):
+        y[start:stop] = matrix[start:stop] @ x
+
+    return y
+
+
+def tiled_rdot(matrix, x):
+    """Computes matrix^T * x streaming over tiles of rows
+
+    :param matrix: 2D np.ndarray (or np.memmap)
+    :param x: vector or block of vectors
+    :return: matrix^T * x
+    """
+
+    x = np.asarray(x)
+    y = np.zeros((matrix.shape[1], ) + x.shape[1:], dtype=np.result_type(matrix, x))
+    for start, stop in get_row_tiles(matrix):
+        y += matrix[start:stop].T @ x[start:stop]
+
+    return y
+
+
+def as_matvec(matrix):
+    """Gets matrix to use in matvec-only algorithms: out-of-core ones are
+    wrapped to stream over tiles
+
+    :param matrix: np.ndarray, np.memmap or scipy.sparse matrix
+    :return: matrix, or LinearOperator if matrix is np.memmap
+    """
+
+    if not is_memmap(matrix):
+        return matrix
+
+    return scipy.sparse.linalg.LinearOperator(
+        matrix.shape,
+        matvec=lambda x: tiled_dot(matrix, x),
+        matmat=lambda X: tiled_dot(matrix, X),
+        rmatvec=lambda x: tiled_rdot(matrix, x),
+        dtype=matrix.dtype
+    )
+
+
+def to_array(matrix):
+    """Converts input to a 2D array without copying when possible
+
+    :param matrix: matrix-like (list, np.ndarray, np.matrix, scipy.sparse,
+        BaseMatrix)
+    :return: 2D np.ndarray (vectors become row vectors, like np.matrix),
+        scipy.sparse matrix if input is sparse, or np.memmap if input is
+    """
+
+    if isinstance(matrix, BaseMatrix):
+        return matrix.m
+
+    if is_memmap(matrix) and matrix.ndim == 2:  # stays on disk
+        return matrix
+
+    if is_sparse(matrix):
+        return matrix if matrix.format in ('csr', 'csc') else matrix.tocsr()
+
+    return np.atleast_2d(np.asarray(matrix))
+
+
+def solve_triangular(T, b, lower):
+    """Solves T * x = b by forward (or backward) substitution
+
+    :param T: triangular matrix (np.ndarray or scipy.sparse)
+    :param b: right-hand side (np.ndarray)
+    :param lower: True iff T is lower triangular
+    :return: x
+    """
+
+    if is_sparse(T):
+        return scipy.sparse.linalg.spsolve_triangular(
+            T.tocsr(), b, lower=lower
+        )
+
+    return scipy.linalg.solve_triangular(T, b, lower=lower, check_finite=False)
 
 
 class BaseMatrix:
     def __init__(self, matrix):
-        self.m = np.matrix(matrix)
+        self.m = to_array(matrix)
+        self.version = 0  # bumped on every in-place change
 
     def __add__(self, other):
         if isinstance(other, BaseMatrix):
             other = other.m
 
-        return Matrix(np.add(self.m, other))
+        return Matrix(self.m + other)
 
     def __radd__(self, other):
         return other.__add__(self)
@@ -23,7 +203,7 @@ class BaseMatrix:
         if isinstance(other, BaseMatrix):
             other = other.m
 
-        return Matrix(np.subtract(self.m, other))
+        return Matrix(self.m - other)
 
     def __rsub__(self, other):
         return other.__sub__(self)
@@ -32,14 +212,37 @@ class BaseMatrix:
         if isinstance(other, BaseMatrix):
             other = other.m
 
-        return Matrix(np.dot(self.m, other))
+        if np.isscalar(other):
+            return Matrix(self.m * other)
+
+        if self.is_memmap():
+            return Matrix(tiled_dot(self.m, to_array(other)))
+
+        return Matrix(self.m @ other)
 
     def __rmul__(self, other):
         return other.__mul__(self)
 
     def to_numpy(self):
+        """Gets underlying data
+
+        :return: np.ndarray, or scipy.sparse matrix if sparse
+        """
+
         return self.m
 
+    def is_sparse(self):
+        return is_sparse(self.m)
+
+    def is_memmap(self):
+        return is_memmap(self.m)
+
+    def to_dense(self):
+        if self.is_sparse():
+            return Matrix(self.m.toarray())
+
+        return self
+
 
 class Matrix(BaseMatrix):
     def __init__(self, matrix):
@@ -55,50 +258,74 @@ class Matrix(BaseMatrix):
         return self.shape()[1]
 
     def get_rows(self):
-        return [
-            [row.tolist()[0] for row in self.m]
-        ][0]
+        return self.to_dense().m.tolist()
 
     def get_cols(self):
-        return [
-            [col.tolist()[0] for col in self.m.T]
-        ][0]
+        return self.to_dense().m.T.tolist()
 
     def get_at(self, row, col):
         return self.m[row, col]
 
+    def set_at(self, row, col, value):
+        self.m[row, col] = value
+        self.mark_modified()
+
+    def mark_modified(self):
+        """To be called after changing data (e.g via to_numpy()) in place, so
+        that cached results are invalidated"""
+
+        self.version += 1
+
     def is_square(self):
         rows, cols = self.shape()
         return rows == cols
 
     def transpose(self):
-        return Matrix(self.m.T)
+        return Matrix(self.m.T)  # view
 
     def inverse(self):
-        return Matrix(np.linalg.inv(self.m))
+        return Matrix(np.linalg.inv(self.to_dense().m))
 
     def is_symmetric(self):
+        if self.is_memmap():
+            return tiled_is_symmetric(self.m)
+
         return self == self.transpose()
 
     def is_diagonally_dominant(self, strictly=False):
-        for i, row in enumerate(self.m):
-            diagonal_element = row[0, i]
-            sum_of_others = np.sum(row) - diagonal_element
+        diagonal = np.abs(self.get_diagonal_values())
+        row_sums = self.get_abs_row_sums()
+        sum_of_others = row_sums - diagonal
 
-            if abs(diagonal_element) < sum_of_others:
-                return False
+        if strictly:
+            return bool(np.all(diagonal > sum_of_others))
 
-            if abs(diagonal_element) <= sum_of_others and strictly:
-                return False
-        return True
+        return bool(np.all(diagonal >= sum_of_others))
 
     def check_on(self, f):
-        for row in range(self.get_n_rows()):
-            for col in range(self.get_n_cols()):
-                element = self.get_at(row, col)
-                if not f(element):
-                    return False
-        return True
+        """Checks that all elements satisfy predicate
+
+        :param f: predicate; vectorized ones (e.g ufuncs, comparisons) are
+            applied to the whole matrix at once
+        :return: True iff f(x) for every x in matrix
+        """
+
+        values = self.m
+        if self.is_sparse():
+            values = self.m.data  # stored elements only ...
+            n_elements = self.get_n_rows() * self.get_n_cols()
+            if self.m.nnz < n_elements and not f(0):  # ... and implicit zeros
+                return False
+
+        try:
+            checks = f(values)
+        except (TypeError, ValueError):
+            checks = None
+
+        if np.shape(checks) != np.shape(values):  # predicate is scalar-only
+            checks = np.vectorize(f, otypes=[bool])(values)
+
+        return bool(np.all(checks))
 
     def is_definite_positive(self):
         def is_positive(x):
@@ -107,65 +334,114 @@ class Matrix(BaseMatrix):
         return self.check_on(is_positive)
 
     def eigens(self):
-        values, vectors = np.linalg.eig(self.m)
+        values, vectors = np.linalg.eig(self.to_dense().m)
         return values.tolist(), vectors.tolist()
 
-    def spectral_radius(self):
-        eigenvalues, _ = self.eigens()
-        spectral_radius = max(map(abs, eigenvalues))
-        return spectral_radius
+    def spectral_radius(self, toll=DEFAULT_TOLL, max_iterations=None):
+        """Estimates largest absolute eigenvalue (Lanczos/Arnoldi)
+
+        :param toll: relative accuracy of estimate
+        :param max_iterations: max number of restarts (None for default)
+        :return: spectral radius
+        """
+
+        return get_spectral_radius(
+            as_matvec(self.m), toll, max_iterations,
+            self.is_square() and self.is_symmetric()
+        )
+
+    def get_diagonal_values(self):
+        """Gets diagonal elements
+
+        :return: read-only view of the diagonal (a copy if sparse)
+        """
+
+        if self.is_sparse():
+            return self.m.diagonal()
+
+        return np.diagonal(self.m)
 
     def get_diagonal(self):
-        D = np.zeros(self.shape())
-        for i, row in enumerate(self.m):
-            D[i, i] = row[0, i]  # diagonal element
-        return Matrix(D)
+        if self.is_sparse():
+            diagonal = self.get_diagonal_values()
+            return Matrix(scipy.sparse.diags(diagonal, format='csr', dtype=diagonal.dtype))
+
+        return Matrix(np.diag(self.get_diagonal_values()))
 
     def get_lower(self):
-        L = np.zeros(self.shape())
-        for i, row in enumerate(self.m):
-            for j in range(i):  # without the diagonal
-                L[i, j] = row[0, j]
-        return Matrix(L)
+        if self.is_sparse():
+            return Matrix(scipy.sparse.tril(self.m, -1, format='csr'))
+
+        return Matrix(np.tril(self.m, -1))  # without the diagonal
 
     def get_upper(self):
-        U = np.zeros(self.shape())
-        for i, row in enumerate(self.m):
-            for j in range(i + 1, self.shape()[0]):  # without the diagonal
-                U[i, j] = row[0, j]
-        return Matrix(U)
+        if self.is_sparse():
+            return Matrix(scipy.sparse.triu(self.m, 1, format='csr'))
+
+        return Matrix(np.triu(self.m, 1))  # without the diagonal
 
     def linear_norm(self):
         """ Works only if vector """
 
+        if self.is_sparse():
+            return scipy.sparse.linalg.norm(self.m)
+
+        if self.is_memmap():
+            return np.sqrt(sum(
+                np.sum(np.square(self.m[start:stop]))
+                for start, stop in get_row_tiles(self.m)
+            ))
+
         return np.linalg.norm(self.m)
 
+    def get_abs_row_sums(self):
+        if self.is_memmap():
+            return np.concatenate([
+                np.abs(self.m[start:stop]).sum(axis=1)
+                for start, stop in get_row_tiles(self.m)
+            ])
+
+        return np.asarray(abs(self.m).sum(axis=1)).ravel()
+
+    def get_abs_col_sums(self):
+        if self.is_memmap():
+            return sum(
+                np.abs(self.m[start:stop]).sum(axis=0)
+                for start, stop in get_row_tiles(self.m)
+            )
+
+        return np.asarray(abs(self.m).sum(axis=0)).ravel()
+
     def l1_norm(self):
-        abs_cols = [
-            list(map(abs, col)) for col in self.get_cols()
-        ]
-        sums = [
-            np.sum(col) for col in abs_cols
-        ]
-        return max(sums)
-
-    def l2_norm(self):
-        tmp = self * self.transpose()
-        eigenvalues, _ = tmp.eigens()
-        return np.sqrt(np.max(eigenvalues))
+        return self.get_abs_col_sums().max()  # max column sum
+
+    def l2_norm(self, toll=DEFAULT_TOLL, max_iterations=None):
+        """Estimates largest singular value (Lanczos on A^T * A)
+
+        :param toll: relative accuracy of estimate
+        :param max_iterations: max number of restarts (None for default)
+        :return: ||A||_2
+        """
+
+        return get_l2_norm(as_matvec(self.m), toll, max_iterations)
 
     def linfinite_norm(self):
-        abs_rows = [
-            list(map(abs, row)) for row in self.get_rows()
-        ]
-        sums = [
-            np.sum(row) for row in abs_rows
-        ]
-        return max(sums)
-
-    def condition_number(self):
-        inv = np.linalg.inv(self.m)
-        return self.l2_norm() * inv.l2_norm()
+        return self.get_abs_row_sums().max()  # max row sum
+
+    def get_factorization(self):
+        return factorize(self.m, self.is_symmetric())
+
+    def condition_number(self, toll=DEFAULT_TOLL, max_iterations=None):
+        """Estimates condition number in 2-norm, without inverting
+
+        :param toll: relative accuracy of estimate
+        :param max_iterations: max number of restarts (None for default)
+        :return: ||A||_2 * ||A^-1||_2
+        """
+
+        return get_condition_number(
+            self.m, self.get_factorization(), toll, max_iterations
+        )
 
     def eigenvalues_hadamard(self, other):
         """Computes the Hadamard product of 2 matrices. See
@@ -176,26 +452,31 @@ class Matrix(BaseMatrix):
         """
 
         if isinstance(other, Matrix):
-            other = other.to_numpy()
+            other = other.to_dense().to_numpy()
 
-        eig_a = np.linalg.eigvalsh(self.to_numpy())  # eigenvalues (optimized for Hermitian matrices)
+        eig_a = np.linalg.eigvalsh(self.to_dense().to_numpy())  # eigenvalues (optimized for Hermitian matrices)
         eig_b = np.linalg.eigvalsh(other)
 
         return eig_a, eig_b
 
     def __eq__(self, other):
-        if isinstance(other, list):
+        if not isinstance(other, BaseMatrix):
             other = Matrix(other)
 
         if self.shape() != other.shape():
             return False
 
-        for row in range(self.get_n_rows()):
-            for col in range(self.get_n_cols()):
-                if self.get_at(row, col) != other.get_at(row, col):
-                    return False
+        if self.is_sparse() and other.is_sparse():
+            return (self.m != other.m).nnz == 0
+
+        if self.is_memmap() or other.is_memmap():
+            other = other.to_dense().m
+            return all(
+                np.array_equal(self.m[start:stop], other[start:stop])
+                for start, stop in get_row_tiles(self.m)
+            )
 
-        return True
+        return np.array_equal(self.to_dense().m, other.to_dense().m)
 
     def __str__(self):
         out = ''
@@ -206,14 +487,165 @@ class Matrix(BaseMatrix):
 
 
 class LinearSystemMatrix(Matrix):
+    def __init__(self, matrix):
+        super().__init__(matrix)
+
+        self._cache = {}  # key -> (version, value)
+
+    def get_cached(self, key, compute):
+        """Gets value computed once and cached until the matrix is modified
+
+        :param key: name of value
+        :param compute: function to compute value
+        :return: value
+        """
+
+        if key not in self._cache or self._cache[key][0] != self.version:
+            self._cache[key] = (self.version, compute())
+
+        return self._cache[key][1]
+
+    def get_factorization(self):
+        """Gets Cholesky (if symmetric definite positive) or LU factorization.
+        It is computed once and cached until the matrix is modified
+
+        :return: Factorization
+        """
+
+        return self.get_cached(
+            'factorization', lambda: factorize(self.m, self.is_symmetric())
+        )
+
+    def determinant(self):
+        return self.get_factorization().determinant()
+
+    def condition_number_estimate(self):
+        """Estimates condition number in 1-norm without inverting: needs a
+        few solves with the cached factorization
+
+        :return: ||A||_1 * ||A^-1||_1 (estimate)
+        """
+
+        factorization = self.get_factorization()
+        inverse = scipy.sparse.linalg.LinearOperator(
+            self.shape(),
+            matvec=factorization.solve,
+            rmatvec=lambda x: factorization.solve(x, transposed=True),
+            dtype=float
+        )
+        return self.l1_norm() * scipy.sparse.linalg.onenormest(inverse)
+
     def incomplete_Cholesky(self):
-        pass  # todo
+        """Computes IC(0) factorization: L * L^T ~ A, where L keeps the
+        sparsity pattern of the lower part of A (no fill-in)
+
+        :return: lower triangular factor
+        """
+
+        if self.is_sparse():
+            return self._sparse_incomplete_Cholesky()
+
+        L = np.tril(self.m).astype(float)
+        pattern = L != 0
+
+        for k in range(self.get_n_rows()):
+            if L[k, k] <= 0:
+                raise ValueError('Matrix is not positive definite enough for IC(0)')
+
+            L[k, k] = np.sqrt(L[k, k])
+            L[k + 1:, k] /= L[k, k]
+
+            column = L[k + 1:, k]
+            update = np.tril(np.outer(column, column))
+            L[k + 1:, k + 1:] -= update * pattern[k + 1:, k + 1:]
+
+        return Matrix(L)
+
+    def _sparse_incomplete_Cholesky(self):
+        """Row-by-row IC(0), touches only stored elements
+
+        :return: lower triangular factor (CSR)
+        """
+
+        lower = scipy.sparse.tril(self.m, format='csr')
+        lower.sort_indices()
+        rows = []  # i-th is {column: L[i, column]}
+
+        for i in range(self.get_n_rows()):
+            start, end = lower.indptr[i], lower.indptr[i + 1]
+            row = {}
+            diagonal = 0.0
+
+            for j, value in zip(lower.indices[start:end], lower.data[start:end]):
+                if j == i:
+                    diagonal = value
+                    continue
+
+                other = rows[j]
+                value -= sum(x * other[k] for k, x in row.items() if k in other)
+                row[j] = value / other[j]
+
+            diagonal -= sum(x * x for x in row.values())
+            if diagonal <= 0:
+                raise ValueError('Matrix is not positive definite enough for IC(0)')
+
+            row[i] = np.sqrt(diagonal)
+            rows.append(row)
+
+        indptr = np.cumsum([0] + [len(row) for row in rows])
+        indices = [column for row in rows for column in row]
+        data = [x for row in rows for x in row.values()]
+        shape = self.shape()
+        return Matrix(scipy.sparse.csr_matrix((data, indices, indptr), shape=shape))
+
+    def get_jacobi_spectral_radius(self, toll=DEFAULT_TOLL, max_iterations=None):
+        """Estimates spectral radius of Jacobi iteration matrix
+        I - D^-1 * A, which is never built
+
+        :param toll: relative accuracy of estimate
+        :param max_iterations: max number of restarts (None for default)
+        :return: spectral radius
+        """
+
+        diagonal = self.get_diagonal_values()
+        iteration = scipy.sparse.linalg.LinearOperator(
+            self.shape(),
+            matvec=lambda x: x - (self.m @ x) / diagonal,
+            dtype=float
+        )
+        return get_spectral_radius(iteration, toll, max_iterations)
+
+    def get_gauss_seidel_spectral_radius(self, toll=DEFAULT_TOLL,
+                                         max_iterations=None):
+        """Estimates spectral radius of Gauss-Seidel iteration matrix
+        -(D + L)^-1 * U, which is never built
+
+        :param toll: relative accuracy of estimate
+        :param max_iterations: max number of restarts (None for default)
+        :return: spectral radius
+        """
+
+        D, L, U = self.dlu_decompose()
+        lower = (D + L).to_numpy()
+        upper = U.to_numpy()
+        iteration = scipy.sparse.linalg.LinearOperator(
+            self.shape(),
+            matvec=lambda x: -solve_triangular(lower, upper @ x, lower=True),
+            dtype=float
+        )
+        return get_spectral_radius(iteration, toll, max_iterations)
 
     def does_jacobi_converge(self):
-        return self.is_diagonally_dominant(strictly=True)
+        if self.is_diagonally_dominant(strictly=True):  # cheap check first
+            return True
+
+        return bool(self.get_jacobi_spectral_radius() < 1)
 
     def does_gauss_seidel_converge(self):
-        return self.is_diagonally_dominant(strictly=True) or self.is_definite_positive()
+        if self.is_diagonally_dominant(strictly=True) or self.is_definite_positive():
+            return True
+
+        return bool(self.get_gauss_seidel_spectral_radius() < 1)
 
     def dlu_decompose(self):
         return self.get_diagonal(), self.get_lower(), self.get_upper()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import time
+
+import numpy as np
+
+
+class SolveReport:
+    """Summary of a solve"""
+
+    def __init__(self, iterations, converged, residuals, times):
+        """
+        :param iterations: number of iterations (one for each column, if many
+            systems were solved at once)
+        :param converged: True iff tolerance was met (one for each column)
+        :param residuals: norm of b - A * x, before first iteration and after
+            each one (empty if not recorded)
+        :param times: seconds spent in each iteration
+        """
+
+        self.iterations = iterations
+        self.converged = converged
+        self.residuals = residuals
+        self.times = times
+
+    def get_total_time(self):
+        return sum(self.times)
+
+    def __str__(self):
+        return 'iterations: {}, converged: {}, residual: {}, time (s): {:.6f}'.format(
+            self.iterations, self.converged,
+            self.residuals[-1] if self.residuals else None,
+            self.get_total_time()
+        )
+
+
+class SolveMonitor:
+    """Records residuals and timings of iterations, stops runaway solves"""
+
+    def __init__(self, max_iterations=None, callback=None,
+                 record_residuals=True):
+        """
+        :param max_iterations: stop after this many iterations (None for no
+            limit)
+        :param callback: called as callback(iteration, x, residual) after
+            each iteration; solve stops if it returns True
+        :param record_residuals: keep history of residuals
+        """
+
+        self.max_iterations = max_iterations
+        self.callback = callback
+        self.record_residuals = record_residuals
+
+        self.residuals = []
+        self.times = []
+        self._iteration_start = None
+
+    def needs_residuals(self):
+        """Checks if residuals are used, so solvers that get them with an
+        extra product by A can skip it otherwise
+
+        :return: True iff residuals are recorded or passed to callback
+        """
+
+        return self.record_residuals or self.callback is not None
+
+    def start(self, residual):
+        self.residuals = [residual] if self.record_residuals else []
+        self.times = []
+
+    def is_over(self, iterations):
+        return self.max_iterations is not None and iterations >= self.max_iterations
+
+    def start_iteration(self):
+        self._iteration_start = time.perf_counter()
+
+    def end_iteration(self):
+        self.times.append(time.perf_counter() - self._iteration_start)
+
+    def record(self, iteration, x, residual):
+        """Records residual after iteration
+
+        :param iteration: number of iterations done
+        :param x: current solution
+        :param residual: norm of current residual
+        :return: True iff callback asks to stop
+        """
+
+        if self.record_residuals:
+            self.residuals.append(residual)
+
+        if self.callback is None:
+            return False
+
+        return bool(self.callback(iteration, x, residual))
+
+    def get_report(self, iterations, converged):
+        return SolveReport(iterations, converged, self.residuals, self.times)
+
+
+def get_residual_norms(A, X, B):
+    """Gets norm of residual of each column
+
+    :param A: matrix (np.ndarray or scipy.sparse)
+    :param X: n x k solutions
+    :param B: n x k right-hand sides
+    :return: k norms
+    """
+
+    return np.linalg.norm(B - A @ X, axis=0)
@@ -1,18 +1,23 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import itertools
 from collections import namedtuple
 
+import numpy as np
+
 from hal.lists.utils import lst2str
 from hal.maths.combo.utils import get_superset
 
 MachineNumber = namedtuple('MachineNumber', ['sign', 'mantissa', 'exponent'])
+MachineLimits = namedtuple('MachineLimits', ['min_positive', 'max', 'epsilon'])
+SIGNS = ['+', '-']
 
 
 # Returns a list of strings. Each one of them is a mantissa.
 def get_all_possible_mantissa(b, l):
     digits = range(b)  # all possible digits with such base
-    mantissas = get_superset(digits, l - 1)  # first l - 1 digits
+    mantissas = list(get_superset(digits, l - 1))  # first l - 1 digits
 
     full_mantissas = []
     for digit in digits:
@@ -41,15 +46,111 @@ def get_all_possible_exponents(b, k):
     return positives + list(negatives)
 
 
+def iter_mantissas(b, l):
+    """Lazily enumerates mantissas, in same order as
+    get_all_possible_mantissa
+
+    :param b: base
+    :param l: number of digits
+    :return: generator of strings
+    """
+
+    for first_digit in range(1, b):  # normalized: first digit is positive
+        for digits in itertools.product(range(b), repeat=l - 1):
+            yield lst2str((first_digit, ) + digits)
+
+    yield '0' * l
+
+
+def iter_exponents(b, k):
+    """Lazily enumerates exponents, in same order as
+    get_all_possible_exponents
+
+    :param b: base
+    :param k: number of digits
+    :return: generator of strings
+    """
+
+    for sign in ['', '-']:
+        for digits in itertools.product(range(b), repeat=k):
+            yield sign + lst2str(digits)
+
+
+def iter_machine_numbers(b, l, k):
+    """Lazily enumerates machine numbers: memory is O(l + k)
+
+    :param b: base
+    :param l: digits of mantissa
+    :param k: digits of exponent
+    :return: generator of MachineNumber
+    """
+
+    for mantissa in iter_mantissas(b, l):
+        for exponent in iter_exponents(b, k):
+            for sign in SIGNS:
+                yield MachineNumber(sign, mantissa, exponent)
+
+
 def get_all_machine_numbers(b, l, k):
-    all_mantissas = get_all_possible_mantissa(b, l)
-    all_exponents = get_all_possible_exponents(b, k)
-    return [
-        MachineNumber(sign, mantissa, exponent)
-        for mantissa in all_mantissas
-        for exponent in all_exponents
-        for sign in ['+', '-']
-    ]
+    return list(iter_machine_numbers(b, l, k))
+
+
+def count_machine_numbers(b, l, k, distinct=False):
+    """Counts machine numbers, without enumerating them
+
+    :param b: base
+    :param l: digits of mantissa
+    :param k: digits of exponent
+    :param distinct: count distinct values (0 is represented many times)
+    :return: number of machine numbers (as in get_all_machine_numbers)
+    """
+
+    n_nonzero_mantissas = (b - 1) * b ** (l - 1)
+    if distinct:  # normalized: 1 representation, but -0 == +0
+        return 2 * n_nonzero_mantissas * (2 * b ** k - 1) + 1
+
+    return (n_nonzero_mantissas + 1) * 2 * b ** k * len(SIGNS)
+
+
+def get_machine_limits(b, l, k):
+    """Gets limits of machine numbers, without enumerating them
+
+    :param b: base
+    :param l: digits of mantissa
+    :param k: digits of exponent
+    :return: MachineLimits: smallest positive number (0.1 * b ^ -max
+        exponent), largest one (0.(b-1)(b-1)... * b ^ max exponent) and
+        machine epsilon (distance from 1 to next number)
+    """
+
+    max_exponent = b ** k - 1
+    return MachineLimits(
+        float(b) ** (-max_exponent - 1),
+        (1 - float(b) ** -l) * float(b) ** max_exponent,
+        float(b) ** (1 - l)
+    )
+
+
+def get_machine_numbers_array(b, l, k):
+    """Gets value of all machine numbers (in same order as
+    get_all_machine_numbers): index in array is mixed-radix number
+    (mantissa, exponent, sign), so values are an outer product
+
+    :param b: base
+    :param l: digits of mantissa
+    :param k: digits of exponent
+    :return: np.ndarray of float64
+    """
+
+    mantissas = np.append(  # integer mantissas / b ^ l, then zero
+        np.arange(b ** (l - 1), b ** l, dtype=np.float64) / float(b) ** l, 0.0
+    )
+    absolute_exponents = np.arange(b ** k, dtype=np.float64)
+    powers = np.float_power(b, np.concatenate([absolute_exponents, -absolute_exponents]))
+    signs = np.array([1.0, -1.0])
+
+    values = np.multiply.outer(np.multiply.outer(mantissas, powers), signs)
+    return values.ravel()
 
 
 def convert_machine_numbers(numbers, in_base):
@@ -62,7 +163,7 @@ def convert_machine_numbers(numbers, in_base):
 
         new_mantissa = convert_mantissa(number.mantissa, in_base)  # 2 decimal
         new_exponent = float(int(number.exponent, in_base))
-        raw = number.sign + str(new_mantissa * in_base ** new_exponent)
-        return float(raw)
+        value = new_mantissa * in_base ** new_exponent
+        return -value if number.sign == '-' else value
 
     return map(convert, numbers)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import scipy.sparse.linalg
+
+from hal.maths.la.matrix import Matrix, to_array, as_matvec
+
+
+class LinearOperator:
+    """Matrix-free A: only x -> A * x is known, so memory is O(n) (e.g
+    stencil of a PDE). Can replace LinearSystemMatrix in solvers which need
+    only matvecs (Jacobi, gradient, CG and other Krylov methods)"""
+
+    def __init__(self, shape, matvec, diagonal=None, rmatvec=None):
+        """
+        :param shape: (rows, columns)
+        :param matvec: function x -> A * x (x is 1D np.ndarray)
+        :param diagonal: diagonal of A (needed by Jacobi), as values or
+            function returning them
+        :param rmatvec: function x -> A^T * x
+        """
+
+        self._shape = tuple(shape)
+        self._matvec = matvec
+        self._diagonal = diagonal
+        self._rmatvec = rmatvec
+
+    def shape(self):
+        return self._shape
+
+    def matvec(self, x):
+        """Computes A * x
+
+        :param x: vector (1D, or n x 1)
+        :return: A * x, with same shape as x
+        """
+
+        x = np.asarray(x)
+        y = np.asarray(self._matvec(x.ravel()), dtype=float)
+        return y.reshape(-1, 1) if x.ndim == 2 else y
+
+    def matmat(self, X):
+        """Computes A * X, one column at a time
+
+        :param X: n x k block
+        :return: A * X
+        """
+
+        X = np.asarray(X)
+        if X.ndim == 1:
+            return self.matvec(X)
+
+        return np.column_stack([
+            np.asarray(self._matvec(column), dtype=float) for column in X.T
+        ])
+
+    def rmatvec(self, x):
+        """Computes A^T * x
+
+        :param x: vector
+        :return: A^T * x
+        """
+
+        if self._rmatvec is None:
+            raise ValueError('Transpose matvec of operator is not known')
+
+        return np.asarray(self._rmatvec(np.ravel(x)), dtype=float)
+
+    def get_diagonal_values(self):
+        if self._diagonal is None:
+            raise ValueError('Diagonal of operator is not known')
+
+        if callable(self._diagonal):
+            self._diagonal = self._diagonal()
+
+        return np.asarray(self._diagonal, dtype=float).ravel()
+
+    def to_scipy(self):
+        """Gets scipy view, to use with scipy.sparse.linalg (and spectral
+        estimates)
+
+        :return: scipy.sparse.linalg.LinearOperator
+        """
+
+        return scipy.sparse.linalg.LinearOperator(
+            self._shape, matvec=self.matvec, matmat=self.matmat,
+            rmatvec=self.rmatvec if self._rmatvec is not None else None,
+            dtype=float
+        )
+
+    def __mul__(self, other):
+        return Matrix(self.matmat(to_array(other)))
+
+
+def as_operator(A):
+    """Gets matvec-only view of matrix
+
+    :param A: LinearOperator, LinearSystemMatrix, np.ndarray, np.memmap
+        or scipy.sparse matrix
+    :return: scipy.sparse.linalg.LinearOperator (streaming over tiles of
+        rows if np.memmap)
+    """
+
+    if isinstance(A, LinearOperator):
+        return A.to_scipy()
+
+    return scipy.sparse.linalg.aslinearoperator(as_matvec(to_array(A)))
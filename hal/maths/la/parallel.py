@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import scipy.sparse
+
+from hal.parallel import get_executor, get_workers
+
+
+def get_blocks(n_rows, n_blocks):
+    """Splits rows in contiguous blocks of (almost) same size
+
+    :param n_rows: number of rows
+    :param n_blocks: number of blocks
+    :return: list of (start, stop)
+    """
+
+    bounds = np.linspace(0, n_rows, min(n_blocks, n_rows) + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def get_coloring(A):
+    """Colors unknowns greedily, so that coupled ones (a_ij != 0 or
+    a_ji != 0) have different colors: unknowns of same color can be updated
+    at once. Grids with 5-point stencil get 2 colors (red-black)
+
+    :param A: square matrix (np.ndarray or scipy.sparse)
+    :return: list of row indices, one for each color
+    """
+
+    pattern = abs(scipy.sparse.csr_matrix(A))
+    pattern = (pattern + pattern.T).tocsr()
+    colors = np.full(pattern.shape[0], -1)
+
+    for row in range(pattern.shape[0]):
+        neighbours = pattern.indices[pattern.indptr[row]:pattern.indptr[row + 1]]
+        used = set(colors[neighbours])
+        color = 0
+        while color in used:
+            color += 1
+
+        colors[row] = color
+
+    return [np.flatnonzero(colors == color) for color in range(colors.max() + 1)]
+
+
+class BlockPool:
+    """Runs functions on blocks of rows with a pool of threads. NumPy and
+    SciPy release the GIL in matrix products, so blocks run on different
+    cores; arrays are shared by threads, never copied"""
+
+    def __init__(self, workers=None):
+        """
+        :param workers: number of threads (None for number of cores)
+        """
+
+        self.workers = get_workers(workers)
+
+    def run(self, function, blocks):
+        """Calls function on each block, waits for all
+
+        :param function: function(*block)
+        :param blocks: list of tuples of arguments
+        """
+
+        if self.workers == 1 or len(blocks) == 1:  # no need of threads
+            for block in blocks:
+                function(*block)
+            return
+
+        futures = [
+            get_executor(self.workers).submit(function, *block)
+            for block in blocks
+        ]
+        for future in futures:
+            future.result()  # raises errors of threads
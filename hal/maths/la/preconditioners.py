@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import abc
+
+from hal.maths.la.matrix import LinearSystemMatrix, is_sparse, \
+    solve_triangular
+from hal.maths.la.operators import LinearOperator
+
+
+class Preconditioner:
+    """M ~ A, such that M^-1 * r is cheap to compute"""
+
+    def __init__(self, A):
+        """
+        :param A: matrix, or LinearOperator (only for preconditioners needing
+            just its diagonal)
+        """
+
+        self.A = LinearSystemMatrix(A) \
+            if not isinstance(A, (LinearSystemMatrix, LinearOperator)) else A
+
+    @abc.abstractmethod
+    def apply(self, r):
+        """Solves M * z = r
+
+        :param r: residual (column vector as np.ndarray)
+        :return: z
+        """
+
+        return r
+
+
+class IdentityPreconditioner(Preconditioner):
+    def apply(self, r):
+        return r
+
+
+class JacobiPreconditioner(Preconditioner):
+    def __init__(self, A):
+        super().__init__(A)
+
+        self.inv_diagonal = 1.0 / self.A.get_diagonal_values().reshape(-1, 1)
+
+    def apply(self, r):
+        return self.inv_diagonal * r
+
+
+class SSORPreconditioner(Preconditioner):
+    def __init__(self, A, w=1.0):
+        super().__init__(A)
+
+        self.w = w
+
+        D, L, U = self.A.dlu_decompose()
+        self.lower = D.to_numpy() / w + L.to_numpy()  # (D + w L) / w
+        self.upper = D.to_numpy() / w + U.to_numpy()  # (D + w U) / w
+        self.scale = (self.A.get_diagonal_values() * (2 - w) / w).reshape(-1, 1)
+
+    def apply(self, r):
+        y = solve_triangular(self.lower, r, lower=True)
+        return solve_triangular(self.upper, self.scale * y, lower=False)
+
+
+class IncompleteCholeskyPreconditioner(Preconditioner):
+    def __init__(self, A):
+        super().__init__(A)
+
+        self.L = self.A.incomplete_Cholesky().to_numpy()
+        self.L_T = self.L.T.tocsr() if is_sparse(self.L) else self.L.T
+
+    def apply(self, r):
+        y = solve_triangular(self.L, r, lower=True)
+        return solve_triangular(self.L_T, y, lower=False)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import scipy.sparse.linalg
+
+DEFAULT_TOLL = 1e-10
+POWER_ITERATIONS = 1000
+SEED = 0  # estimates are reproducible
+
+
+def as_operator(A):
+    """Gets matvec-only view of matrix
+
+    :param A: np.ndarray, scipy.sparse matrix or LinearOperator
+    :return: LinearOperator
+    """
+
+    return scipy.sparse.linalg.aslinearoperator(A)
+
+
+def get_start_vector(n):
+    return np.random.RandomState(SEED).uniform(-1, 1, size=n)
+
+
+def power_iteration(A, toll=DEFAULT_TOLL, max_iterations=POWER_ITERATIONS):
+    """Estimates largest absolute eigenvalue as ||A x_k||, x_k = A^k x / ||A^k x||
+
+    :param A: np.ndarray, scipy.sparse matrix or LinearOperator
+    :param toll: stop when relative change of estimate is below this
+    :param max_iterations: max number of matvecs
+    :return: estimate of spectral radius
+    """
+
+    A = as_operator(A)
+    x = get_start_vector(A.shape[0])
+    x /= np.linalg.norm(x)
+    estimate = 0.0
+
+    for _ in range(max_iterations):
+        y = A.matvec(x)
+        norm = np.linalg.norm(y)
+        if norm == 0:
+            return 0.0
+
+        if abs(norm - estimate) <= toll * norm:
+            return norm
+
+        x = y / norm
+        estimate = norm
+
+    return estimate
+
+
+def get_spectral_radius(A, toll=DEFAULT_TOLL, max_iterations=None,
+                        symmetric=False):
+    """Estimates largest absolute eigenvalue with Lanczos (if symmetric) or
+    Arnoldi iterations: only matvecs are needed
+
+    :param A: np.ndarray, scipy.sparse matrix or LinearOperator
+    :param toll: relative accuracy of estimate
+    :param max_iterations: max number of restarts (None for default)
+    :param symmetric: True iff A is symmetric
+    :return: estimate of spectral radius
+    """
+
+    A = as_operator(A)
+    n = A.shape[0]
+
+    if n < 3:  # too small for ARPACK
+        dense = np.column_stack([A.matvec(column) for column in np.eye(n)])
+        eigenvalues = np.linalg.eigvals(dense)
+        return np.max(np.abs(eigenvalues))
+
+    solver = scipy.sparse.linalg.eigsh if symmetric else scipy.sparse.linalg.eigs
+    try:
+        eigenvalues = solver(
+            A, k=1, which='LM', tol=toll, maxiter=max_iterations,
+            v0=get_start_vector(n), return_eigenvectors=False
+        )
+        return np.max(np.abs(eigenvalues))
+    except scipy.sparse.linalg.ArpackNoConvergence:
+        return power_iteration(A, toll, max_iterations or POWER_ITERATIONS)
+
+
+def get_l2_norm(A, toll=DEFAULT_TOLL, max_iterations=None):
+    """Estimates largest singular value, as sqrt of largest eigenvalue of
+    A^T * A (never built: 2 matvecs per iteration)
+
+    :param A: np.ndarray, scipy.sparse matrix or LinearOperator
+    :param toll: relative accuracy of estimate
+    :param max_iterations: max number of restarts (None for default)
+    :return: estimate of ||A||_2
+    """
+
+    A = as_operator(A)
+    normal = scipy.sparse.linalg.LinearOperator(
+        (A.shape[1], A.shape[1]),
+        matvec=lambda x: A.rmatvec(A.matvec(x)),
+        dtype=A.dtype
+    )
+    return np.sqrt(get_spectral_radius(normal, toll, max_iterations, True))
+
+
+def get_condition_number(A, factorization, toll=DEFAULT_TOLL,
+                         max_iterations=None):
+    """Estimates condition number in 2-norm: ||A||_2 * ||A^-1||_2, where
+    A^-1 is applied by solving with factorization
+
+    :param A: np.ndarray, scipy.sparse matrix or LinearOperator
+    :param factorization: Factorization of A
+    :param toll: relative accuracy of estimate
+    :param max_iterations: max number of restarts (None for default)
+    :return: estimate of condition number
+    """
+
+    inverse = scipy.sparse.linalg.LinearOperator(
+        A.shape,
+        matvec=factorization.solve,
+        rmatvec=lambda x: factorization.solve(x, transposed=True),
+        dtype=float
+    )
+    return get_l2_norm(A, toll, max_iterations) * \
+        get_l2_norm(inverse, toll, max_iterations)
@@ -1,12 +1,23 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import numpy as np
+
+L2_NORM = 'l2'
+LINFINITE_NORM = 'linf'
+COMPONENT_NORM = 'component'  # each component within its own tolerance
+NORMS = [L2_NORM, LINFINITE_NORM, COMPONENT_NORM]
+
 
 def modulus(x):
-    try:
-        return x.linear_norm()
-    except:
-        return abs(x)
+    linear_norm = getattr(x, 'linear_norm', None)
+    if linear_norm is not None:  # Matrix
+        return linear_norm()
+
+    if np.ndim(x) > 0:
+        return np.linalg.norm(x)
+
+    return abs(x)
 
 
 def get_error(x, x_real):
@@ -15,7 +26,35 @@ def get_error(x, x_real):
 
 
 def apply_toll(x, rel_toll, abs_toll):
-    x *= rel_toll
-    x = modulus(x)
-    x += abs_toll
-    return x
+    return modulus(x) * rel_toll + abs_toll  # x is left untouched
+
+
+def as_columns(X):
+    """Gets 2D view of vector (or block of vectors)
+
+    :param X: vector (1D np.ndarray) or n x k block
+    :return: n x k np.ndarray
+    """
+
+    X = np.asarray(X)
+    return X.reshape(-1, 1) if X.ndim == 1 else X
+
+
+def get_column_norms(X, norm=L2_NORM):
+    """Gets norm of each column, without temporary copies of X
+
+    :param X: n x k np.ndarray
+    :param norm: L2_NORM or LINFINITE_NORM
+    :return: k norms
+    """
+
+    if norm == L2_NORM:
+        return np.sqrt(np.einsum('ij,ij->j', X, X))
+
+    if norm == LINFINITE_NORM:
+        if X.shape[0] == 0:
+            return np.zeros(X.shape[1])
+
+        return np.maximum(X.max(axis=0), -X.min(axis=0))
+
+    raise ValueError('Unknown norm: {}'.format(norm))
@@ -2,7 +2,16 @@
 
 """Primes functions """
 
+import functools
+import math
+import operator
 import random
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+
+from hal.maths.nt.sieve import get_base_primes, get_prime_table
+from hal.parallel import get_process_executor, get_workers
 
 LOW_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53,
               59, 61, 67, 71, 73, 79, 83, 89, 97, 101,
@@ -23,6 +32,212 @@ LOW_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53,
               991, 997]  # primes until 1000
 
 
+LOW_PRIMES_SET = set(LOW_PRIMES)
+LOW_PRIMES_PRODUCT = functools.reduce(operator.mul, LOW_PRIMES)  # primorial
+MAX_TRIAL_DIVISION = 1009 ** 2  # smallest composite with no factor < 1000
+DEFAULT_PRECISION = 5  # rounds above deterministic range
+
+# n < limit -> bases make Miller-Rabin deterministic (Jaeschke, Sorenson and
+# Webster)
+MILLER_RABIN_BASES = [
+    (2047, [2]),
+    (1373653, [2, 3]),
+    (25326001, [2, 3, 5]),
+    (3215031751, [2, 3, 5, 7]),
+    (2152302898747, [2, 3, 5, 7, 11]),
+    (3474749660383, [2, 3, 5, 7, 11, 13]),
+    (341550071728321, [2, 3, 5, 7, 11, 13, 17]),
+    (3825123056546413051, [2, 3, 5, 7, 11, 13, 17, 19, 23]),
+    (318665857834031151167461, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]),
+    (3317044064679887385961981,
+     [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]),
+]
+MAX_DETERMINISTIC = MILLER_RABIN_BASES[-1][0]
+
+# vectorized test: products of numbers below 2 ^ 32 fit in 64 bits
+MAX_VECTORIZED = 2 ** 32
+VECTORIZED_BASES = [2, 7, 61]  # deterministic below 4759123141
+MAX_TABLE_LOOKUP = 2 ** 20  # smaller numbers are looked up in prime table
+
+# prime generation: window of WINDOW_SIZE * bits odd candidates (~3 times the
+# average gap between primes) is sieved with primes below MAX_WINDOW_SIEVE
+MAX_WINDOW_SIEVE = 2 ** 16
+SIEVE_MIN_BITS = 32  # smaller primes are just drawn at random
+WINDOW_SIZE = 2
+CHUNK_SIZE = 4  # candidates tested by each task
+BBS_CHUNK_BYTES = 4096  # default chunk of Blum Blum Shub streams
+
+
+def get_miller_rabin_bases(n, precision=DEFAULT_PRECISION):
+    """Gets bases to test number with
+
+    :param n: odd number > 2
+    :param precision: number of extra rounds if n is too big to test
+        deterministically
+    :return: list of bases
+    """
+
+    for limit, bases in MILLER_RABIN_BASES:
+        if n < limit:
+            return bases
+
+    generator = random.Random(n)  # same number -> same bases
+    return MILLER_RABIN_BASES[-1][1] + [
+        generator.randrange(2, n - 1) for _ in range(precision)
+    ]
+
+
+def miller_rabin(n, bases):
+    """Tests prime with miller-rabin algorithm
+
+    :param n: odd number > 2
+    :param bases: bases to test with
+    :return: False if composite, True if probably prime (surely prime if
+        bases are the deterministic ones)
+    """
+
+    s = ((n - 1) & -(n - 1)).bit_length() - 1  # write n - 1 = d * 2^s, d odd
+    d = (n - 1) >> s
+
+    for base in bases:
+        v = pow(base, d, n)
+        if v == 1 or v == n - 1:
+            continue
+
+        for _ in range(s - 1):
+            v = pow(v, 2, n)
+            if v == n - 1:
+                break
+        else:
+            return False  # base is a witness
+
+    return True
+
+
+def is_probably_prime(n, precision=DEFAULT_PRECISION):
+    """Checks primality: trial division by LOW_PRIMES (with a single gcd),
+    then Miller-Rabin, deterministic for n < 3.3 * 10 ^ 24
+
+    :param n: number
+    :param precision: number of rounds with random (but reproducible) bases
+        above deterministic range
+    :return: True iff (probably) prime
+    """
+
+    if n < 2:
+        return False
+
+    if n in LOW_PRIMES_SET:
+        return True
+
+    if math.gcd(n, LOW_PRIMES_PRODUCT) != 1:  # multiple of a low prime
+        return False
+
+    if n < MAX_TRIAL_DIVISION:
+        return True
+
+    return miller_rabin(n, get_miller_rabin_bases(n, precision))
+
+
+def get_trial_division_mask(numbers):
+    """Checks divisibility by low primes of many numbers at once
+
+    :param numbers: np.ndarray of int64
+    :return: True iff number has no low prime factor (or is one)
+    """
+
+    mask = np.ones(len(numbers), dtype=bool)
+    for prime in LOW_PRIMES:
+        mask &= (numbers % prime != 0) | (numbers == prime)
+
+    return mask
+
+
+def vectorized_miller_rabin(numbers, bases=VECTORIZED_BASES):
+    """Tests many primes at once, with Miller-Rabin on arrays
+
+    :param numbers: np.ndarray of odd numbers > 2 and < 2 ^ 32
+    :param bases: bases to test with
+    :return: False if composite, True if probably prime
+    """
+
+    n = numbers.astype(np.uint64)
+    if len(n) == 0:
+        return np.ones(0, dtype=bool)
+
+    one = np.uint64(1)
+    d = n - one
+    s = np.zeros(len(n), dtype=np.int64)
+    while True:  # write n - 1 = d * 2^s, d odd
+        even = (d & one) == 0
+        if not np.any(even):
+            break
+
+        d[even] >>= one
+        s[even] += 1
+
+    result = np.ones(len(n), dtype=bool)
+    for base in bases:
+        v = np.ones(len(n), dtype=np.uint64)  # v = base ^ d mod n
+        power = np.uint64(base) % n
+        exponent = d.copy()
+        while np.any(exponent):
+            odd = (exponent & one) == 1
+            v[odd] = v[odd] * power[odd] % n[odd]
+            power = power * power % n
+            exponent >>= one
+
+        passed = (v == 1) | (v == n - one)
+        for r in range(1, int(s.max())):
+            v = v * v % n
+            passed |= (v == n - one) & (r < s)
+
+        result &= passed
+
+    return result
+
+
+def is_probably_prime_many(numbers, precision=DEFAULT_PRECISION):
+    """Checks primality of many numbers: trial division runs on arrays for
+    numbers below 2 ^ 63, and so does Miller-Rabin below 2 ^ 32; bigger
+    ones are tested one by one
+
+    :param numbers: iterable of numbers
+    :param precision: number of rounds with random (but reproducible) bases
+        above deterministic range
+    :return: list of booleans, True iff (probably) prime
+    """
+
+    numbers = list(numbers)
+    result = [False] * len(numbers)
+    small = [i for i, n in enumerate(numbers) if 2 <= n < MAX_VECTORIZED]
+    medium = [i for i, n in enumerate(numbers) if MAX_VECTORIZED <= n < 2 ** 63]
+
+    if small:
+        values = np.array([numbers[i] for i in small], dtype=np.int64)
+        candidates = get_trial_division_mask(values)
+        to_test = candidates & (values >= MAX_TRIAL_DIVISION)
+        candidates[to_test] = vectorized_miller_rabin(values[to_test])
+
+        for i, is_prime in zip(small, candidates):
+            result[i] = bool(is_prime)
+
+    if medium:
+        values = np.array([numbers[i] for i in medium], dtype=np.int64)
+        candidates = get_trial_division_mask(values)
+
+        for i, is_candidate in zip(medium, candidates):
+            if is_candidate:
+                n = numbers[i]
+                result[i] = miller_rabin(n, get_miller_rabin_bases(n, precision))
+
+    for i, n in enumerate(numbers):
+        if n >= 2 ** 63:
+            result[i] = is_probably_prime(n, precision)
+
+    return result
+
+
 class Integer:
     """Big int std python won't recognize"""
 
@@ -34,79 +249,169 @@ class Integer:
         """Checks if prime in very naive way
         :return: True iff prime
         """
-        if self.to_int < 2:
-            return False
-        elif self.to_int % 2 == 0:
-            return False
 
-        return self.to_int in LOW_PRIMES
+        return self.to_int in LOW_PRIMES_SET
 
     def is_probably_prime(self):
-        """Tests with miller-rabin
+        """Looks up small numbers in prime table, tests others with
+        miller-rabin
         :return: True iff prime
         """
 
-        if self.is_naive_prime():
-            return True
+        if self.to_int < MAX_TABLE_LOOKUP:
+            return get_prime_table().is_prime(self.to_int)
 
-        # check if multiple pf low primes
-        for prime in LOW_PRIMES:
-            if self.to_int % prime == 0:
-                return False
-
-        # if all else fails, call rabin to determine if to_int is prime
-        return self.test_miller_rabin(5)
+        return is_probably_prime(self.to_int)
 
     def test_miller_rabin(self, precision):
         """Tests prime with miller-rabin algorithm
 
-        :param precision: number of rounds to perform
+        :param precision: number of rounds to perform above deterministic
+            range
         :return: True iff probably prime
         """
 
-        if not self.is_naive_prime():
-            # true -> probably prime
-            # false -> composite
-
-            s = self.to_int - 1  # write n = d * 2^s, d odd
-            t = 0
-            while s % 2 == 0:
-                s /= 2
-                t += 1
-
-            # let a = random in the range 2, n-1
-            # v = a^d mod n
-            # if v = +-1 mod n:
-            #     repeat this s-1 times:
-            #     v = v^2 mod n
-            #     if v = 1 -> composite
-            # -> prime
-            for _ in range(precision):
-                a = random.randrange(2, self.to_int - 1)
-                v = pow(int(a), int(s), self.to_int)
-                if v != 1:
-                    i = 0
-                    while v != (self.to_int - 1):
-                        if i == t - 1:
-                            return False
-                        else:
-                            i += 1
-                            v = (v ** 2) % self.to_int
-            return True
+        if self.to_int < 3 or self.to_int % 2 == 0:
+            return self.to_int == 2
 
-        return True
+        return miller_rabin(
+            self.to_int, get_miller_rabin_bases(self.to_int, precision)
+        )
 
 
-def get_prime(bits):
-    """Creates (probable) prime number of given size
+@functools.lru_cache(maxsize=None)
+def get_window_primes():
+    """Gets odd primes below MAX_WINDOW_SIEVE, used to sieve windows
+
+    :return: np.ndarray of int64
+    """
+
+    return get_base_primes(MAX_WINDOW_SIEVE - 1)[1:]
+
+
+def sieve_window(start, size):
+    """Sieves odd candidates of a window with primes below MAX_WINDOW_SIEVE
+
+    :param start: odd number > MAX_WINDOW_SIEVE
+    :param size: number of odd candidates (start, start + 2, ...)
+    :return: list of candidates with no small factor
+    """
+
+    primes = get_window_primes()
+    residues = np.array([start % p for p in primes.tolist()], dtype=np.int64)
+    firsts = (-residues) % primes * ((primes + 1) // 2) % primes  # 2 i = -r
+
+    mask = np.ones(size, dtype=bool)  # i -> start + 2 * i
+    for p, first in zip(primes.tolist(), firsts.tolist()):
+        mask[first::p] = False
+
+    return [start + 2 * i for i in np.flatnonzero(mask).tolist()]
+
+
+def get_window_start(bits, generator=random):
+    """Gets random start of window of candidates of given size
+
+    :param bits: size of candidates
+    :param generator: random generator
+    :return: odd number
+    """
+
+    size = WINDOW_SIZE * bits
+    return generator.randrange(2 ** (bits - 1), 2 ** bits - 2 * size) | 1
+
+
+def find_prime_in(candidates, precision=DEFAULT_PRECISION):
+    """Tests candidates with Miller-Rabin (they are trial-divided already)
+
+    :param candidates: odd numbers with no small factor
+    :param precision: number of rounds above deterministic range
+    :return: first (probable) prime, None if there are none
+    """
+
+    for candidate in candidates:
+        if miller_rabin(candidate, get_miller_rabin_bases(candidate, precision)):
+            return candidate
+
+    return None
+
+
+def search_prime(bits, precision=DEFAULT_PRECISION, seed=None):
+    """Searches a (probable) prime of given size, one window at a time
 
     :param bits: size of number to generate
+    :param precision: number of rounds above deterministic range
+    :param seed: seed of random generator (None for module one)
     :return: prime number of given size
     """
+
+    generator = random if seed is None else random.Random(seed)
+    if bits < SIEVE_MIN_BITS:
+        while True:
+            num = generator.randrange(2 ** (bits - 1), 2 ** bits)
+            if is_probably_prime(num, precision):
+                return num
+
     while True:
-        num = random.randrange(2 ** (bits - 1), 2 ** bits)
-        if Integer(str(num)).is_probably_prime():
-            return num
+        start = get_window_start(bits, generator)
+        prime = find_prime_in(sieve_window(start, WINDOW_SIZE * bits), precision)
+        if prime is not None:
+            return prime
+
+
+def get_prime(bits, workers=1, precision=DEFAULT_PRECISION):
+    """Creates (probable) prime number of given size. Candidates are a window
+    of odd numbers from a random start: they are sieved with small primes,
+    then survivors are tested with Miller-Rabin by a pool of processes
+
+    :param bits: size of number to generate
+    :param workers: number of processes (None for number of cores)
+    :param precision: number of rounds above deterministic range
+    :return: prime number of given size (first found by any process)
+    """
+
+    workers = get_workers(workers)
+    if workers == 1 or bits < SIEVE_MIN_BITS:
+        return search_prime(bits, precision)
+
+    executor = get_process_executor(workers)
+    while True:
+        candidates = sieve_window(get_window_start(bits), WINDOW_SIZE * bits)
+        futures = {
+            executor.submit(find_prime_in, candidates[i:i + CHUNK_SIZE], precision)
+            for i in range(0, len(candidates), CHUNK_SIZE)
+        }
+
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            primes = [future.result() for future in done]
+            primes = [prime for prime in primes if prime is not None]
+            if primes:
+                for future in futures:
+                    future.cancel()  # chunks running already are just ignored
+
+                return primes[0]
+
+
+def get_many_primes(bits, amount, workers=1, precision=DEFAULT_PRECISION):
+    """Creates many (probable) primes of given size, each one from its own
+    window: processes search different primes at once
+
+    :param bits: size of numbers to generate
+    :param amount: number of primes
+    :param workers: number of processes (None for number of cores)
+    :param precision: number of rounds above deterministic range
+    :return: list of primes (independent draws: they may repeat if bits are
+        few)
+    """
+
+    seeds = [random.getrandbits(64) for _ in range(amount)]  # random.seed works
+    workers = get_workers(workers)
+    if workers == 1 or amount <= 1:
+        return [search_prime(bits, precision, seed) for seed in seeds]
+
+    return list(get_process_executor(workers).map(
+        search_prime, [bits] * amount, [precision] * amount, seeds
+    ))
 
 
 def blum_blum_shub(seed, amount, prime0, prime1):
@@ -133,3 +438,130 @@ def blum_blum_shub(seed, amount, prime0, prime1):
         rand.append(next_num)
 
     return rand
+
+
+class BlumBlumShub:
+    """Blum Blum Shub generator of random bits: x_(i + 1) = x_i ^ 2 mod M
+    (M = p * q), low bits of each x_i are emitted. State is a single number,
+    so streams of any length need constant memory"""
+
+    def __init__(self, seed, prime0, prime1, bits_per_step=1):
+        """
+        :param seed: x_0, coprime with both primes
+        :param prime0: one prime number, == 3 mod 4
+        :param prime1: the second prime number, == 3 mod 4
+        :param bits_per_step: low bits taken from each x_i (at most
+            log2(log2(M)) to stay secure)
+        """
+
+        if prime0 % 4 != 3 or prime1 % 4 != 3:
+            raise ValueError('Primes must be congruent 3 mod 4')
+
+        if bits_per_step < 1:
+            raise ValueError(
+                'At least 1 bit per step is needed, got {}'.format(bits_per_step)
+            )
+
+        self.mod = prime0 * prime1
+        if math.gcd(seed, self.mod) != 1:
+            raise ValueError('Seed must be coprime with both primes')
+
+        self.carmichael = (prime0 - 1) * (prime1 - 1) // math.gcd(
+            prime0 - 1, prime1 - 1
+        )  # lambda(M): x ^ lambda(M) == 1 mod M
+        self.seed = seed % self.mod
+        self.bits_per_step = bits_per_step
+        self.jump(0)
+
+    def jump(self, position):
+        """Moves generator to x_i = x_0 ^ (2 ^ i mod lambda(M)) mod M in
+        O(log i) multiplications: workers jumping to far positions produce
+        disjoint parts of same stream
+
+        :param position: index i of state (next number emitted is x_(i + 1))
+        """
+
+        self.position = position
+        self.state = pow(self.seed, pow(2, position, self.carmichael), self.mod)
+        self._buffer = 0  # bits computed but not read yet
+        self._buffer_bits = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.state = self.state * self.state % self.mod
+        self.position += 1
+        return self.state
+
+    def read(self, n_bytes):
+        """Reads next random bytes: bits of x_(i + 1), x_(i + 2) ... are
+        packed most significant first. Reads of any size form same stream
+
+        :param n_bytes: number of bytes
+        :return: bytes
+        """
+
+        buffer = bytearray(n_bytes)
+        self.readinto(buffer)
+        return bytes(buffer)
+
+    def readinto(self, buffer):
+        """Fills buffer with next random bytes, one byte at a time: bits
+        not fitting in a whole byte are kept for next read
+
+        :param buffer: bytearray, np.ndarray of uint8, or any writable buffer
+        :return: number of bytes written
+        """
+
+        view = memoryview(buffer).cast('B')
+        k = self.bits_per_step
+        mask = (1 << k) - 1
+        x, mod = self.state, self.mod
+        bits, n_bits = self._buffer, self._buffer_bits  # < 8 + k bits
+        steps = 0
+
+        for i in range(len(view)):
+            while n_bits < 8:
+                x = x * x % mod
+                bits = bits << k | x & mask
+                n_bits += k
+                steps += 1
+
+            n_bits -= 8
+            view[i] = bits >> n_bits
+            bits &= (1 << n_bits) - 1
+
+        self.state = x
+        self.position += steps
+        self._buffer = bits
+        self._buffer_bits = n_bits
+        return len(view)
+
+    def get_array(self, n_bytes):
+        """Reads next random bytes as array
+
+        :param n_bytes: number of bytes
+        :return: np.ndarray of uint8
+        """
+
+        array = np.empty(n_bytes, dtype=np.uint8)
+        self.readinto(array)
+        return array
+
+    def iter_chunks(self, chunk_size=BBS_CHUNK_BYTES, n_bytes=None):
+        """Generates random bytes in chunks
+
+        :param chunk_size: bytes in each chunk
+        :param n_bytes: total bytes (None for endless stream)
+        :return: generator of bytes
+        """
+
+        remaining = n_bytes
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            yield self.read(size)
+
+            if remaining is not None:
+                remaining -= size
+
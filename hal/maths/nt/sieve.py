@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""Segmented sieve of Eratosthenes and cache of small primes """
+
+import functools
+import math
+import threading
+
+import numpy as np
+
+SEGMENT_SIZE = 2 ** 18  # numbers sieved at once (bytes of work memory / 2)
+MIN_TABLE_LIMIT = 2 ** 16  # first size of prime table
+INDEX_BLOCK_BYTES = 256  # bytes of prime table counted by each index entry
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def isqrt(n):
+    """Gets integer square root (math.isqrt needs Python 3.8)
+
+    :param n: non-negative number
+    :return: largest integer whose square is <= n
+    """
+
+    root = int(math.sqrt(n))
+    while root * root > n:  # float rounding of large n
+        root -= 1
+    while (root + 1) * (root + 1) <= n:
+        root += 1
+
+    return root
+
+
+def get_base_primes(n):
+    """Gets primes <= n with a plain odd-only sieve (n is small: used to sieve
+    segments up to n ^ 2)
+
+    :param n: upper bound
+    :return: np.ndarray of int64
+    """
+
+    if n < 2:
+        return np.zeros(0, dtype=np.int64)
+
+    odds = np.ones((n + 1) // 2, dtype=bool)  # i -> 2 * i + 1
+    odds[0] = False  # 1 is not a prime
+    for i in range(1, (isqrt(n) + 1) // 2):
+        if odds[i]:
+            p = 2 * i + 1
+            odds[p * p // 2::p] = False
+
+    return np.concatenate([[2], 2 * np.flatnonzero(odds) + 1]).astype(np.int64)
+
+
+def sieve_segment(low, high, base_primes):
+    """Sieves odd numbers of [low, high)
+
+    :param low: even lower bound
+    :param high: even upper bound
+    :param base_primes: (at least) all primes <= sqrt(high)
+    :return: np.ndarray of bool, i-th is True iff low + 2 * i + 1 is prime
+    """
+
+    segment = np.ones((high - low) // 2, dtype=bool)
+    if low == 0:
+        segment[0] = False  # 1 is not a prime
+
+    for p in base_primes[1:]:  # 2 is skipped: there are only odd numbers
+        p = int(p)
+        if p * p >= high:
+            break
+
+        first = max(p * p, -(-(low + 1) // p) * p)  # first multiple in segment
+        if first % 2 == 0:
+            first += p  # first odd multiple
+
+        segment[(first - low - 1) // 2::p] = False
+
+    return segment
+
+
+def iter_prime_segments(a, b, segment_size=SEGMENT_SIZE):
+    """Generates primes in [a, b), one segment at a time: memory is
+    O(sqrt(b) + segment_size)
+
+    :param a: lower bound
+    :param b: upper bound (excluded)
+    :param segment_size: numbers sieved at once
+    :return: generator of np.ndarray of int64
+    """
+
+    a = max(a, 0)
+    if a >= b:
+        return
+
+    if a <= 2 < b:
+        yield np.array([2], dtype=np.int64)
+
+    base_primes = get_base_primes(isqrt(b))
+    segment_size += segment_size % 2
+    for low in range(a - a % 2, b, segment_size):
+        high = min(low + segment_size, b + b % 2)
+        segment = sieve_segment(low, high, base_primes)
+        primes = low + 2 * np.flatnonzero(segment).astype(np.int64) + 1
+        yield primes[(primes >= a) & (primes < b)]
+
+
+def iter_primes(a, b, segment_size=SEGMENT_SIZE):
+    """Lazily generates primes in [a, b), with bounded memory
+
+    :param a: lower bound
+    :param b: upper bound (excluded)
+    :param segment_size: numbers sieved at once
+    :return: generator of int
+    """
+
+    for primes in iter_prime_segments(a, b, segment_size):
+        yield from primes.tolist()
+
+
+def get_primes(a, b, segment_size=SEGMENT_SIZE):
+    """Gets primes in [a, b)
+
+    :param a: lower bound
+    :param b: upper bound (excluded)
+    :param segment_size: numbers sieved at once
+    :return: np.ndarray of int64
+    """
+
+    return np.concatenate(
+        [np.zeros(0, dtype=np.int64)] +
+        list(iter_prime_segments(a, b, segment_size))
+    )
+
+
+def get_nth_prime_bound(k):
+    """Gets upper bound of k-th prime (Rosser)
+
+    :param k: index of prime (1 for 2)
+    :return: number > k-th prime
+    """
+
+    if k < 6:
+        return 13
+
+    return int(k * (math.log(k) + math.log(math.log(k)))) + 1
+
+
+class PrimeTable:
+    """Primes below limit, grown lazily. Odd numbers are stored as bits
+    (limit / 16 bytes) for O(1) lookups; an index of primes before each
+    block of INDEX_BLOCK_BYTES bytes (limit / 512 bytes) is used to count
+    them and get the k-th one"""
+
+    def __init__(self):
+        self.limit = 0  # multiple of 16: odd numbers fill whole bytes
+        self.bits = np.zeros(0, dtype=np.uint8)  # bit i -> 2 * i + 1 is prime
+        self.counts = np.zeros(1, dtype=np.int64)  # odd primes before block
+        self.lock = threading.Lock()
+
+    def grow(self, limit):
+        """Sieves numbers until limit (at least), if not done yet. Table
+        (at least) doubles at each growth, so lookups are amortized O(1)
+
+        :param limit: upper bound (excluded) of numbers in table
+        """
+
+        if limit <= self.limit:
+            return
+
+        with self.lock:
+            if limit <= self.limit:  # grown by another thread meanwhile
+                return
+
+            new_limit = max(limit, 2 * self.limit, MIN_TABLE_LIMIT)
+            new_limit += -new_limit % 16
+            base_primes = get_base_primes(isqrt(new_limit))
+
+            bits = [self.bits]
+            for low in range(self.limit, new_limit, SEGMENT_SIZE):
+                high = min(low + SEGMENT_SIZE, new_limit)
+                bits.append(np.packbits(sieve_segment(low, high, base_primes)))
+
+            bits = np.concatenate(bits)
+            block_counts = np.add.reduceat(
+                POPCOUNT[bits], np.arange(0, len(bits), INDEX_BLOCK_BYTES),
+                dtype=np.int64
+            )
+            self.counts = np.concatenate([[0], np.cumsum(block_counts)])
+            self.bits = bits
+            self.limit = new_limit
+
+    def is_prime(self, n):
+        """Checks primality with table (grown if needed)
+
+        :param n: number
+        :return: True iff prime
+        """
+
+        if n < 3 or n % 2 == 0:
+            return n == 2
+
+        self.grow(n + 1)
+        i = n // 2
+        return bool((self.bits[i >> 3] >> (7 - (i & 7))) & 1)
+
+    def count(self, n):
+        """Counts primes (pi function)
+
+        :param n: number
+        :return: number of primes <= n
+        """
+
+        if n < 2:
+            return 0
+
+        self.grow(n + 1)
+        odds = (n + 1) // 2  # bits of odd numbers <= n
+        full_bytes, rest = odds >> 3, odds & 7
+        block = full_bytes // INDEX_BLOCK_BYTES
+
+        total = 1 + int(self.counts[block])  # 2 and odd primes before block
+        total += int(POPCOUNT[self.bits[block * INDEX_BLOCK_BYTES:full_bytes]].sum())
+        if rest:
+            total += int(POPCOUNT[self.bits[full_bytes] >> (8 - rest)])
+
+        return total
+
+    def get_nth(self, k):
+        """Gets k-th prime
+
+        :param k: index of prime (1 for 2)
+        :return: k-th prime
+        """
+
+        if k < 1:
+            raise ValueError('Primes are indexed from 1, got {}'.format(k))
+
+        if k == 1:
+            return 2
+
+        self.grow(get_nth_prime_bound(k))
+        k -= 1  # k-th odd prime
+        block = int(np.searchsorted(self.counts, k)) - 1  # holds k-th one
+        start = block * INDEX_BLOCK_BYTES
+        counts = self.counts[block] + np.cumsum(
+            POPCOUNT[self.bits[start:start + INDEX_BLOCK_BYTES]]
+        )
+        byte = int(np.searchsorted(counts, k))  # holds k-th one
+        before = int(counts[byte - 1]) if byte > 0 else int(self.counts[block])
+        bit = np.flatnonzero(np.unpackbits(self.bits[start + byte:start + byte + 1]))
+        i = 8 * (start + byte) + int(bit[k - before - 1])
+        return 2 * i + 1
+
+
+@functools.lru_cache(maxsize=None)
+def get_prime_table():
+    """Gets prime table shared by whole process
+
+    :return: PrimeTable
+    """
+
+    return PrimeTable()
+
+
+def count_primes(n):
+    """Counts primes <= n, with shared prime table
+
+    :param n: number
+    :return: pi(n)
+    """
+
+    return get_prime_table().count(n)
+
+
+def get_nth_prime(k):
+    """Gets k-th prime, with shared prime table
+
+    :param k: index of prime (1 for 2)
+    :return: k-th prime
+    """
+
+    return get_prime_table().get_nth(k)
@@ -2,12 +2,47 @@
 
 """Useful problems """
 
+from hal.parallel import get_process_executor, get_workers
+
+SPLIT_ROWS = 2  # parallel searches split tree on placements of first rows
+
+
+def count_bits(x):
+    return bin(x).count('1')
+
+
+def count_subproblem(board_size, table_size, prefix):
+    """Counts solutions starting with given queens (runs in worker process)
+
+    :param board_size: size of board
+    :param table_size: Size of table
+    :param prefix: columns of queens of first rows
+    :return: number of solutions
+    """
+
+    return EightQueen(board_size).count_prefix(table_size, prefix)
+
+
+def solve_subproblem(board_size, table_size, prefix):
+    """Finds solutions starting with given queens (runs in worker process)
+
+    :param board_size: size of board
+    :param table_size: Size of table
+    :param prefix: columns of queens of first rows
+    :return: list of tuples of columns
+    """
+
+    return list(EightQueen(board_size).iter_columns(table_size, prefix))
+
 
 class EightQueen:
-    """8 queen problem solver"""
+    """8 queen problem solver. Board is a set of bitboards: bit i of
+    columns (diagonals) is set iff column i (diagonal through column i of
+    current row) is taken, so free cells of a row are found in O(1)"""
 
     def __init__(self, board_size):
         self.board_size = board_size
+        self.full = (1 << board_size) - 1  # all columns
 
     @staticmethod
     def under_attack(col, queens):
@@ -24,20 +59,218 @@ class EightQueen:
                 return True
         return False
 
-    def solve(self, table_size):
+    def get_free(self, columns, left, right):
+        return self.full & ~(columns | left | right)
+
+    def count_from(self, rows, columns, left, right):
+        """Counts ways to place queens in next rows
+
+        :param rows: number of rows left
+        :param columns: bitboard of taken columns
+        :param left: bitboard of diagonals (going left) taken in this row
+        :param right: bitboard of diagonals (going right) taken in this row
+        :return: number of ways
+        """
+
+        free = self.get_free(columns, left, right)
+        if rows == 1:
+            return count_bits(free)
+
+        total = 0
+        while free:
+            bit = free & -free  # lowest free column
+            free ^= bit
+            total += self.count_from(
+                rows - 1, columns | bit,
+                ((left | bit) << 1) & self.full, (right | bit) >> 1
+            )
+
+        return total
+
+    def place(self, prefix):
+        """Places queens in first rows
+
+        :param prefix: columns of queens of first rows
+        :return: bitboards (columns, left, right) of next row, None if
+            queens attack each other
+        """
+
+        columns = left = right = 0
+        for column in prefix:
+            bit = 1 << column
+            if not self.get_free(columns, left, right) & bit:
+                return None
+
+            columns |= bit
+            left = ((left | bit) << 1) & self.full
+            right = (right | bit) >> 1
+
+        return columns, left, right
+
+    def count_prefix(self, table_size, prefix):
+        """Counts solutions starting with given queens
+
+        :param table_size: Size of table
+        :param prefix: columns of queens of first rows
+        :return: number of solutions
+        """
+
+        board = self.place(prefix)
+        if board is None or table_size > self.board_size:
+            return 0
+
+        if table_size == len(prefix):
+            return 1
+
+        return self.count_from(table_size - len(prefix), *board)
+
+    def get_split(self, table_size, split_rows=SPLIT_ROWS):
+        """Splits search on placements of first rows. Mirror images of
+        solutions are solutions too, so only queens in left half of first
+        row are tried (and counted twice); on odd boards, queens in middle
+        of first row are split the same way on second row
+
+        :param table_size: Size of table
+        :param split_rows: number of rows to split on
+        :return: list of (prefix, weight): number of solutions is sum of
+            weight * solutions starting with prefix
+        """
+
+        half = self.board_size // 2
+        split = [((column, ), 2) for column in range(half)]
+        if self.board_size % 2 == 1:
+            if table_size == 1:
+                split.append(((half, ), 1))
+            else:
+                split += [
+                    ((half, column), 2) for column in range(half)
+                    if self.place((half, column)) is not None
+                ]
+
+        for depth in range(1, min(split_rows, table_size)):  # next rows
+            extended = []
+            for prefix, weight in split:
+                if len(prefix) > depth:  # middle of odd board: split already
+                    extended.append((prefix, weight))
+                    continue
+
+                free = self.get_free(*self.place(prefix))
+                extended += [
+                    (prefix + (column, ), weight)
+                    for column in range(self.board_size) if free >> column & 1
+                ]
+
+            split = extended
+
+        return split
+
+    def count(self, table_size=None, workers=1):
+        """Counts solutions, without building them. Search is split on first
+        rows (see get_split): subproblems run on a pool of processes
+
+        :param table_size: Size of table (number of rows with a queen),
+            None for board size
+        :param workers: number of processes (None for number of cores)
+        :return: number of solutions
+        """
+
+        rows = self.board_size if table_size is None else table_size
+        if rows == 0:
+            return 1
+
+        if rows > self.board_size:
+            return 0
+
+        split = self.get_split(rows)
+        prefixes = [prefix for prefix, _ in split]
+        workers = get_workers(workers)
+        if workers == 1:
+            counts = [self.count_prefix(rows, prefix) for prefix in prefixes]
+        else:
+            counts = get_process_executor(workers).map(
+                count_subproblem, [self.board_size] * len(prefixes),
+                [rows] * len(prefixes), prefixes
+            )
+
+        return sum(weight * count for (_, weight), count in zip(split, counts))
+
+    def iter_columns(self, table_size=None, prefix=(), workers=1):
+        """Lazily generates solutions, depth-first with an explicit stack.
+        With many workers, subtrees of each placement of first rows are
+        searched by a pool of processes: solutions come in same order
+
+        :param table_size: Size of table (number of rows with a queen),
+            None for board size
+        :param prefix: columns of queens of first rows
+        :param workers: number of processes (None for number of cores)
+        :return: generator of tuples: column (from 0) of queen of each row
+        """
+
+        rows = self.board_size if table_size is None else table_size
+        workers = get_workers(workers)
+        if workers > 1 and rows - len(prefix) > SPLIT_ROWS:
+            prefixes = list(self.iter_columns(len(prefix) + SPLIT_ROWS, prefix))
+            solutions = get_process_executor(workers).map(
+                solve_subproblem, [self.board_size] * len(prefixes),
+                [rows] * len(prefixes), prefixes
+            )  # in order of prefixes
+            for subproblem_solutions in solutions:
+                yield from subproblem_solutions
+            return
+
+        board = self.place(prefix)
+        if board is None:
+            return
+
+        prefix = tuple(prefix)
+        rows -= len(prefix)
+        if rows == 0:
+            yield prefix
+            return
+
+        columns, left, right = [0] * rows, [0] * rows, [0] * rows
+        queens, free = [0] * rows, [0] * rows
+        columns[0], left[0], right[0] = board
+        free[0] = self.get_free(*board)
+        depth = 0
+        while depth >= 0:
+            if not free[depth]:  # backtrack
+                depth -= 1
+                continue
+
+            bit = free[depth] & -free[depth]  # lowest free column
+            free[depth] ^= bit
+            queens[depth] = bit
+
+            if depth == rows - 1:
+                yield prefix + tuple(queen.bit_length() - 1 for queen in queens)
+                continue
+
+            columns[depth + 1] = columns[depth] | bit
+            left[depth + 1] = ((left[depth] | bit) << 1) & self.full
+            right[depth + 1] = (right[depth] | bit) >> 1
+            free[depth + 1] = self.get_free(
+                columns[depth + 1], left[depth + 1], right[depth + 1]
+            )
+            depth += 1
+
+    def iter_solutions(self, table_size, workers=1):
+        """Lazily generates solutions, in same format and order as solve
+
+        :param table_size: Size of table
+        :param workers: number of processes (None for number of cores)
+        :return: generator of lists of (row, column), both from 1
+        """
+
+        for solution in self.iter_columns(table_size, workers=workers):
+            yield [(row + 1, column + 1) for row, column in enumerate(solution)]
+
+    def solve(self, table_size, workers=1):
         """Solves problem
 
         :param table_size: Size of table
+        :param workers: number of processes (None for number of cores)
         :return: List of possible solutions
         """
-        if table_size == 0:
-            return [[]]
-
-        smaller_solutions = self.solve(table_size - 1)
-        solutions = []
-        for solution in smaller_solutions:
-            for column in range(1, self.board_size + 1):
-                # try adding a new queen to row = n, column = column
-                if not self.under_attack(column, solution):
-                    solutions.append(solution + [(table_size, column)])
-        return solutions
+
+        return list(self.iter_solutions(table_size, workers))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Pools of threads and processes shared by the whole library """
+
+import atexit
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+def get_workers(workers=None):
+    return workers if workers is not None else (os.cpu_count() or 1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor(workers):
+    """Gets pool of threads (shared by all callers with same size), shut
+    down at exit
+
+    :param workers: number of threads
+    :return: ThreadPoolExecutor
+    """
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    atexit.register(executor.shutdown)
+    return executor
+
+
+@functools.lru_cache(maxsize=None)
+def get_process_executor(workers):
+    """Gets pool of processes (shared by all callers with same size), for
+    pure-Python work that would hold the GIL. Workers are shut down at exit
+
+    :param workers: number of processes
+    :return: ProcessPoolExecutor
+    """
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    atexit.register(executor.shutdown)
+    return executor
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+"""Runs benchmarks: python -m hal.profile --help """
+
+from hal.profile.benchmark import main
+
+if __name__ == '__main__':
+    main()
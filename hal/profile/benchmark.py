@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+"""Headless, reproducible benchmarks: registered workloads are timed with
+warmup and repeats, results (with machine info) are saved as JSON """
+
+import argparse
+import contextlib
+import fnmatch
+import gc
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from hal.help import BugReporter
+from hal.profile.store import ResultStore
+
+BENCHMARKS = {}  # name -> Benchmark
+CLOCKS = {
+    'wall': time.perf_counter,  # elapsed time, highest resolution
+    'cpu': time.process_time,  # CPU time of this process (no sleep)
+}
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+DEFAULT_MODULES = ['hal.profile.performance']  # modules registering benchmarks
+
+
+class Benchmark:
+    """Workload to time"""
+
+    def __init__(self, name, function, params, setup=None, teardown=None):
+        """
+        :param name: name of benchmark
+        :param function: function(**inputs) to time
+        :param params: default params
+        :param setup: function(**params) creating inputs (untimed, once per
+            run of benchmark), None to use params as inputs
+        :param teardown: function(inputs) releasing inputs (temp files ...)
+        """
+
+        self.name = name
+        self.function = function
+        self.params = params
+        self.setup = setup
+        self.teardown = teardown
+
+    def get_inputs(self, params):
+        return params if self.setup is None else self.setup(**params)
+
+    def get_params(self, **params):
+        """Gets params of a run
+
+        :param params: params to override (unknown ones are ignored)
+        :return: dict of params
+        """
+
+        return {
+            key: params.get(key, value)
+            for key, value in self.params.items()
+        }
+
+
+def register_benchmark(name, setup=None, teardown=None, **params):
+    """Registers function as benchmark (decorator)
+
+    :param name: name of benchmark
+    :param setup: function(**params) creating inputs of function (untimed)
+    :param teardown: function(inputs) releasing inputs
+    :param params: default params (of setup if given, else of function)
+    :return: decorator (function is returned unchanged)
+    """
+
+    def decorator(function):
+        BENCHMARKS[name] = Benchmark(name, function, params, setup, teardown)
+        return function
+
+    return decorator
+
+
+def register_sizes(name, sizes, setup=None, teardown=None):
+    """Registers function as one benchmark for each size (decorator)
+
+    :param name: name of benchmarks, named name[size label]
+    :param sizes: size label -> params
+    :param setup: function(**params) creating inputs
+    :param teardown: function(inputs) releasing inputs
+    :return: decorator (function is returned unchanged)
+    """
+
+    def decorator(function):
+        for label, params in sizes.items():
+            register_benchmark(
+                '{}[{}]'.format(name, label), setup, teardown, **params
+            )(function)
+        return function
+
+    return decorator
+
+
+def get_benchmark_names(patterns):
+    """Gets names of registered benchmarks matching patterns
+
+    :param patterns: names, or shell-style patterns (e.g 'la.*')
+    :return: sorted list of names
+    """
+
+    names = set()
+    for pattern in patterns:
+        matches = fnmatch.filter(BENCHMARKS, pattern)
+        if not matches:
+            raise ValueError('Unknown benchmark: {}'.format(pattern))
+
+        names.update(matches)
+
+    return sorted(names)
+
+
+def get_stats(timings):
+    """Gets statistics of timings
+
+    :param timings: list of seconds
+    :return: dict of statistics
+    """
+
+    timings = np.asarray(timings, dtype=float)
+    return {
+        'min': float(timings.min()),
+        'max': float(timings.max()),
+        'mean': float(timings.mean()),
+        'median': float(np.median(timings)),
+        'p95': float(np.percentile(timings, 95)),
+        'stddev': float(timings.std(ddof=1)) if len(timings) > 1 else 0.0,
+    }
+
+
+def get_machine_info():
+    """Gets info about machine running benchmarks
+
+    :return: dict with platform (of bug reports), hardware, Python and PyHal
+        versions
+    """
+
+    report = BugReporter.get_bug_report()
+    report['platform'].update({
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    })
+    return report
+
+
+class BenchmarkRunner:
+    """Runs benchmarks without user interaction"""
+
+    def __init__(self, warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS):
+        """
+        :param warmup: untimed runs before timed ones (caches, imports ...)
+        :param repeats: timed runs
+        """
+
+        if repeats < 1:
+            raise ValueError('Benchmarks need at least 1 timed run')
+
+        self.warmup = warmup
+        self.repeats = repeats
+
+    def time(self, function, params):
+        """Times single run of function. Garbage is collected before, and
+        collector is paused during run (as timeit does)
+
+        :param function: function to time
+        :param params: params of function
+        :return: dict of seconds, one for each clock
+        """
+
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            starts = {name: clock() for name, clock in CLOCKS.items()}
+            function(**params)
+            return {
+                name: clock() - starts[name] for name, clock in CLOCKS.items()
+            }
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def run(self, benchmark, **params):
+        """Runs benchmark
+
+        :param benchmark: Benchmark, or name of registered one
+        :param params: params to override
+        :return: dict with name, params, timings and their statistics
+        """
+
+        if not isinstance(benchmark, Benchmark):
+            if benchmark not in BENCHMARKS:
+                raise ValueError('Unknown benchmark: {}'.format(benchmark))
+
+            benchmark = BENCHMARKS[benchmark]
+
+        params = benchmark.get_params(**params)
+        inputs = benchmark.get_inputs(params)
+        try:
+            for _ in range(self.warmup):
+                benchmark.function(**inputs)
+
+            runs = [
+                self.time(benchmark.function, inputs)
+                for _ in range(self.repeats)
+            ]
+        finally:
+            if benchmark.teardown is not None:
+                benchmark.teardown(inputs)
+
+        timings = {name: [run[name] for run in runs] for name in CLOCKS}
+
+        return {
+            'name': benchmark.name,
+            'params': params,
+            'warmup': self.warmup,
+            'repeats': self.repeats,
+            'timings': timings,
+            'stats': {
+                name: get_stats(clock_timings)
+                for name, clock_timings in timings.items()
+            },
+        }
+
+    def run_all(self, names=None, **params):
+        """Runs many benchmarks
+
+        :param names: names of registered benchmarks (None for all)
+        :param params: params to override (each benchmark takes its own)
+        :return: report: dict with machine info and results
+        """
+
+        names = sorted(BENCHMARKS) if names is None else names
+        return {
+            'machine': get_machine_info(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'warmup': self.warmup,
+            'repeats': self.repeats,
+            'benchmarks': [self.run(name, **params) for name in names],
+        }
+
+
+def save_report(report, path):
+    """Saves report as JSON
+
+    :param report: report of BenchmarkRunner.run_all
+    :param path: path of output file
+    """
+
+    with open(path, 'w') as writer:
+        json.dump(report, writer, sort_keys=True, indent=2)
+
+
+def parse_param(string):
+    """Parses param from command line
+
+    :param string: key=value (value is parsed as JSON if possible)
+    :return: key, value
+    """
+
+    key, _, value = string.partition('=')
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def create_args():
+    parser = argparse.ArgumentParser(
+        description='Runs benchmarks and prints (or saves) JSON report'
+    )
+    parser.add_argument('names', nargs='*',
+                        help='benchmarks to run, or patterns like \'la.*\' '
+                             '(default: all)')
+    parser.add_argument('-w', '--warmup', type=int, default=DEFAULT_WARMUP,
+                        help='untimed runs of each benchmark')
+    parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS,
+                        help='timed runs of each benchmark')
+    parser.add_argument('-p', '--param', action='append', default=[],
+                        type=parse_param, metavar='KEY=VALUE',
+                        help='param of benchmarks, e.g size=10')
+    parser.add_argument('-m', '--module', action='append', default=[],
+                        help='module registering more benchmarks')
+    parser.add_argument('-o', '--output', help='JSON file (default: stdout)')
+    parser.add_argument('-s', '--store',
+                        help='also save report in this database (see '
+                             'hal.profile.store)')
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='list benchmarks and exit')
+    return parser
+
+
+def main(args=None):
+    """Command line entry point
+
+    :param args: list of arguments (None for sys.argv)
+    :return: report (None if just listing benchmarks)
+    """
+
+    args = create_args().parse_args(args)
+    for module in DEFAULT_MODULES + args.module:
+        importlib.import_module(module)  # registers its benchmarks
+
+    if args.list:
+        for name in sorted(BENCHMARKS):
+            print(name, json.dumps(BENCHMARKS[name].params, sort_keys=True))
+        return None
+
+    runner = BenchmarkRunner(args.warmup, args.repeats)
+    with contextlib.redirect_stdout(sys.stderr):  # keep report clean
+        names = get_benchmark_names(args.names) if args.names else None
+        report = runner.run_all(names, **dict(args.param))
+    if args.store:
+        with ResultStore(args.store) as store:
+            store.save(report)
+
+    if args.output:
+        save_report(report, args.output)
+    else:
+        json.dump(report, sys.stdout, sort_keys=True, indent=2)
+        print()
+
+    return report
@@ -6,10 +6,12 @@ import getpass
 import os
 import random
 import sys
+import time
 
 from hal.files.models.files import Document
 from hal.maths.problems import EightQueen
 # todo use logging
+from hal.profile.benchmark import register_benchmark
 from hal.profile.models import Timer
 
 INTRO = "So, let\'s get into the details.. I\'m going to solve the " \
@@ -29,14 +31,29 @@ INTRO = "So, let\'s get into the details.. I\'m going to solve the " \
         "PC speed! Now let\'s get started.. "
 
 
+@register_benchmark('eight_queen', size=8, workers=1)
+def solve_eight_queen(size, workers):
+    """Finds all solutions of eight-queen problem
+
+    :param size: size of board
+    :param workers: number of processes (None for number of cores)
+    """
+
+    EightQueen(size).solve(size, workers=workers)
+
+
 class EightQueenTest:
-    """Test CPU by solving eight-queen problem"""
+    """Test CPU by solving eight-queen problem. Interactive: see
+    hal.profile.benchmark for headless (and repeated) runs"""
 
-    def __init__(self, size):
+    def __init__(self, size, workers=1):
         """
         :param size: size of test
+        :param workers: number of processes solving problem (None for number
+            of cores): tests all cores of CPU
         """
         self.size = size
+        self.workers = workers
         self.benchmark = ""
 
     @staticmethod
@@ -62,18 +79,16 @@ class EightQueenTest:
         """
         return INTRO
 
-    def run_test(self):
+    def run_test(self, size=None):
         """Runs test
 
+        :param size: size of board (None for size of test)
         :return: Time to solve problem with given size
         """
-        timer = Timer()
-
-        with timer:
-            problem = EightQueen(self.size)
-            problem.solve(problem.board_size)
-
-        return timer.elapsed_time()
+        size = self.size if size is None else size
+        start = time.perf_counter()
+        solve_eight_queen(size, self.workers)
+        return time.perf_counter() - start
 
     def update_std_out_and_log(self, string):
         """Prints to stdout and updates log
@@ -100,7 +115,7 @@ class EightQueenTest:
         timer = Timer()
         with timer:
             for size in range(max_board_size + 1):
-                timing = self.run_test()
+                timing = self.run_test(size)
                 self.update_std_out_and_log(
                     "BOARD SIZE".ljust(10) +
                     str(size).ljust(10) + "TIME REQUIRED (s)".ljust(20) +
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+"""Stores benchmark reports in SQLite, compares runs to find regressions """
+
+import argparse
+import json
+import sqlite3
+import sys
+
+import numpy as np
+from scipy.stats import mannwhitneyu
+
+from hal.hashes.md5 import string_to_md5
+from hal.streams.pretty_table import SqlTable
+
+DEFAULT_STORE = 'pyhal_benchmarks.sqlite'
+DEFAULT_THRESHOLD = 0.05  # relative change of median to care about
+DEFAULT_ALPHA = 0.05  # significance level of Mann-Whitney U test
+DEFAULT_CLOCK = 'wall'
+
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+PARAMS_CHANGED = 'params changed'
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS runs ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, version TEXT, '
+    'build TEXT, host TEXT, machine TEXT)',
+    'CREATE TABLE IF NOT EXISTS results ('
+    'run_id INTEGER REFERENCES runs(id), name TEXT, params TEXT, '
+    'timings TEXT)',
+    'CREATE INDEX IF NOT EXISTS results_run ON results (run_id)',
+]
+
+
+def get_host_fingerprint(machine_info):
+    """Gets short id of machine
+
+    :param machine_info: machine info of report (see get_machine_info)
+    :return: hash of platform info
+    """
+
+    platform_info = json.dumps(machine_info['platform'], sort_keys=True)
+    return string_to_md5(platform_info)[:12]
+
+
+class ResultStore:
+    """Benchmark reports saved in SQLite: each report is a run, keyed by
+    PyHal version, build and host"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        """
+        :param path: path of database file (':memory:' for a temporary one)
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def save(self, report):
+        """Saves report
+
+        :param report: report of BenchmarkRunner.run_all
+        :return: id of run
+        """
+
+        machine = report['machine']
+        with self.connection:  # single transaction
+            cursor = self.connection.execute(
+                'INSERT INTO runs (timestamp, version, build, host, machine) '
+                'VALUES (?, ?, ?, ?, ?)', (
+                    report['timestamp'], machine['pyhal']['version'],
+                    machine['pyhal']['build'], get_host_fingerprint(machine),
+                    json.dumps(machine, sort_keys=True)
+                )
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO results (run_id, name, params, timings) '
+                'VALUES (?, ?, ?, ?)', [
+                    (
+                        run_id, result['name'],
+                        json.dumps(result['params'], sort_keys=True),
+                        json.dumps(result['timings'])
+                    ) for result in report['benchmarks']
+                ]
+            )
+
+        return run_id
+
+    def get_runs(self, version=None, build=None, host=None):
+        """Gets runs, oldest first
+
+        :param version: PyHal version (None for any)
+        :param build: PyHal build (None for any)
+        :param host: host fingerprint (None for any)
+        :return: list of dict with id, timestamp, version, build, host
+        """
+
+        filters = {'version': version, 'build': build, 'host': host}
+        filters = {key: value for key, value in filters.items() if value}
+        query = 'SELECT id, timestamp, version, build, host FROM runs'
+        if filters:
+            query += ' WHERE ' + ' AND '.join(
+                '{} = ?'.format(key) for key in filters
+            )
+
+        rows = self.connection.execute(query + ' ORDER BY id', list(filters.values()))
+        labels = ['id', 'timestamp', 'version', 'build', 'host']
+        return [dict(zip(labels, row)) for row in rows]
+
+    def get_results(self, run_id):
+        """Gets results of run
+
+        :param run_id: id of run
+        :return: dict: name of benchmark -> dict with params and timings
+        """
+
+        rows = self.connection.execute(
+            'SELECT name, params, timings FROM results WHERE run_id = ?',
+            (run_id, )
+        )
+        return {
+            name: {'params': json.loads(params), 'timings': json.loads(timings)}
+            for name, params, timings in rows
+        }
+
+
+def compare_results(baseline, candidate, threshold=DEFAULT_THRESHOLD,
+                    alpha=DEFAULT_ALPHA, clock=DEFAULT_CLOCK):
+    """Compares timings of benchmarks of two runs. A change counts when
+    medians differ by more than threshold and timings are significantly
+    different (two-sided Mann-Whitney U test): with few repeats (< 4 each)
+    no change is ever significant at alpha = 0.05
+
+    :param baseline: results of run (see ResultStore.get_results)
+    :param candidate: results of run to check
+    :param threshold: relative change of median to care about
+    :param alpha: significance level
+    :param clock: clock of timings ('wall' or 'cpu')
+    :return: list of dict with name, medians, change, p-value and status,
+        for benchmarks in both runs
+    """
+
+    comparisons = []
+    for name in sorted(set(baseline) & set(candidate)):
+        old = baseline[name]['timings'][clock]
+        new = candidate[name]['timings'][clock]
+        old_median = float(np.median(old))
+        new_median = float(np.median(new))
+
+        change = new_median / old_median - 1 if old_median > 0 else 0.0
+        p_value = float(mannwhitneyu(new, old, alternative='two-sided').pvalue)
+
+        if baseline[name]['params'] != candidate[name]['params']:
+            status = PARAMS_CHANGED
+        elif p_value < alpha and change > threshold:
+            status = REGRESSION
+        elif p_value < alpha and change < -threshold:
+            status = IMPROVEMENT
+        else:
+            status = UNCHANGED
+
+        comparisons.append({
+            'name': name,
+            'baseline': old_median,
+            'candidate': new_median,
+            'change': change,
+            'p_value': p_value,
+            'status': status,
+        })
+
+    return comparisons
+
+
+def get_comparison_table(comparisons):
+    labels = ['benchmark', 'baseline (s)', 'candidate (s)', 'change', 'p-value',
+              'status']
+    rows = [
+        [
+            comparison['name'], '{:.6f}'.format(comparison['baseline']),
+            '{:.6f}'.format(comparison['candidate']),
+            '{:+.1%}'.format(comparison['change']),
+            '{:.4f}'.format(comparison['p_value']), comparison['status']
+        ] for comparison in comparisons
+    ]
+    return SqlTable(labels, rows, '{:.6f}', '\n')
+
+
+def find_run(store, run_id=None, version=None, build=None, host=None,
+             back=1):
+    """Finds run
+
+    :param store: ResultStore
+    :param run_id: id of run (if given, filters are ignored)
+    :param version: PyHal version (None for any)
+    :param build: PyHal build (None for any)
+    :param host: host fingerprint (None for any)
+    :param back: 1 for latest matching run, 2 for previous one ...
+    :return: id of run
+    """
+
+    if run_id is not None:
+        return run_id
+
+    runs = store.get_runs(version, build, host)
+    if len(runs) < back:
+        raise ValueError('No such run in {}'.format(store.path))
+
+    return runs[-back]['id']
+
+
+def create_args():
+    parser = argparse.ArgumentParser(
+        description='Lists stored benchmark runs, compares them'
+    )
+    parser.add_argument('-s', '--store', default=DEFAULT_STORE,
+                        help='database file')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    runs = commands.add_parser('runs', help='list runs')
+    runs.add_argument('--host', help='host fingerprint')
+
+    compare = commands.add_parser(
+        'compare', help='compare runs (default: latest 2 of latest host); '
+                        'exit code is 1 if there are regressions'
+    )
+    compare.add_argument('baseline', nargs='?', type=int, help='id of run')
+    compare.add_argument('candidate', nargs='?', type=int, help='id of run')
+    compare.add_argument('--baseline-version', help='latest run of version')
+    compare.add_argument('--candidate-version', help='latest run of version')
+    compare.add_argument('--host', help='host fingerprint')
+    compare.add_argument('-t', '--threshold', type=float,
+                         default=DEFAULT_THRESHOLD,
+                         help='relative change of median to care about')
+    compare.add_argument('-a', '--alpha', type=float, default=DEFAULT_ALPHA,
+                         help='significance level')
+    compare.add_argument('-c', '--clock', default=DEFAULT_CLOCK,
+                         choices=['wall', 'cpu'])
+    return parser
+
+
+def main(args=None):
+    """Command line entry point
+
+    :param args: list of arguments (None for sys.argv)
+    :return: runs, or comparisons
+    """
+
+    args = create_args().parse_args(args)
+    with ResultStore(args.store) as store:
+        if args.command == 'runs':
+            runs = store.get_runs(host=args.host)
+            for run in runs:
+                print(json.dumps(run, sort_keys=True))
+            return runs
+
+        host = args.host
+        if host is None and store.get_runs():
+            host = store.get_runs()[-1]['host']  # latest one
+
+        same_version = args.baseline_version == args.candidate_version
+        candidate = find_run(store, args.candidate, args.candidate_version,
+                             host=host)
+        baseline = find_run(store, args.baseline, args.baseline_version,
+                            host=host, back=2 if same_version else 1)
+
+        comparisons = compare_results(
+            store.get_results(baseline), store.get_results(candidate),
+            args.threshold, args.alpha, args.clock
+        )
+
+    print('Run {} -> run {}'.format(baseline, candidate))
+    print(get_comparison_table(comparisons))
+    if any(comparison['status'] == REGRESSION for comparison in comparisons):
+        sys.exit(1)
+
+    return comparisons
+
+
+if __name__ == '__main__':
+    main()
@@ -58,5 +58,11 @@ setup(
     long_description=DESCRIPTION,
     keywords="hal library general-purpose",
     url=VERSION["url"],
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks", "benchmarks.*"]),
+    entry_points={
+        "console_scripts": [
+            "pyhal-benchmark = hal.profile.benchmark:main",
+            "pyhal-benchmark-store = hal.profile.store:main",
+        ]
+    },
 )
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.algorithms.iterative.utils implementation"""
+
+import numpy as np
+import pytest
+
+from hal.algorithms.iterative.utils import is_toll_enough, are_toll_enough, \
+    TollChecker
+from hal.maths.la.matrix import Matrix
+from hal.maths.la.utils import L2_NORM, LINFINITE_NORM, COMPONENT_NORM
+
+
+def loop_toll_enough(X, X_real, rel_toll, abs_toll, norm):
+    """Column by column reference of are_toll_enough
+
+    :return: list of booleans
+    """
+
+    checks = []
+    for x, x_real in zip(X.T, X_real.T):
+        if norm == COMPONENT_NORM:
+            checks.append(all(
+                abs(a - b) < rel_toll * abs(b) + abs_toll
+                for a, b in zip(x, x_real)
+            ))
+        else:
+            order = 2 if norm == L2_NORM else np.inf
+            error = np.linalg.norm(x - x_real, order)
+            checks.append(error < rel_toll * np.linalg.norm(x_real, order) + abs_toll)
+
+    return checks
+
+
+def test_is_toll_enough():
+    """Tests hal.algorithms.iterative.utils.is_toll_enough method"""
+
+    x = Matrix(np.array([1.0, 1.0]))
+
+    assert is_toll_enough(x, Matrix(np.array([1.0, 1.1])), 0, 0.2)
+    assert not is_toll_enough(x, Matrix(np.array([1.0, 1.3])), 0, 0.2)
+    assert not is_toll_enough(None, x, 0, 1)
+
+
+class TestTollChecker:
+    """Tests TollChecker class"""
+
+    @staticmethod
+    def test_check():
+        """Tests hal.algorithms.iterative.utils.TollChecker.check method"""
+
+        state = np.random.RandomState(0)
+        X_real = state.uniform(-1, 1, size=(20, 6))
+        X = X_real + state.uniform(-1, 1, size=X_real.shape) * \
+            np.logspace(-6, 0, 6)  # some converged, some not
+
+        for norm in [L2_NORM, LINFINITE_NORM, COMPONENT_NORM]:
+            checker = TollChecker(1e-3, 1e-4, norm)
+            expected = loop_toll_enough(X, X_real, 1e-3, 1e-4, norm)
+            checks = checker.check(X, X_real)
+
+            assert list(checks) == expected
+            assert 0 < sum(checks) < 6
+            assert list(checker.check(X[:, 2:], X_real[:, 2:])) == expected[2:]
+            assert checker.check(X[:, 0], X_real[:, 0]) == expected[0]
+
+    @staticmethod
+    def test_unknown_norm():
+        """Tests hal.algorithms.iterative.utils.TollChecker with unknown norm"""
+
+        with pytest.raises(ValueError):
+            TollChecker(0, 1, 'l3')
+
+
+def test_are_toll_enough():
+    """Tests hal.algorithms.iterative.utils.are_toll_enough method"""
+
+    X_real = np.ones((3, 2))
+    X = np.array([[1.0, 1.0], [1.0, 2.0], [1.0, 1.0]])
+
+    assert list(are_toll_enough(X, X_real, 0, 0.5)) == [True, False]
+    assert list(are_toll_enough(X, X, 0, 0)) == [False, False]  # strict
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.combo.utils implementation"""
+
+import types
+
+import numpy as np
+import pytest
+
+from hal.maths.combo.utils import recursive_set, get_items, get_superset, \
+    count_superset, rank_superset, unrank_superset, get_superset_blocks
+
+CASES = [(range(3), 3), ('abca', 2), (range(10), 4), ([5, 2, 9], 1)]
+
+
+def test_get_items():
+    """Tests hal.maths.combo.utils.get_items method"""
+
+    assert get_items('abca') == ['a', 'b', 'c']
+    assert get_items(['z', 'y', 'z', 'x']) == ['z', 'y', 'x']
+    assert get_items([5, 2, 9, 2]) == [5, 2, 9]
+    assert rank_superset('ba', ['b', 'a']) == 1  # 'b' is digit 0
+
+
+def test_get_superset():
+    """Tests hal.maths.combo.utils.get_superset method"""
+
+    for iterable, length in CASES:
+        expected = recursive_set(get_items(iterable), length)
+        sets = get_superset(iterable, length)
+
+        assert isinstance(sets, types.GeneratorType)
+        assert list(sets) == expected
+
+        for start in [1, 5, len(expected) - 1, len(expected) + 3]:  # shards
+            sets = get_superset(iterable, length, start, start + 7)
+            assert list(sets) == expected[start:start + 7]
+
+    sets = get_superset(range(10), 100)  # nothing is materialized
+    assert next(sets) == [0] * 100
+
+
+def test_count_superset():
+    """Tests hal.maths.combo.utils.count_superset method"""
+
+    for iterable, length in CASES:
+        assert count_superset(iterable, length) == \
+            len(recursive_set(get_items(iterable), length))
+
+    assert count_superset(range(10), 100) == 10 ** 100
+
+
+def test_rank_superset():
+    """Tests hal.maths.combo.utils.rank_superset and unrank_superset methods"""
+
+    for iterable, length in CASES:
+        for rank, subset in enumerate(get_superset(iterable, length)):
+            assert rank_superset(iterable, subset) == rank
+            assert unrank_superset(iterable, length, rank) == subset
+
+    with pytest.raises(ValueError):
+        unrank_superset(range(3), 2, 9)
+
+
+def test_get_superset_blocks():
+    """Tests hal.maths.combo.utils.get_superset_blocks method"""
+
+    for iterable, length in CASES:
+        if isinstance(iterable, str):
+            continue
+
+        expected = np.array(list(get_superset(iterable, length)))
+        blocks = list(get_superset_blocks(iterable, length, 4))
+
+        assert all(len(block) <= 4 for block in blocks)
+        assert np.array_equal(np.concatenate(blocks), expected)
+
+        blocks = list(get_superset_blocks(iterable, length, 4, 2, 9))
+        assert np.array_equal(np.concatenate(blocks), expected[2:9])
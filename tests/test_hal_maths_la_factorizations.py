@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.factorizations implementation"""
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la.factorizations import get_permutation_sign, factorize, \
+    LUFactorization, CholeskyFactorization
+
+STATE = np.random.RandomState(0)
+A = STATE.uniform(-1, 1, size=(8, 8)) + 4 * np.eye(8)
+SPD = np.dot(A, A.T) + np.eye(8)
+B = STATE.uniform(-1, 1, size=(8, 3))
+
+
+def test_get_permutation_sign():
+    """Tests hal.maths.la.factorizations.get_permutation_sign method"""
+
+    assert get_permutation_sign([0, 1, 2, 3]) == 1
+    assert get_permutation_sign([1, 0, 2, 3]) == -1
+    assert get_permutation_sign([1, 2, 0, 3]) == 1
+    assert get_permutation_sign([3, 2, 1, 0]) == 1
+    assert get_permutation_sign([1, 2, 3, 0]) == -1
+
+
+def test_factorize():
+    """Tests hal.maths.la.factorizations.factorize method"""
+
+    assert isinstance(factorize(SPD, symmetric=True), CholeskyFactorization)
+    assert isinstance(factorize(-SPD, symmetric=True), LUFactorization)
+    assert isinstance(factorize(A), LUFactorization)
+    assert isinstance(factorize(scipy.sparse.csr_matrix(SPD), True), LUFactorization)
+
+
+class TestLUFactorization:
+    """Tests LUFactorization class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.factorizations.LUFactorization.solve method"""
+
+        for matrix in [A, scipy.sparse.csr_matrix(A)]:
+            factorization = LUFactorization(matrix)
+
+            assert np.allclose(factorization.solve(B), np.linalg.solve(A, B))
+            assert np.allclose(
+                factorization.solve(B, transposed=True), np.linalg.solve(A.T, B)
+            )
+
+    @staticmethod
+    def test_determinant():
+        """Tests hal.maths.la.factorizations.LUFactorization.determinant method"""
+
+        for matrix in [A, -A[::-1], SPD]:
+            expected = np.linalg.det(matrix)
+
+            assert np.isclose(LUFactorization(matrix).determinant(), expected)
+            assert np.isclose(
+                LUFactorization(scipy.sparse.csr_matrix(matrix)).determinant(),
+                expected
+            )
+
+
+class TestCholeskyFactorization:
+    """Tests CholeskyFactorization class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.factorizations.CholeskyFactorization.solve method"""
+
+        factorization = CholeskyFactorization(SPD)
+
+        assert np.allclose(factorization.solve(B), np.linalg.solve(SPD, B))
+
+    @staticmethod
+    def test_determinant():
+        """Tests hal.maths.la.factorizations.CholeskyFactorization.determinant method"""
+
+        expected = np.linalg.det(SPD)
+
+        assert np.isclose(CholeskyFactorization(SPD).determinant(), expected)
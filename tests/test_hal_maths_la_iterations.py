@@ -0,0 +1,645 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.iterations implementation"""
+
+import os
+import tempfile
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la import matrix as matrix_module
+from hal.maths.la.matrix import LinearSystemMatrix, load_memmap
+from hal.maths.la.iterations import DirectSolver, JacobiSolver, GaussSiedelSolver, \
+    SORSolver, ConjugateGradientMethodSolver, PreconditionedConjugateGradientMethodSolver, \
+    GMRESSolver, BiCGSTABSolver, GradientMethodSolver, ParallelJacobiSolver, \
+    RedBlackSORSolver, RedBlackGaussSiedelSolver
+from hal.maths.la.operators import LinearOperator
+from hal.maths.la.preconditioners import JacobiPreconditioner, \
+    SSORPreconditioner, IncompleteCholeskyPreconditioner
+
+ABS_TOLL = 1e-10
+REL_TOLL = 0
+
+
+def get_spd_system(size=30):
+    """Gets symmetric, definite positive and diagonally dominant system
+
+    :param size: number of unknowns
+    :return: A, b
+    """
+
+    state = np.random.RandomState(0)
+    A = 4 * np.eye(size) - np.eye(size, k=1) - np.eye(size, k=-1) \
+        - 0.5 * np.eye(size, k=5) - 0.5 * np.eye(size, k=-5)
+    b = state.uniform(-1, 1, size=size)
+    return A, b
+
+
+def get_non_symmetric_system(size=30, advection=1.5):
+    """Gets non-symmetric system (1D advection-diffusion, central
+    differences): not diagonally dominant when advection > 1
+
+    :param size: number of unknowns
+    :param advection: strength of advection
+    :return: A, b
+    """
+
+    state = np.random.RandomState(0)
+    A = 2 * np.eye(size) - (1 + advection) * np.eye(size, k=-1) \
+        - (1 - advection) * np.eye(size, k=1)
+    b = state.uniform(-1, 1, size=size)
+    return A, b
+
+
+def get_stencil_operator(size=30):
+    """Gets matrix-free operator of get_spd_system matrix
+
+    :param size: number of unknowns
+    :return: LinearOperator
+    """
+
+    def matvec(x):
+        y = 4 * x
+        y[1:] -= x[:-1]
+        y[:-1] -= x[1:]
+        y[5:] -= 0.5 * x[:-5]
+        y[:-5] -= 0.5 * x[5:]
+        return y
+
+    return LinearOperator((size, size), matvec, diagonal=4 * np.ones(size))
+
+
+def assert_solves(solver, A, b):
+    """Asserts solver finds solution of system
+
+    :param solver: solver
+    :param A: matrix
+    :param b: right-hand side
+    :return: number of iterations
+    """
+
+    it_counter = solver.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL).iterations
+    x = solver.get_solution().to_numpy().ravel()
+
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+    return it_counter
+
+
+class TestDirectSolver:
+    """Tests DirectSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.DirectSolver.solve method"""
+
+        A, b = get_spd_system()
+        for matrix in [A, scipy.sparse.csr_matrix(A)]:
+            solver = DirectSolver(matrix, b)
+            solver.solve()
+            x = solver.get_solution().to_numpy().ravel()
+
+            assert np.allclose(x, np.linalg.solve(A, b))
+
+            other = DirectSolver(solver.A, 2 * b)  # reuses factorization
+            other.solve()
+            x = other.get_solution().to_numpy().ravel()
+
+            assert np.allclose(x, np.linalg.solve(A, 2 * b))
+            assert other.A.get_factorization() is solver.A.get_factorization()
+
+    @staticmethod
+    def test_solve_many():
+        """Tests hal.maths.la.iterations.DirectSolver.solve_many method"""
+
+        A, b = get_spd_system()
+        B = np.column_stack([b, 2 * b, -b])
+        solver = DirectSolver(A, b)
+        report = solver.solve_many(B)
+        X = solver.get_solution().to_numpy()
+
+        assert np.allclose(X, np.linalg.solve(A, B))
+        assert np.all(report.converged)
+        assert np.allclose(report.residuals[-1], 0)
+
+
+class TestJacobiSolver:
+    """Tests JacobiSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.JacobiSolver.solve method"""
+
+        A, b = get_spd_system()
+        assert_solves(JacobiSolver(A, b), A, b)
+
+
+class TestParallelJacobiSolver:
+    """Tests ParallelJacobiSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.ParallelJacobiSolver.solve method"""
+
+        A, b = get_spd_system()
+        expected = assert_solves(JacobiSolver(A, b), A, b)
+
+        for matrix in [A, scipy.sparse.csr_matrix(A)]:
+            for workers in [1, 2, 4]:
+                solver = ParallelJacobiSolver(matrix, b, workers)
+
+                assert assert_solves(solver, A, b) == expected
+                assert len(solver.blocks) == workers
+
+
+class TestGaussSiedelSolver:
+    """Tests GaussSiedelSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.GaussSiedelSolver.solve method"""
+
+        A, b = get_spd_system()
+        assert_solves(GaussSiedelSolver(A, b), A, b)
+
+
+class TestSORSolver:
+    """Tests SORSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.SORSolver.solve method"""
+
+        A, b = get_spd_system()
+        gauss_seidel = assert_solves(GaussSiedelSolver(A, b), A, b)
+
+        assert assert_solves(SORSolver(A, b, 1.0), A, b) == gauss_seidel
+        assert assert_solves(SORSolver(A, b, 1.2), A, b) < gauss_seidel
+
+
+    @staticmethod
+    def test_auto_relaxation():
+        """Tests hal.maths.la.iterations.SORSolver with automatic relaxation"""
+
+        size = 30
+        A = 2 * np.eye(size) - np.eye(size, k=1) - np.eye(size, k=-1)
+        b = np.random.RandomState(0).uniform(-1, 1, size=size)
+        rho = np.cos(np.pi / (size + 1))  # of Jacobi iteration matrix
+
+        solver = SORSolver(A, b)
+        it_counter = assert_solves(solver, A, b)
+
+        assert np.isclose(solver.get_relaxation(), 2 / (1 + np.sqrt(1 - rho ** 2)))
+        assert it_counter < assert_solves(GaussSiedelSolver(A, b), A, b) / 5
+
+    @staticmethod
+    def test_auto_relaxation_is_cached():
+        """Tests hal.maths.la.iterations.SORSolver relaxation is chosen once per matrix"""
+
+        A, b = get_spd_system()
+        matrix = LinearSystemMatrix(A)
+        calls = []
+        estimate = matrix.get_jacobi_spectral_radius
+
+        def get_jacobi_spectral_radius():
+            calls.append(1)
+            return estimate()
+
+        matrix.get_jacobi_spectral_radius = get_jacobi_spectral_radius
+        solver = SORSolver(matrix, b)
+        assert_solves(solver, A, b)
+        assert_solves(SORSolver(matrix, 2 * b), A, 2 * b)
+
+        assert len(calls) == 1
+
+        matrix.mark_modified()
+        assert_solves(SORSolver(matrix, b), A, b)
+
+        assert len(calls) == 2
+
+    @staticmethod
+    def test_search_relaxation():
+        """Tests hal.maths.la.iterations.SORSolver.search_relaxation method"""
+
+        A = 0.9 * np.ones((3, 3)) + 0.1 * np.eye(3)  # Jacobi does not converge
+        b = np.array([1.0, 2.0, 3.0])
+
+        assert not LinearSystemMatrix(A).does_jacobi_converge()
+
+        gauss_seidel = assert_solves(GaussSiedelSolver(A, b), A, b)
+        solver = SORSolver(A, b)
+
+        assert assert_solves(solver, A, b) <= gauss_seidel
+        assert 0 < solver.get_relaxation() < 2
+
+        relaxations = set()  # choice does not depend on b
+        for rhs in [np.zeros(3), -3 * b, b]:
+            solver = SORSolver(A, rhs)
+            assert_solves(solver, A, rhs)
+            relaxations.add(solver.get_relaxation())
+
+        assert len(relaxations) == 1
+
+        matrix = LinearSystemMatrix(A)  # cached choice, found with b = 0
+        assert_solves(SORSolver(matrix, np.zeros(3)), A, np.zeros(3))
+
+        assert assert_solves(SORSolver(matrix, b), A, b) <= gauss_seidel
+
+
+class TestRedBlackSORSolver:
+    """Tests RedBlackSORSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.RedBlackSORSolver.solve method"""
+
+        A, b = get_spd_system()
+        gauss_seidel = assert_solves(RedBlackGaussSiedelSolver(A, b), A, b)
+
+        for matrix in [A, scipy.sparse.csr_matrix(A)]:
+            for workers in [1, 3]:
+                solver = RedBlackSORSolver(matrix, b, 1.2, workers)
+
+                assert assert_solves(solver, A, b) < gauss_seidel
+
+    @staticmethod
+    def test_get_colors():
+        """Tests hal.maths.la.iterations.RedBlackSORSolver.get_colors method"""
+
+        A = 2 * np.eye(10) - np.eye(10, k=1) - np.eye(10, k=-1)
+        b = np.ones(10)
+        solver = RedBlackGaussSiedelSolver(A, b, 2)
+        assert_solves(solver, A, b)
+
+        red, black = solver.get_colors()
+        assert list(red) == [0, 2, 4, 6, 8]
+        assert list(black) == [1, 3, 5, 7, 9]
+        assert solver.is_parallel()
+
+    @staticmethod
+    def test_dense_solve():
+        """Tests hal.maths.la.iterations.RedBlackSORSolver.solve method on
+        dense matrix (one color for each unknown)"""
+
+        state = np.random.RandomState(0)
+        A = state.uniform(0, 1, size=(20, 20))
+        A = A + A.T + 20 * np.eye(20)
+        b = state.uniform(-1, 1, size=20)
+
+        solver = RedBlackSORSolver(A, b, 1.2, 2)
+        it_counter = assert_solves(solver, A, b)
+
+        assert len(solver.get_colors()) == 20
+        assert not solver.is_parallel()
+        assert it_counter == assert_solves(SORSolver(A, b, 1.2), A, b)
+
+
+class TestGradientMethodSolver:
+    """Tests GradientMethodSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.GradientMethodSolver.solve method"""
+
+        A, b = get_spd_system()
+        assert_solves(GradientMethodSolver(A, b, 0.2), A, b)
+
+
+class TestConjugateGradientMethodSolver:
+    """Tests ConjugateGradientMethodSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.ConjugateGradientMethodSolver.solve method"""
+
+        A, b = get_spd_system()
+        solver = ConjugateGradientMethodSolver(A, b)
+        it_counter = assert_solves(solver, A, b)
+
+        assert it_counter <= len(b)
+        assert it_counter < assert_solves(JacobiSolver(A, b), A, b)
+
+    @staticmethod
+    def test_get_residuals():
+        """Tests hal.maths.la.iterations.ConjugateGradientMethodSolver.get_residuals method"""
+
+        A, b = get_spd_system()
+        solver = ConjugateGradientMethodSolver(A, b)
+        it_counter = solver.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL).iterations
+        residuals = solver.get_residuals()
+
+        assert len(residuals) == it_counter + 1
+        assert np.isclose(residuals[0], np.linalg.norm(b))
+        assert residuals[-1] < ABS_TOLL
+
+
+class TestPreconditionedConjugateGradientMethodSolver:
+    """Tests PreconditionedConjugateGradientMethodSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.PreconditionedConjugateGradientMethodSolver.solve method"""
+
+        A, b = get_spd_system()
+        plain = assert_solves(ConjugateGradientMethodSolver(A, b), A, b)
+
+        for preconditioner in [JacobiPreconditioner, SSORPreconditioner,
+                               IncompleteCholeskyPreconditioner]:
+            solver = PreconditionedConjugateGradientMethodSolver(
+                A, b, preconditioner
+            )
+            assert assert_solves(solver, A, b) <= plain
+
+        solver = PreconditionedConjugateGradientMethodSolver(
+            A, b, SSORPreconditioner(A, 1.5)
+        )
+        assert_solves(solver, A, b)
+
+
+class TestGMRESSolver:
+    """Tests GMRESSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.GMRESSolver.solve method"""
+
+        A, b = get_non_symmetric_system()
+        full = assert_solves(GMRESSolver(A, b), A, b)
+
+        assert full <= len(b)  # no restarts: exact in n steps
+        assert assert_solves(GMRESSolver(A, b, 5), A, b) >= full
+
+        A, b = get_spd_system()
+        assert_solves(GMRESSolver(A, b), A, b)
+
+    @staticmethod
+    def test_solve_not_dominant():
+        """Tests hal.maths.la.iterations.GMRESSolver.solve method when
+        stationary methods diverge"""
+
+        A, b = get_non_symmetric_system()
+        report = JacobiSolver(A, b).solve(
+            np.zeros(len(b)), ABS_TOLL, REL_TOLL, max_iterations=200
+        )
+
+        assert not report.converged
+        assert_solves(GMRESSolver(A, b, 10), A, b)
+
+
+class TestBiCGSTABSolver:
+    """Tests BiCGSTABSolver class"""
+
+    @staticmethod
+    def test_solve():
+        """Tests hal.maths.la.iterations.BiCGSTABSolver.solve method"""
+
+        for A, b in [get_non_symmetric_system(), get_non_symmetric_system(advection=0.5),
+                     get_spd_system()]:
+            assert_solves(BiCGSTABSolver(A, b), A, b)
+
+
+def test_sparse_solve():
+    """Tests hal.maths.la.iterations solvers with scipy.sparse input"""
+
+    A, b = get_spd_system()
+    sparse = scipy.sparse.csr_matrix(A)
+    solvers = [
+        (JacobiSolver, ()),
+        (GaussSiedelSolver, ()),
+        (SORSolver, (1.2, )),
+        (ConjugateGradientMethodSolver, ()),
+        (GMRESSolver, (10, )),
+        (BiCGSTABSolver, ()),
+    ]
+
+    for solver_class, args in solvers:
+        expected = assert_solves(solver_class(A, b, *args), A, b)
+        solver = solver_class(sparse, b, *args)
+
+        assert assert_solves(solver, A, b) == expected
+        assert solver.A.is_sparse()
+
+    for preconditioner in [JacobiPreconditioner, SSORPreconditioner,
+                           IncompleteCholeskyPreconditioner]:
+        expected = assert_solves(
+            PreconditionedConjugateGradientMethodSolver(A, b, preconditioner),
+            A, b
+        )
+        solver = PreconditionedConjugateGradientMethodSolver(
+            sparse, b, preconditioner
+        )
+
+        assert assert_solves(solver, A, b) == expected
+
+
+def test_matrix_free_solve():
+    """Tests hal.maths.la.iterations solvers with LinearOperator input"""
+
+    A, b = get_spd_system()
+    operator = get_stencil_operator()
+    solvers = [
+        (JacobiSolver, ()),
+        (GradientMethodSolver, (0.2, )),
+        (ConjugateGradientMethodSolver, ()),
+        (PreconditionedConjugateGradientMethodSolver, (JacobiPreconditioner, )),
+        (GMRESSolver, (10, )),
+        (BiCGSTABSolver, ()),
+    ]
+
+    for solver_class, args in solvers:
+        expected = assert_solves(solver_class(A, b, *args), A, b)
+        solver = solver_class(operator, b, *args)
+
+        assert solver.A is operator
+        assert assert_solves(solver, A, b) == expected
+
+        B = np.column_stack([b, 2 * b])
+        solver.solve_many(B, np.zeros(B.shape), ABS_TOLL, REL_TOLL)
+        assert np.allclose(solver.get_solution().to_numpy(), np.linalg.solve(A, B))
+
+
+def test_memmap_solve(monkeypatch):
+    """Tests hal.maths.la.iterations solvers with matrix on disk"""
+
+    monkeypatch.setattr(matrix_module, 'TILE_BYTES', 4 * 30 * 8)  # 4 rows
+    A, b = get_spd_system()
+    solvers = [
+        (JacobiSolver, ()),
+        (GradientMethodSolver, (0.2, )),
+        (ConjugateGradientMethodSolver, ()),
+        (GMRESSolver, (10, )),
+    ]
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'A.npy')
+        np.save(path, A)
+
+        for solver_class, args in solvers:
+            expected = assert_solves(solver_class(A, b, *args), A, b)
+            solver = solver_class(load_memmap(path), b, *args)
+
+            assert solver.A.is_memmap()
+            assert assert_solves(solver, A, b) == expected
+
+        del solver
+
+
+def test_solve_many():
+    """Tests hal.maths.la.iterations solvers solve_many method"""
+
+    A, b = get_spd_system()
+    state = np.random.RandomState(1)
+    B = np.column_stack([b, state.uniform(-1, 1, size=(len(b), 4)), 10 * b])
+    solvers = [
+        (JacobiSolver, ()),
+        (GaussSiedelSolver, ()),
+        (SORSolver, (1.2, )),
+        (ParallelJacobiSolver, (2, )),
+        (RedBlackSORSolver, (1.2, 2)),
+        (ConjugateGradientMethodSolver, ()),
+        (PreconditionedConjugateGradientMethodSolver, (SSORPreconditioner, )),
+        (GMRESSolver, (10, )),
+        (BiCGSTABSolver, ()),
+    ]
+
+    for solver_class, args in solvers:
+        solver = solver_class(A, b, *args)
+        report = solver.solve_many(B, np.zeros(B.shape), ABS_TOLL, REL_TOLL)
+        it_counters = report.iterations
+        X = solver.get_solution().to_numpy()
+
+        assert X.shape == B.shape
+        assert np.allclose(X, np.linalg.solve(A, B), atol=1e-8)
+        assert np.all(report.converged)
+
+        for column, it_counter in enumerate(it_counters):  # same as 1 by 1
+            single = solver_class(A, B[:, column], *args)
+            report = single.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL)
+            assert report.iterations == it_counter
+
+        assert np.array_equal(solver.b.to_numpy().ravel(), b)  # restored
+
+
+def test_instrumentation():
+    """Tests hal.maths.la.iterations solvers reports, iterations cap and
+    callback"""
+
+    A, b = get_spd_system()
+    B = np.column_stack([b, 2 * b])
+    solvers = [
+        JacobiSolver(A, b),
+        SORSolver(A, b, 1.2),
+        ConjugateGradientMethodSolver(A, b),
+        GMRESSolver(A, b),
+        BiCGSTABSolver(A, b),
+    ]
+
+    for solver in solvers:
+        report = solver.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL,
+                              record_residuals=True)
+
+        assert report is solver.get_report()
+        assert report.converged
+        assert len(report.residuals) == report.iterations + 1
+        assert len(report.times) == report.iterations
+        assert report.residuals[-1] < 1e-8
+
+        report = solver.solve(np.zeros(len(b)), 0, 0, max_iterations=3)
+
+        assert report.iterations == 3
+        assert not report.converged
+
+        calls = []
+
+        def callback(iteration, x, residual):
+            calls.append((iteration, x.to_numpy().shape, residual))
+            return iteration == 2  # stop
+
+        report = solver.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL,
+                              callback=callback, record_residuals=True)
+
+        assert report.iterations == 2
+        assert not report.converged
+        assert calls == [
+            (1, (len(b), 1), report.residuals[1]),
+            (2, (len(b), 1), report.residuals[2])
+        ]
+
+        report = solver.solve_many(B, np.zeros(B.shape), 0, 0, max_iterations=4,
+                                   record_residuals=True)
+
+        assert list(report.iterations) == [4, 4]
+        assert not np.any(report.converged)
+        assert len(report.residuals) == 5
+        assert len(report.residuals[-1]) == 2
+
+
+def test_residuals_opt_in(monkeypatch):
+    """Tests that stationary solvers get residuals only if asked to"""
+
+    A, b = get_spd_system()
+    solver = JacobiSolver(A, b)
+
+    def fail(x):
+        raise AssertionError('residual computed')
+
+    monkeypatch.setattr(solver, 'get_residual_norm', fail)
+    report = solver.solve(np.zeros(len(b)), ABS_TOLL, REL_TOLL)
+
+    assert report.converged
+    assert report.residuals == []
+    assert len(report.times) == report.iterations
+
+    report = JacobiSolver(A, b).solve_many(
+        np.column_stack([b, b]), np.zeros((len(b), 2)), ABS_TOLL, REL_TOLL
+    )
+
+    assert np.all(report.converged)
+    assert report.residuals == []
+
+
+def test_breakdown_instrumentation():
+    """Tests that Krylov solvers time sweeps ending in a breakdown"""
+
+    b = np.array([1.0, 0.0])
+    cases = [  # breakdown at 1st iteration (p^T A p = 0), at 2nd (omega = 0)
+        (ConjugateGradientMethodSolver, np.array([[0.0, 1.0], [1.0, 0.0]]), 0),
+        (BiCGSTABSolver, np.array([[1.0, 1.0], [1.0, 0.0]]), 1),
+    ]
+
+    for solver_class, A, it_counter in cases:
+        report = solver_class(A, b).solve_many(
+            b.reshape(-1, 1), np.zeros((2, 1)), 0, 0, max_iterations=3
+        )
+
+        assert list(report.iterations) == [it_counter]
+        assert not report.converged[0]
+        assert len(report.times) == len(report.residuals)  # + breakdown sweep
+        assert all(time >= 0 for time in report.times)
+
+
+def test_zero_rhs():
+    """Tests that Krylov solvers converge at once on exact initial guesses,
+    with relative tolerances too"""
+
+    A, b = get_spd_system()
+    B = np.column_stack([b, np.zeros(len(b))])
+
+    for solver_class in [ConjugateGradientMethodSolver, GMRESSolver,
+                         BiCGSTABSolver]:
+        solver = solver_class(A, np.zeros(len(b)))
+        report = solver.solve(np.zeros(len(b)), 0, 1e-8)
+
+        assert report.converged
+        assert report.iterations == 0
+        assert np.array_equal(solver.get_solution().to_numpy().ravel(),
+                              np.zeros(len(b)))
+
+        solver = solver_class(A, b)
+        report = solver.solve_many(B, np.zeros(B.shape), 0, 1e-10)
+        X = solver.get_solution().to_numpy()
+
+        assert np.all(report.converged)
+        assert report.iterations[1] == 0
+        assert np.allclose(X, np.linalg.solve(A, B), atol=1e-8)
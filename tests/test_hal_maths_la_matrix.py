@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.matrix implementation"""
+
+import os
+import tempfile
+
+import numpy as np
+import scipy.sparse
+
+from hal.maths.la import matrix as matrix_module
+from hal.maths.la.matrix import Matrix, LinearSystemMatrix, load_memmap, \
+    get_row_tiles, tiled_dot, tiled_rdot, get_square_tiles, tiled_is_symmetric
+
+SIZES = [1, 2, 5, 17]
+
+
+def get_random_matrices():
+    """Gets random test matrices (seeded)
+
+    :return: list of np.ndarray
+    """
+
+    state = np.random.RandomState(42)
+    return [
+        state.uniform(-10, 10, size=(size, size))
+        for size in SIZES
+    ] + [state.uniform(-10, 10, size=(3, 7))]
+
+
+def loop_lower(m):
+    """Element-wise reference of strictly lower part
+
+    :param m: matrix
+    :return: lower part
+    """
+
+    rows, cols = m.shape
+    lower = np.zeros((rows, cols))
+    for i in range(rows):
+        for j in range(min(i, cols)):
+            lower[i, j] = m[i, j]
+    return lower
+
+
+def loop_upper(m):
+    """Element-wise reference of strictly upper part
+
+    :param m: matrix
+    :return: upper part
+    """
+
+    rows, cols = m.shape
+    upper = np.zeros((rows, cols))
+    for i in range(rows):
+        for j in range(i + 1, cols):
+            upper[i, j] = m[i, j]
+    return upper
+
+
+def loop_diagonal(m):
+    """Element-wise reference of diagonal part
+
+    :param m: matrix
+    :return: diagonal part
+    """
+
+    rows, cols = m.shape
+    diagonal = np.zeros((rows, cols))
+    for i in range(min(rows, cols)):
+        diagonal[i, i] = m[i, i]
+    return diagonal
+
+
+class TestMatrix:
+    """Tests Matrix class"""
+
+    @staticmethod
+    def test_get_diagonal():
+        """Tests hal.maths.la.matrix.Matrix.get_diagonal method"""
+
+        for m in get_random_matrices():
+            if m.shape[0] == m.shape[1]:
+                assert Matrix(m).get_diagonal() == loop_diagonal(m)
+
+    @staticmethod
+    def test_get_diagonal_values():
+        """Tests hal.maths.la.matrix.Matrix.get_diagonal_values method"""
+
+        m = np.arange(9.0).reshape(3, 3)
+        matrix = Matrix(m)
+        diagonal = matrix.get_diagonal_values()
+
+        assert diagonal.tolist() == [0.0, 4.0, 8.0]
+        assert np.shares_memory(diagonal, matrix.to_numpy())  # view
+
+    @staticmethod
+    def test_get_lower():
+        """Tests hal.maths.la.matrix.Matrix.get_lower method"""
+
+        for m in get_random_matrices():
+            assert Matrix(m).get_lower() == loop_lower(m)
+
+    @staticmethod
+    def test_get_upper():
+        """Tests hal.maths.la.matrix.Matrix.get_upper method"""
+
+        for m in get_random_matrices():
+            assert Matrix(m).get_upper() == loop_upper(m)
+
+    @staticmethod
+    def test_transpose():
+        """Tests hal.maths.la.matrix.Matrix.transpose method"""
+
+        for m in get_random_matrices():
+            matrix = Matrix(m)
+            transposed = matrix.transpose()
+
+            assert transposed == m.T
+            assert np.shares_memory(transposed.to_numpy(), matrix.to_numpy())
+
+    @staticmethod
+    def test_norms():
+        """Tests hal.maths.la.matrix.Matrix norms"""
+
+        for m in get_random_matrices():
+            matrix = Matrix(m)
+            l1 = max(sum(abs(x) for x in col) for col in m.T.tolist())
+            linf = max(sum(abs(x) for x in row) for row in m.tolist())
+            eigenvalues, _ = np.linalg.eig(np.dot(m, m.T))
+            l2 = np.sqrt(np.max(np.real(eigenvalues)))
+
+            assert np.isclose(matrix.l1_norm(), l1)
+            assert np.isclose(matrix.linfinite_norm(), linf)
+            assert np.isclose(matrix.l2_norm(), l2)
+
+    @staticmethod
+    def test_check_on():
+        """Tests hal.maths.la.matrix.Matrix.check_on method"""
+
+        matrix = Matrix([[1, 2], [3, 4]])
+
+        assert matrix.check_on(lambda x: x > 0)
+        assert not matrix.check_on(lambda x: x > 1)
+        assert matrix.check_on(lambda x: x in (1, 2, 3, 4))
+        assert not matrix.check_on(lambda x: float(x) < 4)
+        assert matrix.is_definite_positive()
+        assert not Matrix([[1, -2], [3, 4]]).is_definite_positive()
+
+    @staticmethod
+    def test_is_diagonally_dominant():
+        """Tests hal.maths.la.matrix.Matrix.is_diagonally_dominant method"""
+
+        assert Matrix([[4, 1, 3], [1, 5, 3], [0, 1, 1]]).is_diagonally_dominant()
+        assert not Matrix([[4, 1, 3], [1, 5, 3], [0, 1, 1]]) \
+            .is_diagonally_dominant(strictly=True)
+        assert Matrix([[4, 1, 2], [1, 5, 3], [0, 1, 3]]) \
+            .is_diagonally_dominant(strictly=True)
+        assert not Matrix([[4, -3, -2], [1, 5, 3], [0, 1, 3]]) \
+            .is_diagonally_dominant()
+
+    @staticmethod
+    def test_eq():
+        """Tests hal.maths.la.matrix.Matrix.__eq__ method"""
+
+        matrix = Matrix([[1, 2], [3, 4]])
+
+        assert matrix == [[1, 2], [3, 4]]
+        assert matrix == Matrix(np.array([[1.0, 2.0], [3.0, 4.0]]))
+        assert not matrix == [[1, 2], [3, 5]]
+        assert not matrix == [[1, 2, 3], [3, 4, 5]]
+        assert matrix.is_symmetric() is False
+        assert Matrix([[1, 2], [2, 1]]).is_symmetric()
+
+    @staticmethod
+    def test_vectors():
+        """Tests hal.maths.la.matrix.Matrix with vectors"""
+
+        vector = Matrix([1, 2, 3])
+
+        assert vector.shape() == (1, 3)
+        assert vector.transpose().shape() == (3, 1)
+        assert np.isclose(vector.linear_norm(), np.sqrt(14))
+
+
+class TestSparseMatrix:
+    """Tests Matrix class with scipy.sparse input"""
+
+    @staticmethod
+    def get_matrices():
+        """Gets sparse matrices and their dense counterpart
+
+        :return: list of (sparse, dense)
+        """
+
+        state = np.random.RandomState(0)
+        matrices = []
+        for size in SIZES:
+            sparse = scipy.sparse.random(
+                size, size, density=0.3, format='csr', random_state=state
+            ) + scipy.sparse.eye(size, format='csr')
+            matrices.append((sparse, sparse.toarray()))
+        return matrices
+
+    @staticmethod
+    def test_stays_sparse():
+        """Tests hal.maths.la.matrix.Matrix keeps sparse storage"""
+
+        for sparse, _ in TestSparseMatrix.get_matrices():
+            matrix = LinearSystemMatrix(sparse)
+
+            assert matrix.is_sparse()
+            assert matrix.to_numpy() is sparse  # no copy
+            assert matrix.transpose().is_sparse()
+            assert all(part.is_sparse() for part in matrix.dlu_decompose())
+            assert (matrix * matrix).is_sparse()
+            assert not (matrix * np.ones((matrix.get_n_cols(), 1))).is_sparse()
+
+    @staticmethod
+    def test_parity():
+        """Tests hal.maths.la.matrix.Matrix sparse results match dense ones"""
+
+        for sparse, dense in TestSparseMatrix.get_matrices():
+            s, d = LinearSystemMatrix(sparse), LinearSystemMatrix(dense)
+
+            assert s == d
+            assert d == s
+            assert s.get_diagonal() == d.get_diagonal()
+            assert s.get_lower() == d.get_lower()
+            assert s.get_upper() == d.get_upper()
+            assert np.isclose(s.l1_norm(), d.l1_norm())
+            assert np.isclose(s.linfinite_norm(), d.linfinite_norm())
+            assert np.isclose(s.linear_norm(), d.linear_norm())
+            assert np.isclose(s.l2_norm(), d.l2_norm())
+            assert s.is_symmetric() == d.is_symmetric()
+            assert s.is_diagonally_dominant() == d.is_diagonally_dominant()
+            assert s.does_jacobi_converge() == d.does_jacobi_converge()
+            assert s.check_on(lambda x: x >= 0) == d.check_on(lambda x: x >= 0)
+            assert s.is_definite_positive() == d.is_definite_positive()
+
+    @staticmethod
+    def test_incomplete_Cholesky():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.incomplete_Cholesky with sparse input"""
+
+        size = 20
+        dense = 4 * np.eye(size) - np.eye(size, k=4) - np.eye(size, k=-4) \
+            - np.eye(size, k=1) - np.eye(size, k=-1)
+        expected = LinearSystemMatrix(dense).incomplete_Cholesky()
+        L = LinearSystemMatrix(scipy.sparse.csr_matrix(dense)).incomplete_Cholesky()
+
+        assert L.is_sparse()
+        assert np.allclose(L.to_dense().to_numpy(), expected.to_numpy())
+
+
+class TestMemmapMatrix:
+    """Tests Matrix class backed by np.memmap (out-of-core)"""
+
+    @staticmethod
+    def test_operations(monkeypatch):
+        """Tests hal.maths.la.matrix.Matrix methods streaming over tiles"""
+
+        monkeypatch.setattr(matrix_module, 'TILE_BYTES', 3 * 7 * 8)  # 3 rows
+        x = np.random.RandomState(0).uniform(-1, 1, size=(max(SIZES), 2))
+
+        with tempfile.TemporaryDirectory() as folder:
+            for m in get_random_matrices():
+                path = os.path.join(folder, 'matrix.npy')
+                np.save(path, m)
+                matrix = Matrix(load_memmap(path))
+                x_matrix = x[:m.shape[1]]
+
+                assert matrix.is_memmap()
+                assert np.allclose((matrix * x_matrix).to_numpy(), m.dot(x_matrix))
+                assert np.isclose(matrix.linear_norm(), np.linalg.norm(m))
+                assert np.isclose(matrix.l1_norm(), np.linalg.norm(m, 1))
+                assert np.isclose(matrix.linfinite_norm(), np.linalg.norm(m, np.inf))
+                assert matrix == Matrix(m)
+                assert matrix.is_symmetric() == bool(np.array_equal(m, m.T))
+
+                del matrix  # close file
+
+    @staticmethod
+    def test_raw_file():
+        """Tests hal.maths.la.matrix.load_memmap method with raw file"""
+
+        m = get_random_matrices()[2]
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'matrix.bin')
+            m.tofile(path)
+            matrix = LinearSystemMatrix(load_memmap(path, m.shape))
+
+            assert matrix.is_memmap()
+            assert np.array_equal(matrix.get_diagonal_values(), np.diag(m))
+            assert np.isclose(matrix.spectral_radius(), np.max(np.abs(np.linalg.eigvals(m))))
+
+            del matrix
+
+
+def test_get_row_tiles():
+    """Tests hal.maths.la.matrix.get_row_tiles method"""
+
+    m = np.zeros((10, 4))
+
+    assert list(get_row_tiles(m, 3 * 4 * 8)) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert list(get_row_tiles(m, 1)) == [(i, i + 1) for i in range(10)]
+    assert list(get_row_tiles(m)) == [(0, 10)]
+
+
+def test_get_square_tiles():
+    """Tests hal.maths.la.matrix.get_square_tiles method"""
+
+    assert get_square_tiles(7, 8, 2 * 3 * 3 * 8) == [(0, 3), (3, 6), (6, 7)]
+    assert get_square_tiles(3, 8, 1) == [(0, 1), (1, 2), (2, 3)]
+    assert get_square_tiles(10, 8) == [(0, 10)]
+
+
+def test_tiled_is_symmetric(monkeypatch):
+    """Tests hal.maths.la.matrix.tiled_is_symmetric method"""
+
+    class ReadCounter:
+        """Matrix counting elements read"""
+
+        def __init__(self, m):
+            self.m = m
+            self.shape = m.shape
+            self.itemsize = m.itemsize
+            self.reads = 0
+
+        def __getitem__(self, key):
+            tile = self.m[key]
+            self.reads += tile.size
+            return tile
+
+    monkeypatch.setattr(matrix_module, 'TILE_BYTES', 2 * 2 * 2 * 8)  # 2 x 2
+    m = get_random_matrices()[-2]
+    m = m + m.T
+    matrix = ReadCounter(m)
+
+    assert tiled_is_symmetric(matrix)
+    assert matrix.reads == m.size  # each element once
+
+    m[0, -1] += 1
+    assert not tiled_is_symmetric(m)
+    assert not tiled_is_symmetric(get_random_matrices()[-1])
+
+
+def test_tiled_dot(monkeypatch):
+    """Tests hal.maths.la.matrix.tiled_dot and tiled_rdot methods"""
+
+    monkeypatch.setattr(matrix_module, 'TILE_BYTES', 1)
+    m = get_random_matrices()[-1]
+    state = np.random.RandomState(1)
+
+    for shape in [(7, ), (7, 3)]:
+        x = state.uniform(-1, 1, size=shape)
+        assert np.allclose(tiled_dot(m, x), m.dot(x))
+
+    for shape in [(3, ), (3, 2)]:
+        x = state.uniform(-1, 1, size=shape)
+        assert np.allclose(tiled_rdot(m, x), m.T.dot(x))
+
+
+class TestLinearSystemMatrix:
+    """Tests LinearSystemMatrix class"""
+
+    @staticmethod
+    def test_dlu_decompose():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.dlu_decompose method"""
+
+        for m in get_random_matrices():
+            if m.shape[0] == m.shape[1]:
+                D, L, U = LinearSystemMatrix(m).dlu_decompose()
+
+                assert D == loop_diagonal(m)
+                assert L == loop_lower(m)
+                assert U == loop_upper(m)
+                assert (D + L + U) == m
+
+    @staticmethod
+    def test_incomplete_Cholesky():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.incomplete_Cholesky method"""
+
+        size = 6
+        tridiagonal = 4 * np.eye(size) - np.eye(size, k=1) - np.eye(size, k=-1)
+        L = LinearSystemMatrix(tridiagonal).incomplete_Cholesky().to_numpy()
+
+        assert np.allclose(L, np.linalg.cholesky(tridiagonal))  # no fill-in
+
+        m = 4 * np.eye(size) - np.eye(size, k=3) - np.eye(size, k=-3) \
+            - np.eye(size, k=1) - np.eye(size, k=-1)
+        L = LinearSystemMatrix(m).incomplete_Cholesky().to_numpy()
+        product = np.dot(L, L.T)
+
+        assert np.array_equal(L != 0, np.tril(m) != 0)  # same pattern
+        assert np.allclose(product[m != 0], m[m != 0])
+
+    @staticmethod
+    def test_get_factorization():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.get_factorization method"""
+
+        m = 4 * np.eye(5) - np.eye(5, k=1) - np.eye(5, k=-1)
+        matrix = LinearSystemMatrix(m)
+        factorization = matrix.get_factorization()
+
+        assert matrix.get_factorization() is factorization  # cached
+
+        matrix.set_at(0, 0, 5)
+        assert matrix.get_factorization() is not factorization  # modified
+        assert np.isclose(matrix.determinant(), np.linalg.det(matrix.to_numpy()))
+
+    @staticmethod
+    def test_condition_number_estimate():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.condition_number_estimate method"""
+
+        for m in get_random_matrices():
+            if m.shape[0] == m.shape[1]:
+                estimate = LinearSystemMatrix(m).condition_number_estimate()
+                expected = np.linalg.cond(m, 1)
+
+                assert estimate <= expected * (1 + 1e-8)
+                assert estimate >= expected / 3  # usually exact
+
+    @staticmethod
+    def test_get_jacobi_spectral_radius():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.get_jacobi_spectral_radius method"""
+
+        for m in get_random_matrices():
+            if m.shape[0] == m.shape[1]:
+                matrix = LinearSystemMatrix(m)
+                D, L, U = [part.to_numpy() for part in matrix.dlu_decompose()]
+                jacobi = np.eye(m.shape[0]) - np.dot(np.linalg.inv(D), m)
+                gauss_seidel = -np.dot(np.linalg.inv(D + L), U)
+
+                assert np.isclose(
+                    matrix.get_jacobi_spectral_radius(),
+                    np.max(np.abs(np.linalg.eigvals(jacobi)))
+                )
+                assert np.isclose(
+                    matrix.get_gauss_seidel_spectral_radius(),
+                    np.max(np.abs(np.linalg.eigvals(gauss_seidel)))
+                )
+
+    @staticmethod
+    def test_does_jacobi_converge():
+        """Tests hal.maths.la.matrix.LinearSystemMatrix.does_jacobi_converge method"""
+
+        size = 10
+        weakly_dominant = 2 * np.eye(size) - np.eye(size, k=1) - np.eye(size, k=-1)
+        not_convergent = [[1, -2], [-3, 1]]
+
+        for m in [weakly_dominant, scipy.sparse.csr_matrix(weakly_dominant)]:
+            matrix = LinearSystemMatrix(m)
+
+            assert not matrix.is_diagonally_dominant(strictly=True)
+            assert matrix.does_jacobi_converge()
+            assert matrix.does_gauss_seidel_converge()
+
+        assert not LinearSystemMatrix(not_convergent).does_jacobi_converge()
+        assert not LinearSystemMatrix(not_convergent).does_gauss_seidel_converge()
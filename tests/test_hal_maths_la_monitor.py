@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.monitor implementation"""
+
+import numpy as np
+
+from hal.maths.la.monitor import SolveMonitor, get_residual_norms
+
+
+class TestSolveMonitor:
+    """Tests SolveMonitor class"""
+
+    @staticmethod
+    def test_is_over():
+        """Tests hal.maths.la.monitor.SolveMonitor.is_over method"""
+
+        assert not SolveMonitor().is_over(10 ** 6)
+        assert not SolveMonitor(3).is_over(2)
+        assert SolveMonitor(3).is_over(3)
+
+    @staticmethod
+    def test_record():
+        """Tests hal.maths.la.monitor.SolveMonitor.record method"""
+
+        monitor = SolveMonitor(callback=lambda it, x, residual: residual < 1)
+        monitor.start(10.0)
+
+        for iteration, residual in enumerate([5.0, 2.0], 1):
+            monitor.start_iteration()
+            monitor.end_iteration()
+            assert not monitor.record(iteration, None, residual)
+
+        assert monitor.record(3, None, 0.5)
+
+        report = monitor.get_report(3, True)
+        assert report.residuals == [10.0, 5.0, 2.0, 0.5]
+        assert len(report.times) == 2
+        assert report.get_total_time() >= 0
+
+    @staticmethod
+    def test_needs_residuals():
+        """Tests hal.maths.la.monitor.SolveMonitor.needs_residuals method"""
+
+        assert SolveMonitor().needs_residuals()
+        assert not SolveMonitor(record_residuals=False).needs_residuals()
+        assert SolveMonitor(
+            callback=lambda it, x, residual: False, record_residuals=False
+        ).needs_residuals()
+
+        monitor = SolveMonitor(record_residuals=False)
+        monitor.start(10.0)
+        monitor.record(1, None, 5.0)
+
+        assert monitor.get_report(1, False).residuals == []
+
+
+def test_get_residual_norms():
+    """Tests hal.maths.la.monitor.get_residual_norms method"""
+
+    A = np.array([[2.0, 0.0], [0.0, 4.0]])
+    X = np.array([[1.0, 0.0], [1.0, 0.0]])
+    B = np.array([[2.0, 3.0], [4.0, 4.0]])
+
+    assert np.allclose(get_residual_norms(A, X, B), [0, 5])
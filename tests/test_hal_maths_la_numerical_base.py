@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.numerical_base implementation"""
+
+import types
+
+import numpy as np
+
+from hal.maths.la.numerical_base import get_all_possible_mantissa, \
+    get_all_possible_exponents, iter_mantissas, iter_exponents, \
+    iter_machine_numbers, get_all_machine_numbers, convert_machine_numbers, \
+    count_machine_numbers, get_machine_limits, get_machine_numbers_array
+
+SYSTEMS = [(2, 2, 1), (2, 3, 2), (3, 2, 1), (10, 2, 1)]  # b, l, k
+
+
+def test_iter_machine_numbers():
+    """Tests hal.maths.la.numerical_base.iter_machine_numbers method"""
+
+    for b, l, k in SYSTEMS:
+        assert list(iter_mantissas(b, l)) == list(get_all_possible_mantissa(b, l))
+        assert list(iter_exponents(b, k)) == get_all_possible_exponents(b, k)
+
+        numbers = iter_machine_numbers(b, l, k)
+        assert isinstance(numbers, types.GeneratorType)
+        assert list(numbers) == get_all_machine_numbers(b, l, k)
+
+    first = next(iter_machine_numbers(2, 53, 11))  # nothing is materialized
+    assert first.mantissa == '1' + '0' * 52
+
+
+def test_count_machine_numbers():
+    """Tests hal.maths.la.numerical_base.count_machine_numbers method"""
+
+    for b, l, k in SYSTEMS:
+        numbers = get_all_machine_numbers(b, l, k)
+        values = set(convert_machine_numbers(numbers, b))
+
+        assert count_machine_numbers(b, l, k) == len(numbers)
+        assert count_machine_numbers(b, l, k, distinct=True) == len(values)
+
+
+def test_get_machine_limits():
+    """Tests hal.maths.la.numerical_base.get_machine_limits method"""
+
+    for b, l, k in SYSTEMS:
+        values = get_machine_numbers_array(b, l, k)
+        limits = get_machine_limits(b, l, k)
+
+        assert np.isclose(limits.min_positive, values[values > 0].min())
+        assert np.isclose(limits.max, values.max())
+        assert np.isclose(-limits.max, values.min())
+        assert np.isclose(limits.epsilon, np.min(values[values > 1]) - 1)
+
+    limits = get_machine_limits(2, 53, 10)  # ~ IEEE 754 double
+    assert limits.epsilon == np.finfo(np.float64).eps
+    assert limits.max == np.finfo(np.float64).max / 2  # mantissa < 1
+
+
+def test_get_machine_numbers_array():
+    """Tests hal.maths.la.numerical_base.get_machine_numbers_array method"""
+
+    for b, l, k in SYSTEMS:
+        numbers = get_all_machine_numbers(b, l, k)
+        values = get_machine_numbers_array(b, l, k)
+
+        assert values.dtype == np.float64
+        assert np.allclose(values, list(convert_machine_numbers(numbers, b)),
+                           rtol=1e-15, atol=0)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.operators implementation"""
+
+import numpy as np
+import pytest
+
+from hal.maths.la.matrix import Matrix
+from hal.maths.la.operators import LinearOperator, as_operator
+
+STATE = np.random.RandomState(0)
+A = STATE.uniform(-1, 1, size=(6, 6))
+
+
+def get_operator(**kwargs):
+    return LinearOperator(A.shape, A.dot, **kwargs)
+
+
+class TestLinearOperator:
+    """Tests LinearOperator class"""
+
+    @staticmethod
+    def test_matvec():
+        """Tests hal.maths.la.operators.LinearOperator.matvec method"""
+
+        x = STATE.uniform(-1, 1, size=6)
+        operator = get_operator()
+
+        assert np.allclose(operator.matvec(x), A.dot(x))
+        assert operator.matvec(x.reshape(-1, 1)).shape == (6, 1)
+
+    @staticmethod
+    def test_matmat():
+        """Tests hal.maths.la.operators.LinearOperator.matmat method"""
+
+        X = STATE.uniform(-1, 1, size=(6, 3))
+        operator = get_operator()
+
+        assert np.allclose(operator.matmat(X), A.dot(X))
+        assert np.allclose((operator * Matrix(X)).to_numpy(), A.dot(X))
+
+    @staticmethod
+    def test_rmatvec():
+        """Tests hal.maths.la.operators.LinearOperator.rmatvec method"""
+
+        x = STATE.uniform(-1, 1, size=6)
+
+        assert np.allclose(get_operator(rmatvec=A.T.dot).rmatvec(x), A.T.dot(x))
+        with pytest.raises(ValueError):
+            get_operator().rmatvec(x)
+
+    @staticmethod
+    def test_get_diagonal_values():
+        """Tests hal.maths.la.operators.LinearOperator.get_diagonal_values method"""
+
+        for diagonal in [np.diag(A), lambda: np.diag(A)]:
+            operator = get_operator(diagonal=diagonal)
+            assert np.allclose(operator.get_diagonal_values(), np.diag(A))
+
+        with pytest.raises(ValueError):
+            get_operator().get_diagonal_values()
+
+
+def test_as_operator():
+    """Tests hal.maths.la.operators.as_operator method"""
+
+    X = STATE.uniform(-1, 1, size=(6, 2))
+    for matrix in [A, Matrix(A), get_operator()]:
+        assert np.allclose(as_operator(matrix).matmat(X), A.dot(X))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.parallel implementation"""
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from hal.maths.la.parallel import BlockPool, get_blocks, get_coloring
+
+
+def get_grid_matrix(grid_size):
+    tridiagonal = 2 * np.eye(grid_size) - np.eye(grid_size, k=1) - \
+        np.eye(grid_size, k=-1)
+    identity = np.eye(grid_size)
+    return np.kron(identity, tridiagonal) + np.kron(tridiagonal, identity)
+
+
+def test_get_blocks():
+    """Tests hal.maths.la.parallel.get_blocks method"""
+
+    assert get_blocks(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert get_blocks(2, 4) == [(0, 1), (1, 2)]
+    assert get_blocks(5, 1) == [(0, 5)]
+
+
+def test_get_coloring():
+    """Tests hal.maths.la.parallel.get_coloring method"""
+
+    A = get_grid_matrix(5)
+    for matrix in [A, scipy.sparse.csr_matrix(A)]:
+        colors = get_coloring(matrix)
+
+        assert len(colors) == 2  # red-black
+        assert sorted(np.concatenate(colors)) == list(range(25))
+        for indices in colors:  # not coupled
+            block = A[np.ix_(indices, indices)]
+            assert np.count_nonzero(block - np.diag(np.diag(block))) == 0
+
+    assert len(get_coloring(np.ones((4, 4)))) == 4
+
+
+class TestBlockPool:
+    """Tests BlockPool class"""
+
+    @staticmethod
+    def test_run():
+        """Tests hal.maths.la.parallel.BlockPool.run method"""
+
+        for workers in [1, 3]:
+            x = np.zeros(10)
+
+            def fill(start, stop):
+                x[start:stop] = np.arange(start, stop)
+
+            BlockPool(workers).run(fill, get_blocks(len(x), workers))
+            assert np.array_equal(x, np.arange(10))
+
+            def fail(start, stop):
+                raise ValueError
+
+            with pytest.raises(ValueError):
+                BlockPool(workers).run(fail, get_blocks(len(x), workers))
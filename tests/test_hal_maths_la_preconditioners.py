@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.preconditioners implementation"""
+
+import numpy as np
+
+from hal.maths.la.preconditioners import JacobiPreconditioner, \
+    SSORPreconditioner, IncompleteCholeskyPreconditioner
+
+A = np.array([
+    [4.0, -1.0, 0.0, -1.0],
+    [-1.0, 4.0, -1.0, 0.0],
+    [0.0, -1.0, 4.0, -1.0],
+    [-1.0, 0.0, -1.0, 4.0],
+])
+R = np.array([[1.0], [2.0], [3.0], [4.0]])
+
+
+def assert_inverts(preconditioner, M):
+    """Asserts preconditioner solves M * z = r
+
+    :param preconditioner: preconditioner
+    :param M: explicit preconditioning matrix
+    """
+
+    z = preconditioner.apply(R)
+    assert np.allclose(np.dot(M, z), R)
+
+
+class TestJacobiPreconditioner:
+    """Tests JacobiPreconditioner class"""
+
+    @staticmethod
+    def test_apply():
+        """Tests hal.maths.la.preconditioners.JacobiPreconditioner.apply method"""
+
+        assert_inverts(JacobiPreconditioner(A), np.diag(np.diag(A)))
+
+
+class TestSSORPreconditioner:
+    """Tests SSORPreconditioner class"""
+
+    @staticmethod
+    def test_apply():
+        """Tests hal.maths.la.preconditioners.SSORPreconditioner.apply method"""
+
+        for w in [1.0, 1.3, 1.5]:  # M = (D + wL) D^-1 (D + wU) / (w (2 - w))
+            D = np.diag(np.diag(A))
+            lower = D + w * np.tril(A, -1)
+            upper = D + w * np.triu(A, 1)
+            M = np.dot(np.dot(lower, np.linalg.inv(D)), upper) / (w * (2 - w))
+
+            assert_inverts(SSORPreconditioner(A, w), M)
+
+
+class TestIncompleteCholeskyPreconditioner:
+    """Tests IncompleteCholeskyPreconditioner class"""
+
+    @staticmethod
+    def test_apply():
+        """Tests hal.maths.la.preconditioners.IncompleteCholeskyPreconditioner.apply method"""
+
+        preconditioner = IncompleteCholeskyPreconditioner(A)
+        L = preconditioner.L
+
+        assert_inverts(preconditioner, np.dot(L, L.T))
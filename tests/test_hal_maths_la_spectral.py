@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.spectral implementation"""
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+from hal.maths.la.factorizations import factorize
+from hal.maths.la.spectral import power_iteration, get_spectral_radius, \
+    get_l2_norm, get_condition_number
+
+STATE = np.random.RandomState(0)
+MATRICES = [
+    STATE.uniform(-1, 1, size=(size, size)) + np.eye(size)
+    for size in [1, 2, 3, 10, 40]
+]
+
+
+def get_symmetric(m):
+    """Gets symmetric part of matrix
+
+    :param m: matrix
+    :return: symmetric matrix
+    """
+
+    return (m + m.T) / 2
+
+
+def test_power_iteration():
+    """Tests hal.maths.la.spectral.power_iteration method"""
+
+    m = np.diag([1.0, -2.0, 5.0, 0.5])
+
+    assert np.isclose(power_iteration(m), 5.0)
+    assert np.isclose(power_iteration(np.diag([1.0, -5.0, 2.0])), 5.0)
+    assert power_iteration(np.zeros((3, 3))) == 0
+
+
+def test_get_spectral_radius():
+    """Tests hal.maths.la.spectral.get_spectral_radius method"""
+
+    for m in MATRICES:
+        expected = np.max(np.abs(np.linalg.eigvals(m)))
+        symmetric = get_symmetric(m)
+
+        assert np.isclose(get_spectral_radius(m), expected)
+        assert np.isclose(get_spectral_radius(scipy.sparse.csr_matrix(m)), expected)
+        assert np.isclose(
+            get_spectral_radius(symmetric, symmetric=True),
+            np.max(np.abs(np.linalg.eigvalsh(symmetric)))
+        )
+
+
+def test_get_l2_norm():
+    """Tests hal.maths.la.spectral.get_l2_norm method"""
+
+    for m in MATRICES + [STATE.uniform(size=(5, 12))]:
+        operator = scipy.sparse.linalg.aslinearoperator(m)
+
+        assert np.isclose(get_l2_norm(m), np.linalg.norm(m, 2))
+        assert np.isclose(get_l2_norm(operator), np.linalg.norm(m, 2))
+
+
+def test_get_condition_number():
+    """Tests hal.maths.la.spectral.get_condition_number method"""
+
+    for m in MATRICES:
+        estimate = get_condition_number(m, factorize(m))
+
+        assert np.isclose(estimate, np.linalg.cond(m))
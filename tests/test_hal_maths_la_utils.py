@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.la.utils implementation"""
+
+import numpy as np
+import pytest
+
+from hal.maths.la.matrix import Matrix
+from hal.maths.la.utils import modulus, get_error, apply_toll, \
+    get_column_norms, L2_NORM, LINFINITE_NORM
+
+
+def test_modulus():
+    """Tests hal.maths.la.utils.modulus method"""
+
+    x = np.array([3.0, -4.0])
+
+    assert modulus(-2) == 2
+    assert np.isclose(modulus(x), 5)
+    assert np.isclose(modulus(Matrix(x)), 5)
+
+
+def test_get_error():
+    """Tests hal.maths.la.utils.get_error method"""
+
+    assert np.isclose(get_error(np.array([4.0, 0.0]), np.array([1.0, 4.0])), 5)
+    assert get_error(1.5, 2) == 0.5
+
+
+def test_apply_toll():
+    """Tests hal.maths.la.utils.apply_toll method"""
+
+    x = np.array([3.0, -4.0])
+
+    assert np.isclose(apply_toll(x, 0.1, 1), 1.5)
+    assert np.array_equal(x, [3.0, -4.0])  # untouched
+
+
+def test_get_column_norms():
+    """Tests hal.maths.la.utils.get_column_norms method"""
+
+    X = np.random.RandomState(0).uniform(-1, 1, size=(10, 4))
+
+    assert np.allclose(get_column_norms(X, L2_NORM), np.linalg.norm(X, axis=0))
+    assert np.allclose(
+        get_column_norms(X, LINFINITE_NORM), np.linalg.norm(X, np.inf, axis=0)
+    )
+    with pytest.raises(ValueError):
+        get_column_norms(X, 'l3')
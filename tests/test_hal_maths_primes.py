@@ -3,9 +3,38 @@
 
 """Tests hal.maths.primes implementation"""
 
+import random
+
+import numpy as np
+import pytest
 from scipy.stats import describe
 
-from hal.maths.nt.primes import get_prime, Integer, blum_blum_shub
+from hal.maths.nt.primes import get_prime, Integer, blum_blum_shub, \
+    is_probably_prime, is_probably_prime_many, miller_rabin, \
+    get_miller_rabin_bases, get_many_primes, sieve_window, BlumBlumShub
+
+STRONG_PSEUDOPRIMES = [  # fool Miller-Rabin with first bases
+    2047, 1373653, 25326001, 3215031751, 4759123141, 2152302898747,
+    3474749660383, 341550071728321, 3825123056546413051,
+    318665857834031151167461, 3317044064679887385961981
+]
+BIG_PRIMES = [2 ** 31 - 1, 2 ** 61 - 1, 2 ** 89 - 1, 2 ** 127 - 1]
+
+
+def get_sieve(n):
+    """Gets primality of numbers below n (sieve of Eratosthenes)
+
+    :param n: upper bound
+    :return: list of booleans
+    """
+
+    sieve = np.ones(n, dtype=bool)
+    sieve[:2] = False
+    for i in range(2, int(n ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = False
+
+    return sieve.tolist()
 
 
 def test_get_prime():
@@ -16,8 +45,39 @@ def test_get_prime():
         prime = get_prime(n_bits)
         assert Integer(str(prime)).is_probably_prime()
 
-        not_prime = prime - 1  # definitely NOT a prime
-        assert not Integer(str(not_prime)).is_probably_prime()
+        not_prime = prime - 1  # definitely NOT a prime (unless 3 - 1 = 2)
+        assert prime == 3 or not Integer(str(not_prime)).is_probably_prime()
+
+    for n_bits in [32, 64, 256]:  # sieved windows, with processes
+        for workers in [1, 2]:
+            prime = get_prime(n_bits, workers=workers)
+            assert prime.bit_length() == n_bits
+            assert is_probably_prime(prime)
+
+
+def test_get_many_primes():
+    """Tests hal.maths.primes.get_many_primes method"""
+
+    random.seed(42)
+    primes = get_many_primes(128, 6, workers=2)
+    assert len(primes) == 6
+    assert all(prime.bit_length() == 128 for prime in primes)
+    assert all(is_probably_prime(prime) for prime in primes)
+
+    random.seed(42)  # same seed -> same primes, with or without processes
+    assert get_many_primes(128, 6) == primes
+
+
+def test_sieve_window():
+    """Tests hal.maths.primes.sieve_window method"""
+
+    start = 10 ** 9 + 1
+    candidates = sieve_window(start, 500)
+    expected = [
+        n for n in range(start, start + 1000, 2)
+        if all(n % p != 0 for p in range(3, 2 ** 16, 2))
+    ]
+    assert candidates == expected
 
 
 def test_blum_blum_shub():
@@ -45,15 +105,150 @@ class TestInteger:
         """Tests hal.maths.primes.Integer.is_naive_prime method"""
 
         assert not Integer("1").is_naive_prime()
+        assert Integer("2").is_naive_prime()
+        assert not Integer("1009").is_naive_prime()  # not low
 
     @staticmethod
     def test_is_probably_prime():
         """Tests hal.maths.primes.Integer.is_probably_prime method"""
 
-        pass  # todo auto generated method stub
+        sieve = get_sieve(3000)
+        for n in range(3000):
+            assert Integer(str(n)).is_probably_prime() == sieve[n]
 
     @staticmethod
     def test_test_miller_rabin():
         """Tests hal.maths.primes.Integer.test_miller_rabin method"""
 
-        pass  # todo auto generated method stub
+        for prime in BIG_PRIMES:
+            assert Integer(str(prime)).test_miller_rabin(5)
+            assert not Integer(str(prime * (2 ** 61 - 1))).test_miller_rabin(5)
+
+        for pseudoprime in STRONG_PSEUDOPRIMES:
+            assert not Integer(str(pseudoprime)).test_miller_rabin(5)
+
+
+def test_is_probably_prime():
+    """Tests hal.maths.primes.is_probably_prime method"""
+
+    sieve = get_sieve(10 ** 5)
+    assert [is_probably_prime(n) for n in range(len(sieve))] == sieve
+
+    for prime in BIG_PRIMES:
+        assert is_probably_prime(prime)
+        assert not is_probably_prime(prime * 1013)
+
+    for pseudoprime in STRONG_PSEUDOPRIMES:
+        assert not is_probably_prime(pseudoprime)
+
+
+def test_miller_rabin():
+    """Tests hal.maths.primes.miller_rabin method"""
+
+    assert miller_rabin(2047, [2])  # strong pseudoprime to base 2 ...
+    assert not miller_rabin(2047, get_miller_rabin_bases(2047 * 3))  # ... only
+
+    big = 2 ** 127 - 1  # above deterministic range: bases are reproducible
+    assert get_miller_rabin_bases(big) == get_miller_rabin_bases(big)
+    assert len(get_miller_rabin_bases(big, 7)) == 13 + 7
+
+
+def test_is_probably_prime_many():
+    """Tests hal.maths.primes.is_probably_prime_many method"""
+
+    sieve = get_sieve(10 ** 5)
+    assert is_probably_prime_many(range(len(sieve))) == sieve
+
+    state = np.random.RandomState(0)
+    numbers = [int(n) for n in state.randint(2 ** 20, 2 ** 32, size=2000)] + \
+        [int(n) for n in state.randint(2 ** 32, 2 ** 62, size=200)] + \
+        STRONG_PSEUDOPRIMES + BIG_PRIMES + [-7, 0, 1]
+
+    assert is_probably_prime_many(numbers) == \
+        [is_probably_prime(n) for n in numbers]
+
+
+class TestBlumBlumShub:
+    """Tests hal.maths.nt.primes.BlumBlumShub"""
+
+    primes = (1000003, 1000039)  # == 3 mod 4
+    seed = 123456789
+
+    @staticmethod
+    def get_generator(bits_per_step=1):
+        return BlumBlumShub(
+            TestBlumBlumShub.seed, *TestBlumBlumShub.primes,
+            bits_per_step=bits_per_step
+        )
+
+    @staticmethod
+    def test_next():
+        """Tests hal.maths.nt.primes.BlumBlumShub.__next__ method"""
+
+        expected = blum_blum_shub(TestBlumBlumShub.seed, 50, *TestBlumBlumShub.primes)
+        generator = TestBlumBlumShub.get_generator()
+        assert [next(generator) for _ in range(49)] == expected[1:]
+
+        with pytest.raises(ValueError):
+            BlumBlumShub(TestBlumBlumShub.seed, 83, 101)  # 101 == 1 mod 4
+
+        with pytest.raises(ValueError):
+            BlumBlumShub(83 * 5, 83, 103)
+
+        for bits_per_step in [0, -1]:  # read would never end
+            with pytest.raises(ValueError):
+                TestBlumBlumShub.get_generator(bits_per_step)
+
+    @staticmethod
+    def test_jump():
+        """Tests hal.maths.nt.primes.BlumBlumShub.jump method"""
+
+        expected = blum_blum_shub(TestBlumBlumShub.seed, 200, *TestBlumBlumShub.primes)
+        generator = TestBlumBlumShub.get_generator()
+        for position in [150, 0, 37]:
+            generator.jump(position)
+            assert next(generator) == expected[position + 1]
+
+        stream = TestBlumBlumShub.get_generator().read(64)
+        parts = []
+        for worker in range(4):  # disjoint parts of same stream
+            generator = TestBlumBlumShub.get_generator()
+            generator.jump(worker * 128)  # 16 bytes, 1 bit per step
+            parts.append(generator.read(16))
+
+        assert b''.join(parts) == stream
+
+    @staticmethod
+    def test_read():
+        """Tests hal.maths.nt.primes.BlumBlumShub.read method"""
+
+        numbers = blum_blum_shub(TestBlumBlumShub.seed, 81, *TestBlumBlumShub.primes)
+        bits = ''.join(str(x & 1) for x in numbers[1:])
+        assert TestBlumBlumShub.get_generator().read(10) == \
+            int(bits, 2).to_bytes(10, 'big')
+
+        for bits_per_step in [1, 3, 5]:  # reads of any size, same stream
+            stream = TestBlumBlumShub.get_generator(bits_per_step).read(100)
+            generator = TestBlumBlumShub.get_generator(bits_per_step)
+            chunks = [generator.read(size) for size in [1, 7, 0, 33, 59]]
+            assert b''.join(chunks) == stream
+
+            generator = TestBlumBlumShub.get_generator(bits_per_step)
+            assert b''.join(generator.iter_chunks(16, 100)) == stream
+
+    @staticmethod
+    def test_readinto():
+        """Tests hal.maths.nt.primes.BlumBlumShub.readinto method"""
+
+        stream = TestBlumBlumShub.get_generator().read(32)
+        buffer = bytearray(16)
+        array = np.zeros(16, dtype=np.uint8)
+
+        generator = TestBlumBlumShub.get_generator()
+        assert generator.readinto(buffer) == 16
+        assert generator.readinto(array) == 16
+        assert bytes(buffer) + array.tobytes() == stream
+
+        array = TestBlumBlumShub.get_generator().get_array(32)
+        assert array.dtype == np.uint8
+        assert array.tobytes() == stream
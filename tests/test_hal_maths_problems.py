@@ -3,6 +3,29 @@
 
 """Tests hal.maths.problems implementation"""
 
+from hal.maths.problems import EightQueen
+
+SOLUTIONS = [1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724]  # for board of i x i
+
+
+def legacy_solve(problem, table_size):
+    """Previous EightQueen.solve, kept as reference
+
+    :param problem: EightQueen
+    :param table_size: Size of table
+    :return: List of possible solutions
+    """
+
+    if table_size == 0:
+        return [[]]
+
+    solutions = []
+    for solution in legacy_solve(problem, table_size - 1):
+        for column in range(1, problem.board_size + 1):
+            if not problem.under_attack(column, solution):
+                solutions.append(solution + [(table_size, column)])
+    return solutions
+
 
 class TestEightQueen:
     """Tests EightQueen class"""
@@ -11,10 +34,77 @@ class TestEightQueen:
     def test_under_attack():
         """Tests hal.maths.problems.EightQueen.under_attack method"""
 
-        pass  # todo auto generated method stub
+        queens = [(1, 1), (2, 3)]
+        assert EightQueen.under_attack(3, queens)  # same column
+        assert EightQueen.under_attack(4, queens)  # diagonal
+        assert EightQueen.under_attack(2, queens)  # other diagonal
+        assert not EightQueen.under_attack(5, queens)
 
     @staticmethod
     def test_solve():
         """Tests hal.maths.problems.EightQueen.solve method"""
 
-        pass  # todo auto generated method stub
+        for board_size in range(7):
+            problem = EightQueen(board_size)
+            for table_size in range(board_size + 2):
+                assert problem.solve(table_size) == \
+                    legacy_solve(problem, table_size)
+
+        solutions = EightQueen(8).solve(8)
+        assert len(solutions) == 92
+        assert solutions[0] == [
+            (1, 1), (2, 5), (3, 8), (4, 6), (5, 3), (6, 7), (7, 2), (8, 4)
+        ]
+
+    @staticmethod
+    def test_count():
+        """Tests hal.maths.problems.EightQueen.count method"""
+
+        for board_size, solutions in enumerate(SOLUTIONS):
+            problem = EightQueen(board_size)
+            assert problem.count() == solutions
+
+            for table_size in range(board_size + 2):  # partial boards
+                assert problem.count(table_size) == \
+                    len(legacy_solve(problem, table_size))
+
+    @staticmethod
+    def test_iter_columns():
+        """Tests hal.maths.problems.EightQueen.iter_columns method"""
+
+        solutions = EightQueen(6).iter_columns()
+        assert next(solutions) == (1, 3, 5, 0, 2, 4)  # lazy
+        assert len(list(solutions)) == SOLUTIONS[6] - 1
+
+        for columns in EightQueen(8).iter_columns():
+            assert len(set(columns)) == 8
+            assert len({row + col for row, col in enumerate(columns)}) == 8
+            assert len({row - col for row, col in enumerate(columns)}) == 8
+
+    @staticmethod
+    def test_get_split():
+        """Tests hal.maths.problems.EightQueen.get_split method"""
+
+        for board_size in range(1, 10):
+            problem = EightQueen(board_size)
+            for table_size in range(1, board_size + 1):
+                split = problem.get_split(table_size)
+                total = sum(
+                    weight * problem.count_prefix(table_size, prefix)
+                    for prefix, weight in split
+                )
+                assert total == len(list(problem.iter_columns(table_size)))
+
+    @staticmethod
+    def test_parallel():
+        """Tests hal.maths.problems.EightQueen methods with many workers"""
+
+        for board_size in [5, 8, 9]:
+            problem = EightQueen(board_size)
+            assert problem.count(workers=2) == SOLUTIONS[board_size]
+            assert problem.solve(board_size, workers=2) == \
+                problem.solve(board_size)  # same order
+
+        problem = EightQueen(8)
+        assert list(problem.iter_columns(prefix=(0, 4), workers=2)) == \
+            [columns for columns in problem.iter_columns() if columns[:2] == (0, 4)]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.maths.nt.sieve implementation"""
+
+import bisect
+
+import pytest
+
+from hal.maths.nt.primes import is_probably_prime, Integer
+from hal.maths.nt.sieve import get_primes, iter_primes, PrimeTable, \
+    count_primes, get_nth_prime, isqrt
+
+SMALL_PRIMES = [n for n in range(5000) if is_probably_prime(n)]
+
+
+def test_isqrt():
+    """Tests hal.maths.nt.sieve.isqrt method"""
+
+    for n in list(range(1000)) + [10 ** 30, 2 ** 106 - 1, (10 ** 20 + 7) ** 2]:
+        root = isqrt(n)
+        assert root * root <= n < (root + 1) * (root + 1)
+
+
+def test_get_primes():
+    """Tests hal.maths.nt.sieve.get_primes method"""
+
+    assert get_primes(0, 5000).tolist() == SMALL_PRIMES
+    assert get_primes(5000, 0).tolist() == []
+
+    low = 10 ** 12  # segment far from sieved base primes
+    primes = get_primes(low, low + 1000).tolist()
+    assert primes == [n for n in range(low, low + 1000) if is_probably_prime(n)]
+
+
+def test_iter_primes():
+    """Tests hal.maths.nt.sieve.iter_primes method"""
+
+    bounds = [(0, 5000), (1, 4999), (2, 3), (3, 3), (997, 1010), (100, 2000)]
+    for segment_size in [7, 16, 33, 1024]:  # odd sizes, tiny segments
+        for a, b in bounds:
+            expected = [p for p in SMALL_PRIMES if a <= p < b]
+            assert list(iter_primes(a, b, segment_size)) == expected
+
+
+class TestPrimeTable:
+    """Tests hal.maths.nt.sieve.PrimeTable"""
+
+    @staticmethod
+    def test_is_prime():
+        """Tests hal.maths.nt.sieve.PrimeTable.is_prime method"""
+
+        table = PrimeTable()
+        assert [n for n in range(5000) if table.is_prime(n)] == SMALL_PRIMES
+
+        n = 2 ** 18 + 3  # grows table
+        assert table.is_prime(n) == is_probably_prime(n)
+        assert table.limit > n
+
+    @staticmethod
+    def test_count():
+        """Tests hal.maths.nt.sieve.PrimeTable.count method"""
+
+        table = PrimeTable()
+        assert table.count(1) == 0
+        assert table.count(2) == 1
+        assert table.count(1000) == 168
+        assert table.count(10 ** 6) == 78498
+
+        primes = get_primes(0, 20000).tolist()  # across index blocks
+        assert [table.count(n) for n in range(20000)] == \
+            [bisect.bisect_right(primes, n) for n in range(20000)]
+
+    @staticmethod
+    def test_get_nth():
+        """Tests hal.maths.nt.sieve.PrimeTable.get_nth method"""
+
+        table = PrimeTable()
+        assert table.get_nth(1) == 2
+        assert table.get_nth(168) == 997
+        assert table.get_nth(10 ** 5) == 1299709
+
+        primes = get_primes(0, 20000).tolist()  # across index blocks
+        assert [table.get_nth(k) for k in range(1, len(primes) + 1)] == primes
+
+        with pytest.raises(ValueError):
+            table.get_nth(0)
+
+
+def test_shared_table():
+    """Tests hal.maths.nt.sieve.count_primes and get_nth_prime methods"""
+
+    assert count_primes(get_nth_prime(1000)) == 1000
+    assert Integer('997').is_probably_prime()
+    assert not Integer('1001').is_probably_prime()
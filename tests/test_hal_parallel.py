@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.parallel implementation"""
+
+import os
+
+from hal.parallel import get_workers, get_executor, get_process_executor
+
+
+def test_get_workers():
+    """Tests hal.parallel.get_workers method"""
+
+    assert get_workers(3) == 3
+    assert get_workers() == (os.cpu_count() or 1)
+
+
+def test_get_executor():
+    """Tests hal.parallel.get_executor method"""
+
+    executor = get_executor(2)
+
+    assert executor is get_executor(2)  # shared
+    assert list(executor.map(abs, [-1, 2, -3])) == [1, 2, 3]
+
+
+def test_get_process_executor():
+    """Tests hal.parallel.get_process_executor method"""
+
+    executor = get_process_executor(2)
+
+    assert executor is get_process_executor(2)  # shared
+    assert list(executor.map(abs, [-1, 2, -3])) == [1, 2, 3]
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.profile.benchmark implementation"""
+
+import json
+
+import pytest
+
+from hal.profile.benchmark import BENCHMARKS, BenchmarkRunner, \
+    register_benchmark, register_sizes, get_benchmark_names, get_stats, main, \
+    parse_param, CLOCKS
+
+
+@register_benchmark('test_sum', size=10)
+def sum_numbers(size):
+    return sum(range(size))
+
+
+def test_register_benchmark():
+    """Tests hal.profile.benchmark.register_benchmark method"""
+
+    benchmark = BENCHMARKS['test_sum']
+    assert benchmark.function is sum_numbers
+    assert benchmark.get_params() == {'size': 10}
+    assert benchmark.get_params(size=3, unknown=1) == {'size': 3}
+
+
+def test_register_sizes():
+    """Tests hal.profile.benchmark.register_sizes method"""
+
+    @register_sizes('test_sizes', {'small': {'size': 1}, 'large': {'size': 9}})
+    def count_up(size):
+        return list(range(size))
+
+    assert BENCHMARKS['test_sizes[small]'].get_params() == {'size': 1}
+    assert BENCHMARKS['test_sizes[large]'].function is count_up
+
+
+def test_get_benchmark_names():
+    """Tests hal.profile.benchmark.get_benchmark_names method"""
+
+    register_sizes('test_names', {'a': {}, 'b': {}})(sum_numbers)
+
+    assert get_benchmark_names(['test_names*']) == \
+        ['test_names[a]', 'test_names[b]']
+    assert get_benchmark_names(['test_sum', 'test_sum']) == ['test_sum']
+
+    with pytest.raises(ValueError):
+        get_benchmark_names(['unknown.*'])
+
+
+def test_get_stats():
+    """Tests hal.profile.benchmark.get_stats method"""
+
+    stats = get_stats([1.0, 2.0, 3.0, 4.0, 100.0])
+    assert stats['min'] == 1.0
+    assert stats['max'] == 100.0
+    assert stats['median'] == 3.0
+    assert stats['mean'] == 22.0
+    assert 4.0 < stats['p95'] < 100.0
+    assert stats['stddev'] > 0
+
+    assert get_stats([2.0])['stddev'] == 0.0
+
+
+def test_parse_param():
+    """Tests hal.profile.benchmark.parse_param method"""
+
+    assert parse_param('size=10') == ('size', 10)
+    assert parse_param('workers=null') == ('workers', None)
+    assert parse_param('name=queens') == ('name', 'queens')
+
+
+class TestBenchmarkRunner:
+    """Tests BenchmarkRunner class"""
+
+    @staticmethod
+    def test_run():
+        """Tests hal.profile.benchmark.BenchmarkRunner.run method"""
+
+        calls = []
+
+        @register_benchmark('test_calls', size=1)
+        def count_calls(size):
+            calls.append(size)
+
+        result = BenchmarkRunner(warmup=2, repeats=3).run('test_calls', size=5)
+        assert calls == [5] * 5  # warmup + repeats
+        assert result['params'] == {'size': 5}
+        for clock in CLOCKS:
+            assert len(result['timings'][clock]) == 3
+            assert result['stats'][clock]['min'] >= 0
+
+        with pytest.raises(ValueError):
+            BenchmarkRunner().run('unknown')
+
+        with pytest.raises(ValueError):
+            BenchmarkRunner(repeats=0)
+
+    @staticmethod
+    def test_setup():
+        """Tests hal.profile.benchmark.BenchmarkRunner.run method with setup
+        and teardown of inputs"""
+
+        events = []
+
+        def setup(size):
+            events.append('setup')
+            return {'numbers': list(range(size))}
+
+        def teardown(inputs):
+            events.append('teardown')
+
+        @register_benchmark('test_setup', setup, teardown, size=4)
+        def add_numbers(numbers):
+            events.append(sum(numbers))
+
+        result = BenchmarkRunner(warmup=1, repeats=2).run('test_setup')
+        assert events == ['setup', 6, 6, 6, 'teardown']  # setup is untimed
+        assert result['params'] == {'size': 4}
+
+    @staticmethod
+    def test_run_all():
+        """Tests hal.profile.benchmark.BenchmarkRunner.run_all method"""
+
+        report = BenchmarkRunner(0, 1).run_all(['test_sum'])
+        assert [result['name'] for result in report['benchmarks']] == ['test_sum']
+        assert 'system' in report['machine']['platform']
+        assert 'version' in report['machine']['pyhal']
+        json.dumps(report)  # serializable
+
+
+def test_main(tmpdir, capsys):
+    """Tests hal.profile.benchmark.main method"""
+
+    @register_benchmark('test_print')
+    def print_something():
+        print('not a report')
+
+    main(['test_print', '-w', '0', '-r', '1'])
+    out, err = capsys.readouterr()
+    assert json.loads(out)['benchmarks'][0]['name'] == 'test_print'
+    assert 'not a report' in err
+
+    output = str(tmpdir.join('report.json'))
+    report = main([
+        'eight_queen', '-w', '0', '-r', '2', '-p', 'size=6', '-o', output
+    ])
+    with open(output) as reader:
+        assert json.load(reader) == report
+
+    result = report['benchmarks'][0]
+    assert result['name'] == 'eight_queen'
+    assert result['params'] == {'size': 6, 'workers': 1}
+    assert len(result['timings']['wall']) == 2
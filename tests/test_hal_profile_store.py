@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+
+"""Tests hal.profile.store implementation"""
+
+import pytest
+
+from hal.profile.store import ResultStore, compare_results, find_run, main, \
+    get_host_fingerprint, REGRESSION, IMPROVEMENT, UNCHANGED, PARAMS_CHANGED
+
+
+def get_report(timings, version='1.0', params=None, system='Linux'):
+    """Creates fake report of BenchmarkRunner.run_all
+
+    :param timings: dict: name of benchmark -> wall timings
+    :param version: PyHal version
+    :param params: params of benchmarks
+    :param system: name of OS
+    :return: report
+    """
+
+    return {
+        'machine': {
+            'platform': {'system': system, 'cpus': 4},
+            'pyhal': {'version': version, 'build': 'abc'}
+        },
+        'timestamp': '2019-01-01T00:00:00',
+        'benchmarks': [
+            {
+                'name': name,
+                'params': params or {'size': 8},
+                'timings': {'wall': wall, 'cpu': wall}
+            } for name, wall in timings.items()
+        ]
+    }
+
+
+SLOW = [2.0, 2.1, 2.05, 1.95, 2.02, 2.08]
+FAST = [1.0, 1.05, 0.98, 1.01, 1.03, 0.99]
+NOISY = [1.0, 1.9, 1.1, 2.1, 0.9, 2.0]
+
+
+def test_get_host_fingerprint():
+    """Tests hal.profile.store.get_host_fingerprint method"""
+
+    linux = get_report({}, system='Linux')['machine']
+    windows = get_report({}, system='Windows')['machine']
+    assert get_host_fingerprint(linux) == get_host_fingerprint(linux)
+    assert get_host_fingerprint(linux) != get_host_fingerprint(windows)
+
+
+class TestResultStore:
+    """Tests ResultStore class"""
+
+    @staticmethod
+    def test_save():
+        """Tests hal.profile.store.ResultStore.save method"""
+
+        with ResultStore(':memory:') as store:
+            run_id = store.save(get_report({'a': FAST, 'b': SLOW}))
+            results = store.get_results(run_id)
+            assert sorted(results) == ['a', 'b']
+            assert results['a'] == {
+                'params': {'size': 8},
+                'timings': {'wall': FAST, 'cpu': FAST}
+            }
+
+    @staticmethod
+    def test_get_runs():
+        """Tests hal.profile.store.ResultStore.get_runs method"""
+
+        with ResultStore(':memory:') as store:
+            first = store.save(get_report({'a': FAST}, version='1.0'))
+            second = store.save(get_report({'a': FAST}, version='2.0'))
+            store.save(get_report({'a': FAST}, version='2.0', system='Windows'))
+
+            assert len(store.get_runs()) == 3
+            host = store.get_runs()[0]['host']
+            assert [run['id'] for run in store.get_runs(host=host)] == \
+                [first, second]
+            assert [run['id'] for run in store.get_runs('1.0')] == [first]
+
+            assert find_run(store, version='2.0', host=host) == second
+            assert find_run(store, host=host, back=2) == first
+            with pytest.raises(ValueError):
+                find_run(store, version='3.0')
+
+
+def test_compare_results():
+    """Tests hal.profile.store.compare_results method"""
+
+    def get_results(timings, params=None):
+        with ResultStore(':memory:') as store:
+            return store.get_results(store.save(get_report(timings, params=params)))
+
+    baseline = get_results({'a': FAST, 'b': SLOW, 'c': FAST, 'd': FAST})
+    candidate = get_results({'a': SLOW, 'b': FAST, 'c': NOISY, 'e': FAST})
+    comparisons = {
+        comparison['name']: comparison
+        for comparison in compare_results(baseline, candidate)
+    }
+
+    assert sorted(comparisons) == ['a', 'b', 'c']  # in both runs
+    assert comparisons['a']['status'] == REGRESSION
+    assert comparisons['a']['change'] == pytest.approx(1.0, rel=0.1)
+    assert comparisons['b']['status'] == IMPROVEMENT
+    assert comparisons['c']['status'] == UNCHANGED  # not significant
+
+    relaxed = compare_results(baseline, candidate, threshold=2.0)
+    assert all(comparison['status'] == UNCHANGED for comparison in relaxed)
+
+    changed = get_results({'a': SLOW}, params={'size': 9})
+    assert compare_results(baseline, changed)[0]['status'] == PARAMS_CHANGED
+
+
+def test_main(tmpdir):
+    """Tests hal.profile.store.main method"""
+
+    path = str(tmpdir.join('store.sqlite'))
+    with ResultStore(path) as store:
+        store.save(get_report({'a': FAST}, version='1.0'))
+        store.save(get_report({'a': FAST}, version='2.0'))
+        store.save(get_report({'a': SLOW}, version='3.0'))
+
+    assert len(main(['-s', path, 'runs'])) == 3
+
+    comparisons = main([
+        '-s', path, 'compare', '--baseline-version', '1.0',
+        '--candidate-version', '2.0'
+    ])
+    assert comparisons[0]['status'] == UNCHANGED
+
+    with pytest.raises(SystemExit):  # latest 2 runs: regression
+        main(['-s', path, 'compare'])